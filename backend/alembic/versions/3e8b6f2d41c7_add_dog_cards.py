@@ -0,0 +1,109 @@
+"""add dog cards
+
+Revision ID: 3e8b6f2d41c7
+Revises: 5c0e7d1a9f42
+Create Date: 2026-10-19 14:03:27.551940
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8b6f2d41c7"
+down_revision: Union[str, None] = "5c0e7d1a9f42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dog_cards",
+        sa.Column("dog_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("dob", sa.Date(), nullable=True),
+        sa.Column(
+            "gender",
+            postgresql.ENUM("male", "female", name="genderenum", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("color", sa.String(length=255), nullable=True),
+        sa.Column(
+            "statuses",
+            postgresql.ARRAY(sa.String(length=32)),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column("profile_photo", sa.String(length=255), nullable=True),
+        sa.Column("stud_fee", sa.Integer(), nullable=True),
+        sa.Column("sale_fee", sa.Integer(), nullable=True),
+        sa.Column("parent_male_id", sa.Integer(), nullable=True),
+        sa.Column("parent_female_id", sa.Integer(), nullable=True),
+        sa.Column("is_production", sa.Boolean(), nullable=True),
+        sa.Column("kennel_own", sa.Boolean(), nullable=True),
+        sa.Column("is_retired", sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(["dog_id"], ["dogs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("dog_id"),
+    )
+    op.create_index(
+        "ix_dog_cards_retired_dob", "dog_cards", ["is_retired", "dob"], unique=False
+    )
+    op.create_index(
+        "ix_dog_cards_statuses",
+        "dog_cards",
+        ["statuses"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(op.f("ix_dog_cards_gender"), "dog_cards", ["gender"], unique=False)
+    op.create_index(
+        op.f("ix_dog_cards_parent_male_id"),
+        "dog_cards",
+        ["parent_male_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_dog_cards_parent_female_id"),
+        "dog_cards",
+        ["parent_female_id"],
+        unique=False,
+    )
+
+    # Backfill; from here on the services keep the rows current
+    op.execute(
+        """
+        INSERT INTO dog_cards (
+            dog_id, name, dob, gender, color, statuses, profile_photo, stud_fee,
+            sale_fee, parent_male_id, parent_female_id, is_production, kennel_own,
+            is_retired
+        )
+        SELECT
+            d.id, d.name, d.dob, d.gender, d.color,
+            COALESCE(
+                (SELECT array_agg(s.status::varchar ORDER BY s.status)
+                 FROM dog_status_association s WHERE s.dog_id = d.id),
+                '{}'::varchar[]
+            ),
+            COALESCE(
+                d.profile_photo,
+                (SELECT p.photo_url FROM photos p WHERE p.dog_id = d.id
+                 ORDER BY p.position ASC NULLS LAST, p.id LIMIT 1)
+            ),
+            d.stud_fee, d.sale_fee, d.parent_male_id, d.parent_female_id,
+            d.is_production, d.kennel_own, d.is_retired
+        FROM dogs d
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_dog_cards_parent_female_id"), table_name="dog_cards")
+    op.drop_index(op.f("ix_dog_cards_parent_male_id"), table_name="dog_cards")
+    op.drop_index(op.f("ix_dog_cards_gender"), table_name="dog_cards")
+    op.drop_index("ix_dog_cards_statuses", table_name="dog_cards")
+    op.drop_index("ix_dog_cards_retired_dob", table_name="dog_cards")
+    op.drop_table("dog_cards")
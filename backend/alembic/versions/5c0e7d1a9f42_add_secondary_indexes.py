@@ -0,0 +1,59 @@
+"""add secondary indexes
+
+Revision ID: 5c0e7d1a9f42
+Revises: b28e0dbbb76b
+Create Date: 2026-10-19 10:12:44.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c0e7d1a9f42"
+down_revision: Union[str, None] = "b28e0dbbb76b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Foreign keys and sort columns used by the selectinload chains in the services
+INDEXES = [
+    ("ix_photos_dog_id", "photos", ["dog_id"]),
+    ("ix_health_info_dog_id", "health_info", ["dog_id"]),
+    ("ix_dogs_parent_male_id", "dogs", ["parent_male_id"]),
+    ("ix_dogs_parent_female_id", "dogs", ["parent_female_id"]),
+    ("ix_dogs_dob", "dogs", ["dob"]),
+    ("ix_dog_status_association_status", "dog_status_association", ["status"]),
+    ("ix_dog_production_link_dog_id", "dog_production_link", ["dog_id"]),
+    ("ix_dog_production_link_production_id", "dog_production_link", ["production_id"]),
+    ("ix_litter_puppies_litter_id", "litter_puppies", ["litter_id"]),
+    ("ix_litter_puppies_dog_id", "litter_puppies", ["dog_id"]),
+    ("ix_litters_breeding_id", "litters", ["breeding_id"]),
+    ("ix_breedings_female_dog_id", "breedings", ["female_dog_id"]),
+    ("ix_breedings_male_dog_id", "breedings", ["male_dog_id"]),
+    ("ix_productions_sire_id", "productions", ["sire_id"]),
+    ("ix_productions_dam_id", "productions", ["dam_id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(op.f(name), table, columns, unique=False)
+
+    # Public listings only show dogs that are not retired, ordered by dob
+    op.create_index(
+        "ix_dogs_active_dob",
+        "dogs",
+        ["dob"],
+        unique=False,
+        postgresql_where=sa.text("is_retired IS NOT TRUE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dogs_active_dob", table_name="dogs")
+
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(op.f(name), table_name=table)
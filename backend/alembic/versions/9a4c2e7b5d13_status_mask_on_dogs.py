@@ -0,0 +1,99 @@
+"""status mask on dogs
+
+Revision ID: 9a4c2e7b5d13
+Revises: 3e8b6f2d41c7
+Create Date: 2026-10-19 15:22:09.104385
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c2e7b5d13"
+down_revision: Union[str, None] = "3e8b6f2d41c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match STATUS_BITS in app/models/dog.py
+STATUS_BITS = [
+    ("available", 1),
+    ("sold", 2),
+    ("stud", 4),
+    ("retired", 8),
+    ("active", 16),
+    ("abkc_champion", 32),
+    ("production", 64),
+]
+BITS_VALUES = ", ".join(
+    f"('{status}'::statusenum, {bit})" for status, bit in STATUS_BITS
+)
+
+
+def upgrade() -> None:
+    # Older databases were created before 'production' was added to the enum
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE statusenum ADD VALUE IF NOT EXISTS 'production'")
+
+    op.add_column(
+        "dogs",
+        sa.Column("status_mask", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        f"""
+        UPDATE dogs d SET status_mask = m.mask
+        FROM (
+            SELECT a.dog_id, bit_or(b.bit) AS mask
+            FROM dog_status_association a
+            JOIN (VALUES {BITS_VALUES}) AS b(status, bit) ON b.status = a.status
+            GROUP BY a.dog_id
+        ) m
+        WHERE m.dog_id = d.id
+        """
+    )
+    op.create_index(op.f("ix_dogs_status_mask"), "dogs", ["status_mask"], unique=False)
+
+    op.drop_table("dog_status_association")
+    op.execute(
+        f"""
+        CREATE VIEW dog_status_association AS
+        SELECT d.id AS dog_id, b.status
+        FROM dogs d
+        JOIN (VALUES {BITS_VALUES}) AS b(status, bit) ON d.status_mask & b.bit <> 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW dog_status_association")
+    op.create_table(
+        "dog_status_association",
+        sa.Column("dog_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="statusenum", create_type=False),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["dog_id"], ["dogs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("dog_id", "status"),
+    )
+    op.create_index(
+        "ix_dog_status_association_status",
+        "dog_status_association",
+        ["status"],
+        unique=False,
+    )
+    op.execute(
+        f"""
+        INSERT INTO dog_status_association (dog_id, status)
+        SELECT d.id, b.status
+        FROM dogs d
+        JOIN (VALUES {BITS_VALUES}) AS b(status, bit) ON d.status_mask & b.bit <> 0
+        """
+    )
+    op.drop_index(op.f("ix_dogs_status_mask"), table_name="dogs")
+    op.drop_column("dogs", "status_mask")
@@ -1,37 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_database_session
 from app.services.contact_service import ContactService
 from app.services.waitlist_service import WaitlistService
+from app.services.export_service import EXPORT_FORMATS, ExportService
 from app.core.auth import get_current_user
+from app.core.stats import get_stats
 from app.schemas import UserSchema, PaginatedResponse, ContactForm
 
 admin_router = APIRouter()
 contact_svc = ContactService()
 waitlist_svc = WaitlistService()
+export_svc = ExportService()
 
 @admin_router.get("/stats", response_model=dict)
 async def get_dashboard_stats(
-    db: AsyncSession = Depends(get_database_session),
+    days: int = Query(30, ge=1, le=365, description="Days of daily series to return"),
     current_user: UserSchema = Depends(get_current_user)
 ):
     """
-    Endpoint to fetch dashboard statistics.
+    Endpoint to fetch dashboard statistics: totals, net change and a daily
+    series per resource, all read from counters kept in Redis.
     Only accessible by authenticated admin users.
     """
-    # You can add role checks here if necessary
     try:
-        contact_count = await contact_svc.get_contact_submissions_count(db)
-        waitlist_count = await waitlist_svc.get_waitlist_submissions_count(db)
+        stats = await get_stats(days)
         return {
-            "contact_submissions": contact_count,
-            "waitlist_submissions": waitlist_count,
+            "contact_submissions": stats["totals"]["contacts"],
+            "waitlist_submissions": stats["totals"]["waitlist"],
+            **stats,
         }
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail="Could not retrieve dashboard statistics")
-    
+
 @admin_router.get("/waitlist", response_model=PaginatedResponse)
 async def get_all_waitlist_entries(
     page: int = 1, page_size: int = 10, db: AsyncSession = Depends(get_database_session)
@@ -47,4 +52,22 @@ async def get_contact_submissions(
     current_user: UserSchema = Depends(get_current_user)
 ):
     response = await contact_svc.get_contact_submissions(page, page_size, db)
-    return response
\ No newline at end of file
+    return response
+
+
+@admin_router.get("/export/{resource}")
+async def export_resource(
+    resource: str = Path(..., pattern="^(waitlist|contact|dogs|litters)$"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    current_user: UserSchema = Depends(get_current_user)
+):
+    """
+    Stream every row of a resource as CSV or NDJSON in flat columns.
+    Only accessible by authenticated admin users.
+    """
+    filename = f"{resource}-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export_svc.stream(resource, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
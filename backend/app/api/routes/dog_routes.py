@@ -1,5 +1,5 @@
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,8 +9,11 @@ from app.core.database import get_database_session
 from app.core.settings import update_global_updated_at
 from app.schemas import (
     Dog,
+    DogCard,
     DogCreate,
+    DogFacetsResponse,
     DogUpdate,
+    GenderEnum,
     PaginatedResponse,
     Production,
     ProductionCreate,
@@ -24,6 +27,34 @@ dog_router = APIRouter()
 dog_svc = DogService()
 
 
+def dog_filters(
+    gender: Optional[str] = Query(None),
+    status: Optional[List[str]] = Query(None),
+    status_match: str = Query("any", pattern="^(any|all)$"),
+    owned: Optional[str] = Query(None),
+    sire: Optional[int] = Query(None),
+    dam: Optional[int] = Query(None),
+    retired: Optional[bool] = Query(None),
+) -> Dict[str, Any]:
+    """Filter query parameters shared by the filtered list, cards and facets."""
+    # Unknown values would only fail when bound to the enum column
+    if gender is not None and gender.lower() not in GenderEnum.__members__:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown gender '{gender}'; expected one of: "
+            + ", ".join(GenderEnum.__members__),
+        )
+    return {
+        "gender": gender,
+        "status": status,
+        "status_match": status_match,
+        "owned": owned,
+        "sire": sire,
+        "dam": dam,
+        "retired": retired,
+    }
+
+
 @dog_router.get("/", response_model=PaginatedResponse)
 async def get_all_dogs(
     page: int = 1, page_size: int = 10, db: AsyncSession = Depends(get_database_session)
@@ -39,25 +70,12 @@ async def get_all_dogs(
 
 @dog_router.get("/filtered", response_model=PaginatedResponse)
 async def get_dogs_filtered(
-    gender: Optional[str] = Query(None),
-    status: Optional[List[str]] = Query(None),
-    owned: Optional[str] = Query(None),
-    sire: Optional[int] = Query(None),
-    dam: Optional[int] = Query(None),
-    retired: Optional[bool] = Query(None),
+    filters: Dict[str, Any] = Depends(dog_filters),
     page: Optional[int] = Query(None),
     page_size: Optional[int] = Query(None),
     db: AsyncSession = Depends(get_database_session),
 ):
     try:
-        filters = {
-            "gender": gender,
-            "status": status,
-            "owned": owned,
-            "sire": sire,
-            "dam": dam,
-            "retired": retired
-        }
         result = await dog_svc.get_dogs_filtered(db, filters, page, page_size)
         return result
     except HTTPException as e:
@@ -66,6 +84,31 @@ async def get_dogs_filtered(
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
 
+@dog_router.get("/cards", response_model=PaginatedResponse[DogCard])
+async def get_dog_cards(
+    filters: Dict[str, Any] = Depends(dog_filters),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_database_session),
+):
+    return await dog_svc.get_dog_cards(db, filters, page, page_size)
+
+
+@dog_router.get("/facets", response_model=DogFacetsResponse)
+async def get_dog_facets(
+    filters: Dict[str, Any] = Depends(dog_filters),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_database_session),
+):
+    # Two statements on purpose: the page and the facets are cached under
+    # separate keys, and the facets don't depend on the page, so paging
+    # through a filter only runs the page query once the facets are cached
+    cards = await dog_svc.get_dog_cards(db, filters, page, page_size)
+    facets = await dog_svc.get_dog_facets(db, filters)
+    return {**cards, "facets": facets}
+
+
 @dog_router.post("/", response_model=Dog)
 async def create_dog(
     dog_data: DogCreate,
@@ -1,6 +1,7 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
@@ -21,6 +22,16 @@ async def read_nav_links(
     return nav_links
 
 
+@navigation_router.get("/tree", responses={200: {"model": List[NavLink]}})
+async def read_nav_tree(request: Request, db: Session = Depends(get_database_session)):
+    body, etag = await navigation_svc.get_nav_tree(db)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    # Already serialized; returned as-is without validation or re-encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @navigation_router.get("/links/{nav_link_id}", response_model=NavLink)
 async def read_nav_link(nav_link_id: int, db: Session = Depends(get_database_session)):
     nav_link = await navigation_svc.get_nav_link(db, nav_link_id=nav_link_id)
@@ -46,7 +57,9 @@ async def update_nav_link(
     current_user: UserSchema = Depends(get_current_user),
     update_timestamp: None = Depends(update_global_updated_at),
 ):
-    return await navigation_svc.update_nav_link(db, nav_link=nav_link)
+    return await navigation_svc.update_nav_link(
+        db, nav_link_id=nav_link.id, nav_link=nav_link
+    )
 
 
 @navigation_router.delete("/links/{nav_link_id}")
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_user
 from app.core.database import get_database_session
 from app.core.settings import update_global_updated_at
-from app.schemas import Page, PageCreate, PageUpdate, UserSchema
+from app.schemas import Page, PageCreate, PageIndexItem, PageUpdate, UserSchema
 from app.services.page_service import PageService
 
 page_router = APIRouter()
@@ -21,6 +21,18 @@ async def read_pages(
     return await page_service.get_pages(db, skip=skip, limit=limit)
 
 
+@page_router.get("/index", response_model=List[PageIndexItem])
+async def read_page_index(
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    language: Optional[str] = None,
+    db: AsyncSession = Depends(get_database_session),
+):
+    return await page_service.get_page_index(
+        db, status=status, type=type, language=language
+    )
+
+
 @page_router.get("/{page_id}", response_model=Page)
 async def get_page_by_id(
     page_id: UUID, db: AsyncSession = Depends(get_database_session)
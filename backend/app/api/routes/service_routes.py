@@ -1,5 +1,6 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import ServiceStatus, ShippingType, TagCreate, TagResponse, ServiceCategoryCreate, \
@@ -113,11 +114,23 @@ async def delete_category(category_id: int, db: AsyncSession = Depends(get_datab
     return
 
 
-@service_router.get("/", response_model=ServiceListResponse)
+# Bodies are pre-serialized; the model only documents them
+@service_router.get("/", responses={200: {"model": ServiceListResponse}})
 async def get_all_services(db: AsyncSession = Depends(get_database_session)):
     """Route to get a list of all services."""
-    services = await services_service.get_all_services(db)
-    return services
+    body = await services_service.get_all_services(db)
+    return Response(content=body, media_type="application/json")
+
+
+@service_router.get("/catalog")
+async def get_services_catalog(
+    tags: Optional[List[int]] = Query(None),
+    match: str = Query("any", pattern="^(any|all)$"),
+    db: AsyncSession = Depends(get_database_session),
+):
+    """Route to get services grouped by category, optionally filtered by tag ids."""
+    body = await services_service.get_services_catalog(db, tags, match_all=match == "all")
+    return Response(content=body, media_type="application/json")
 
 
 @service_router.get("/{service_id}", response_model=ServiceResponse)
@@ -129,22 +142,22 @@ async def get_service_by_id(service_id: int, db: AsyncSession = Depends(get_data
     return service
 
 
-@service_router.get("/category/{category_id}", response_model=ServiceListResponse)
+@service_router.get("/category/{category_id}", responses={200: {"model": ServiceListResponse}})
 async def get_services_by_category(category_id: int, db: AsyncSession = Depends(get_database_session)):
     """Route to get services by category ID."""
-    services = await services_service.get_services_by_category(category_id, db)
-    if not services:
+    body = await services_service.get_services_by_category(category_id, db)
+    if not body:
         raise NotFoundError(name="Service", message=f"No services found for category id {category_id}")
-    return services
+    return Response(content=body, media_type="application/json")
 
 
-@service_router.get("/tag/{tag_id}", response_model=ServiceListResponse)
+@service_router.get("/tag/{tag_id}", responses={200: {"model": ServiceListResponse}})
 async def get_services_by_tag(tag_id: int, db: AsyncSession = Depends(get_database_session)):
     """Route to get services by tag ID."""
-    services = await services_service.get_services_by_tag(tag_id, db)
-    if not services:
+    body = await services_service.get_services_by_tag(tag_id, db)
+    if not body:
         raise NotFoundError(name="Service", message=f"No services found for tag id {tag_id}")
-    return services
+    return Response(content=body, media_type="application/json")
 
 
 @service_router.post("/", response_model=ServiceResponse)
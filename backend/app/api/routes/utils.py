@@ -1,16 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.core.auth import get_current_user
-from app.core.redis import get_redis_client
+from app.core.prewarm import schedule_prewarm
+from app.core.redis import clear_cache_keys, get_redis_client
+from app.utils.cache_codec import cache_memory_report
 
 utils_router = APIRouter()
 
 
 @utils_router.post("/clear-cache", dependencies=[Depends(get_current_user)])
-async def clear_cache(redis=Depends(get_redis_client)):
+async def clear_cache(request: Request, redis=Depends(get_redis_client)):
     try:
-        await redis.flushall()  # Clears the entire cache
+        # Learned hot paths, the snapshot dirty set and the admin stats
+        # counters survive, so the hot paths are rebuilt right away
+        await clear_cache_keys(redis)
+        schedule_prewarm(request.app)
         return {"message": "Redis cache cleared successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clearing cache: {e}")
-    
+
+
+@utils_router.get("/cache-report", dependencies=[Depends(get_current_user)])
+async def cache_report(pattern: str = "*", redis=Depends(get_redis_client)):
+    try:
+        return await cache_memory_report(redis, pattern)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building cache report: {e}")
@@ -4,7 +4,7 @@ from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_database_session
 from app.schemas import WaitlistCreate, WaitlistUpdate, WaitlistResponse, PaginatedResponse
-from app.services import WaitlistService
+from app.services import MatchingService, WaitlistService
 from app.core.auth import get_current_user
 from app.core.settings import update_global_updated_at
 from app.schemas import UserSchema
@@ -12,6 +12,7 @@ from app.utils.schema_converters import convert_to_waitlist_schema
 
 waitlist_router = APIRouter()
 waitlist_svc = WaitlistService()
+matching_svc = MatchingService()
 
 
 # Public route to create a new waitlist entry
@@ -49,6 +50,27 @@ async def get_filtered_waitlist_entries(
     return [convert_to_waitlist_schema(entry) for entry in entries]
 
 
+# Admin route to get ranked matches and the current allocation of puppies
+# and upcoming breedings to waitlist entries
+@waitlist_router.get("/matches")
+async def get_waitlist_matches(
+    limit: Optional[int] = None,
+    db: AsyncSession = Depends(get_database_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    return await matching_svc.get_matches(db, limit)
+
+
+# Admin route to recompute every match from scratch
+@waitlist_router.post("/matches/rebuild")
+async def rebuild_waitlist_matches(
+    db: AsyncSession = Depends(get_database_session),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    await matching_svc.rebuild(db)
+    return await matching_svc.get_matches(db)
+
+
 # Public route to get a waitlist entry by ID
 @waitlist_router.get("/{entry_id}", response_model=WaitlistResponse)
 async def get_waitlist_entry_by_id(
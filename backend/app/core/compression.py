@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import logging
+
+import brotli
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.config import settings
+from app.core.instrumentation import current_metrics
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+# Server preference when the client accepts several encodings equally
+ENCODINGS = ("br", "gzip")
+VARIANT_TTL = 3600
+
+
+def negotiate_encoding(accept_encoding: str):
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, cached: bool = False) -> bytes:
+    # Variants that get stored are compressed once and served many times,
+    # so they can afford a slower, denser setting
+    if encoding == "br":
+        return brotli.compress(body, quality=9 if cached else 5)
+    return gzip.compress(body, compresslevel=9 if cached else 6)
+
+
+def _is_compressible(content_type: str) -> bool:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    return any(content_type.startswith(allowed) for allowed in COMPRESSIBLE_TYPES)
+
+
+def _variant_key(request: Request, encoding: str, cache_reads):
+    """
+    A response built purely from cache hits is a function of the route and
+    of the entries it read, so its compressed body can be keyed on both and
+    never needs explicit invalidation.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(request.url.path.encode())
+    digest.update(request.url.query.encode())
+    for read in cache_reads:
+        digest.update(read)
+    return f"compressed:{encoding}:{digest.hexdigest()}:{settings.env}"
+
+
+async def compression_middleware(request: Request, call_next):
+    response = await call_next(request)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    content_length = response.headers.get("content-length")
+    if (
+        encoding is None
+        or request.method == "HEAD"
+        or content_length is None  # Streamed; leave it to flow through
+        or int(content_length) < settings.compression_minimum_size
+        or "content-encoding" in response.headers
+        or not _is_compressible(response.headers.get("content-type"))
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    variant_key = None
+    redis_client = None
+    compressed = None
+
+    metrics = current_metrics()
+    if (
+        metrics is not None
+        and metrics.cache_reads
+        and metrics.query_count == 0
+        and request.method == "GET"
+        and response.status_code == 200
+    ):
+        variant_key = _variant_key(request, encoding, metrics.cache_reads)
+        try:
+            redis_client = await get_redis_client()
+            compressed = await redis_client.get(variant_key)
+        except Exception as e:
+            logger.warning(f"Could not read compressed variant: {e}")
+
+    if compressed is None:
+        compressed = compress(body, encoding, cached=variant_key is not None)
+        if redis_client is not None:
+            try:
+                await redis_client.set(variant_key, compressed, ex=VARIANT_TTL)
+            except Exception as e:
+                logger.warning(f"Could not store compressed variant: {e}")
+
+    new_response = Response(
+        content=compressed,
+        status_code=response.status_code,
+        background=response.background,
+    )
+    # Keep every original header (including repeated Set-Cookie) apart from
+    # the ones that describe the body
+    vary = [
+        value.strip()
+        for value in response.headers.get("vary", "").split(",")
+        if value.strip()
+    ]
+    new_response.raw_headers = [
+        (name, value)
+        for name, value in response.raw_headers
+        if name not in (b"content-length", b"vary")
+    ]
+    new_response.headers["Vary"] = ", ".join(vary + ["Accept-Encoding"])
+    new_response.headers["Content-Length"] = str(len(compressed))
+    new_response.headers["Content-Encoding"] = encoding
+    return new_response
@@ -1,10 +1,17 @@
-from pydantic_settings import BaseSettings
 from typing import List, Optional
+
 from pydantic import Field
+from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     sqlalchemy_database_url: str
+    # Read replica for public GET routes; unset means everything uses the primary.
+    # A second role on the same instance with default_transaction_read_only=on
+    # is enough to exercise the routing locally.
+    sqlalchemy_replica_url: Optional[str] = None
+    # How long a user's reads stay on the primary after they write
+    read_your_writes_seconds: int = 5
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
@@ -20,6 +27,45 @@ class Settings(BaseSettings):
     acs_email_connection_string: str
     acs_sender_email: str
     acs_recipient_email: str
+    # Redis cache codec: "msgpack" or "json", compressed with "zstd", "zlib"
+    # or "none" once a value reaches the threshold in bytes
+    cache_serializer: str = "msgpack"
+    cache_compression: str = "zstd"
+    cache_compression_threshold: int = 1024
+    # Workers from before the codec can only read plain JSON. Keep this off
+    # until every worker runs a release that decodes codec entries, then
+    # turn it on; until then entries are written as plain JSON.
+    cache_codec_writes: bool = False
+    # Responses smaller than this are sent uncompressed
+    compression_minimum_size: int = 1024
+    # Cache prewarming: fixed paths plus the most requested ones learned from
+    # traffic, replayed with bounded concurrency at startup and after writes
+    prewarm_paths: List[str] = [
+        "/api/v1/dogs/?page=1&page_size=10",
+        "/api/v1/dogs/cards?page=1&page_size=10",
+        "/api/v1/litters/?page=1&page_size=10",
+        "/api/v1/breedings/?page=1&page_size=10",
+        "/api/v1/navigation/links",
+        "/api/v1/navigation/tree",
+        "/api/v1/pages/",
+        "/api/v1/pages/index",
+        "/api/v1/services/catalog",
+    ]
+    prewarm_learned_limit: int = 50
+    prewarm_concurrency: int = 4
+    prewarm_timeout_seconds: int = 30
+    # Static JSON export of the public API (python -m app.core.snapshot)
+    snapshot_dir: str = "snapshot"
+    snapshot_page_size: int = 10
+    snapshot_concurrency: int = 8
+    # Waitlist matching: puppies a breeding without a litter yet is expected
+    # to have, and ranked matches listed per entry
+    matching_breeding_slots: int = 4
+    matching_ranked_limit: int = 5
+    # Rows fetched per round trip by the streaming admin exports
+    export_batch_size: int = 1000
+    # Daily admin stats rollups are kept this long
+    stats_retention_days: int = 400
 
     class Config:
         env_file = ".env"
@@ -1,21 +1,237 @@
+import hashlib
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import time
 from typing import AsyncGenerator
+
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
 from app.core.config import settings
+from app.core.metrics import DB_POOL_WAIT, DB_REPLICA_LAG, observe_pool
+from app.core.redis import get_redis_client
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports checkout wait time and pool usage."""
+
+    pool_label = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(pool=self.pool_label).observe(
+                time.perf_counter() - start
+            )
+            observe_pool(self, self.pool_label)
+
+
+class ReplicaQueuePool(InstrumentedQueuePool):
+    pool_label = "replica"
+
+
+class ReadQueuePool(InstrumentedQueuePool):
+    pool_label = "primary_read"
+
+
+def _create_engine(url, poolclass, read_only=False):
+    # Read-only connections make Postgres reject writes outright, including
+    # bulk insert()/update() statements that never pass through a flush
+    connect_args = (
+        {"server_settings": {"default_transaction_read_only": "on"}}
+        if read_only
+        else {}
+    )
+    engine = create_async_engine(
+        url,
+        pool_size=10,
+        max_overflow=20,
+        poolclass=poolclass,
+        connect_args=connect_args,
+    )
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        observe_pool(engine.pool, poolclass.pool_label)
+
+    return engine
+
 
 SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
+engine = _create_engine(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool)
+# Read-only GET sessions on the primary get their own read-only pool
+read_engine = _create_engine(SQLALCHEMY_DATABASE_URL, ReadQueuePool, read_only=True)
+
+# Without a replica configured, reads share the primary engine and pool
+replica_engine = (
+    _create_engine(settings.sqlalchemy_replica_url, ReplicaQueuePool, read_only=True)
+    if settings.sqlalchemy_replica_url
+    else engine
 )
 
+
+
+class ReadOnlySession(Session):
+    """
+    Session behind read-only GET requests; refuses to flush changes. Its
+    connections are read-only too, so Postgres rejects any statement that
+    writes.
+    """
+
+    def flush(self, objects=None):
+        if self.new or self.deleted or any(self.is_modified(obj) for obj in self.dirty):
+            raise InvalidRequestError("Cannot write from a read-only session")
+        super().flush(objects)
+
+
+def _read_sessionmaker(bind):
+    # Autocommit skips the BEGIN/ROLLBACK round trips around every read
+    return sessionmaker(
+        bind.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        sync_session_class=ReadOnlySession,
+        expire_on_commit=False,
+    )
+
+
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session = _read_sessionmaker(read_engine)
+replica_session = (
+    _read_sessionmaker(replica_engine) if replica_engine is not engine else read_session
+)
 Base = declarative_base()
 
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
-async def get_database_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
+def _pin_key(request: Request):
+    # Pins are per logged-in user, keyed on their token rather than stored in
+    # a cookie so they hold across workers and never touch the response
+    token = request.cookies.get("access_token")
+    if not token:
+        return None
+    return f"db_primary_pin:{hashlib.sha256(token.encode()).hexdigest()[:32]}"
+
+
+async def _pin_to_primary(pin_key):
+    redis_client = await get_redis_client()
+    await redis_client.set(pin_key, 1, ex=settings.read_your_writes_seconds)
+
+
+async def _is_pinned_to_primary(pin_key) -> bool:
+    redis_client = await get_redis_client()
+    return bool(await redis_client.exists(pin_key))
+
+
+class LazySession:
+    """
+    Stands in for AsyncSession in routes. The real session is only opened on
+    first use, so requests answered from Redis never open one or look up a
+    read-your-writes pin. Read-only sessions hand their connection back to
+    the pool after every statement instead of holding it for the request.
+    """
+
+    def __init__(self, request: Request):
+        self._request = request
+        self._session = None
+        self.read_only = request.method in READ_METHODS
+
+    @property
+    def used(self) -> bool:
+        return self._session is not None
+
+    async def _open(self) -> AsyncSession:
+        if self._session is None:
+            if not self.read_only:
+                self._session = async_session()
+            elif replica_engine is not engine and not await self._pinned():
+                self._session = replica_session()
+            else:
+                self._session = read_session()
+        return self._session
+
+    def _open_sync(self) -> AsyncSession:
+        # Sync methods such as add() can't await the pin lookup; writes never
+        # need it and reads fall back to the primary
+        if self._session is None:
+            self._session = async_session() if not self.read_only else read_session()
+        return self._session
+
+    async def _pinned(self) -> bool:
+        pin_key = _pin_key(self._request)
+        return bool(pin_key) and await _is_pinned_to_primary(pin_key)
+
+    async def _run(self, method, *args, **kwargs):
+        session = await self._open()
+        result = await getattr(session, method)(*args, **kwargs)
+        if self.read_only:
+            # Results are already buffered and expire_on_commit is off, so
+            # ending the autocommit "transaction" only releases the connection
+            await session.commit()
+        return result
+
+    async def execute(self, *args, **kwargs):
+        return await self._run("execute", *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await self._run("scalar", *args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await self._run("scalars", *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self._run("get", *args, **kwargs)
+
+    async def refresh(self, *args, **kwargs):
+        return await self._run("refresh", *args, **kwargs)
+
+    async def commit(self):
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self):
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def __getattr__(self, name):
+        return getattr(self._open_sync(), name)
+
+
+async def get_database_session(request: Request) -> AsyncGenerator[LazySession, None]:
+    """
+    Route reads to the replica and writes to the primary. A user who has just
+    written keeps reading from the primary for `read_your_writes_seconds`.
+    """
+    session = LazySession(request)
+    try:
         yield session
+    finally:
+        await session.close()
+
+    pin_key = _pin_key(request) if replica_engine is not engine else None
+    if pin_key and session.used and not session.read_only:
+        await _pin_to_primary(pin_key)
+
+
+async def observe_replica_lag():
+    if replica_engine is engine:
+        return
+    async with replica_engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT CASE WHEN pg_is_in_recovery() "
+                "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "ELSE 0 END"
+            )
+        )
+        DB_REPLICA_LAG.set(float(result.scalar_one()))
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Same statement issued this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.redis_count = 0
+        self.redis_time = 0.0
+        self.serialization_time = 0.0
+        self.statements = Counter()
+        self.cache_reads = []
+
+    def repeated_statements(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+    def server_timing(self, total: float) -> str:
+        return ", ".join(
+            [
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.query_count} queries"',
+                f'redis;dur={self.redis_time * 1000:.1f};desc="{self.redis_count} commands"',
+                f"serialize;dur={self.serialization_time * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ]
+        )
+
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _request_metrics.get()
+
+
+def record_redis_command(elapsed: float):
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.redis_count += 1
+        metrics.redis_time += elapsed
+
+
+def record_cache_read(key, value):
+    """Remember a digest of each cache hit so the response can be tied to it."""
+    metrics = _request_metrics.get()
+    if metrics is None or value is None:
+        return
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(key if isinstance(key, bytes) else str(key).encode())
+    digest.update(value if isinstance(value, bytes) else str(value).encode())
+    metrics.cache_reads.append(digest.digest())
+
+
+@contextmanager
+def track_serialization():
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.serialization_time += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _request_metrics.get()
+    if metrics is None:
+        return
+    metrics.query_count += 1
+    metrics.db_time += time.perf_counter() - context._query_start_time
+    metrics.statements[statement] += 1
+
+
+def install_sqlalchemy_instrumentation(engine: AsyncEngine):
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedJSONResponse(ORJSONResponse):
+    """orjson response that attributes its render time to the current request."""
+
+    def render(self, content) -> bytes:
+        with track_serialization():
+            return super().render(content)
+
+
+async def request_metrics_middleware(request: Request, call_next):
+    # Reuse an enclosing collector (query_budget) so it sees the queries too
+    metrics = _request_metrics.get() or RequestMetrics()
+    token = _request_metrics.set(metrics)
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _request_metrics.reset(token)
+
+    total = time.perf_counter() - start_time
+    response.headers["Server-Timing"] = metrics.server_timing(total)
+
+    route = request.scope.get("route")
+    log_line = {
+        "event": "request_metrics",
+        "method": request.method,
+        "path": request.url.path,
+        "route": getattr(route, "path", None),
+        "status": response.status_code,
+        "queries": metrics.query_count,
+        "db_ms": round(metrics.db_time * 1000, 2),
+        "redis_commands": metrics.redis_count,
+        "redis_ms": round(metrics.redis_time * 1000, 2),
+        "serialize_ms": round(metrics.serialization_time * 1000, 2),
+        "total_ms": round(total * 1000, 2),
+    }
+    logger.info(json.dumps(log_line))
+
+    for statement, count in metrics.repeated_statements().items():
+        logger.warning(
+            f"Possible N+1 on {request.method} {request.url.path}: "
+            f"statement issued {count} times: {statement[:200]}"
+        )
+
+    return response
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """
+    Collect query metrics for the enclosed block and fail if it issues more
+    than `max_queries` statements, e.g. around a test client call.
+    """
+    metrics = RequestMetrics()
+    token = _request_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _request_metrics.reset(token)
+    assert metrics.query_count <= max_queries, (
+        f"Expected at most {max_queries} queries, got {metrics.query_count}: "
+        f"{list(metrics.statements)}"
+    )
@@ -0,0 +1,132 @@
+import os
+import re
+import time
+
+from fastapi import Request
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Set PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py) so every gunicorn worker
+# writes to a shared directory and /metrics aggregates across all of them.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections in use beyond pool_size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Seconds since the read replica last replayed a transaction from the primary",
+    multiprocess_mode="max",
+)
+
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by key prefix and result",
+    ["prefix", "result"],
+)
+
+# prewarm: 1 while a debounced prewarm is waiting or running; snapshot: refs
+# waiting for the next incremental build. Both are shared across workers, so
+# the most recent value any worker saw wins.
+BACKGROUND_QUEUE_DEPTH = Gauge(
+    "background_queue_depth",
+    "Jobs waiting in background queues",
+    ["queue"],
+    multiprocess_mode="livemostrecent",
+)
+
+
+def cache_key_prefix(key) -> str:
+    """
+    Reduce a cache key such as 'all_dogs:1:10:prod' or 'page:slug:home:prod'
+    to its prefix so label cardinality stays bounded.
+    """
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    parts = str(key).split(":")
+    if len(parts) > 2 and parts[0] == "page" and parts[1] == "slug":
+        return "page:slug"
+    return re.sub(r"_[\[{\d].*$", "", parts[0])
+
+
+def observe_redis_command(command, elapsed: float, args=(), result=None):
+    command = str(command).upper()
+    REDIS_LATENCY.labels(command=command).observe(elapsed)
+    if command == "GET" and args:
+        CACHE_REQUESTS.labels(
+            prefix=cache_key_prefix(args[0]),
+            result="miss" if result is None else "hit",
+        ).inc()
+
+
+def observe_pool(pool, label: str = "primary"):
+    DB_POOL_CHECKED_OUT.labels(pool=label).set(pool.checkedout())
+    DB_POOL_OVERFLOW.labels(pool=label).set(max(pool.overflow(), 0))
+
+
+async def metrics_middleware(request: Request, call_next):
+    REQUESTS_IN_FLIGHT.inc()
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        ).observe(time.perf_counter() - start_time)
+
+
+def metrics_response() -> Response:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,205 @@
+"""
+Rebuild hot cache entries before traffic needs them.
+
+Warming is done by replaying GET requests against the app in-process, so each
+endpoint fills its own cache exactly as it would for a visitor. The paths come
+from `settings.prewarm_paths`, every page slug, and the most requested paths
+learned from access counters kept in Redis.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+
+import httpx
+from fastapi import Request
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.metrics import BACKGROUND_QUEUE_DEPTH
+from app.core.redis import get_redis_client
+from app.models import Page
+from app.utils import decode_cache, encode_cache
+
+logger = logging.getLogger(__name__)
+
+PREWARM_HEADER = "X-Prewarm"
+HOT_PATHS_KEY = f"prewarm:hot_paths:{settings.env}"
+REPORT_KEY = f"prewarm:report:{settings.env}"
+LOCK_KEY = f"prewarm:lock:{settings.env}"
+# Counters are flushed to Redis in batches rather than once per request
+FLUSH_EVERY = 100
+MAX_TRACKED_PATHS = 500
+# Writes within this many seconds of each other trigger a single prewarm
+DEBOUNCE_SECONDS = 2
+
+_access_counts = Counter()
+_pending_prewarm = None
+_prewarm_due = 0.0
+report = {"status": "cold"}
+
+
+async def record_access(path: str):
+    _access_counts[path] += 1
+    if sum(_access_counts.values()) < FLUSH_EVERY:
+        return
+
+    counts = dict(_access_counts)
+    _access_counts.clear()
+    redis_client = await get_redis_client()
+    pipe = redis_client.pipeline(transaction=False)
+    for tracked_path, count in counts.items():
+        pipe.zincrby(HOT_PATHS_KEY, count, tracked_path)
+    pipe.zremrangebyrank(HOT_PATHS_KEY, 0, -MAX_TRACKED_PATHS - 1)
+    await pipe.execute()
+
+
+async def hot_paths(redis_client, limit: int = None):
+    limit = limit or settings.prewarm_learned_limit
+    paths = await redis_client.zrevrange(HOT_PATHS_KEY, 0, limit - 1)
+    return [path.decode() if isinstance(path, bytes) else path for path in paths]
+
+
+async def _page_paths():
+    async with async_session() as db:
+        result = await db.execute(select(Page.slug))
+        return [f"/api/v1/pages/slug/{slug}" for slug in result.scalars().all()]
+
+
+async def prewarm(app, learned=None):
+    """
+    Replay the configured, page and learned paths with bounded concurrency
+    and publish a report for the readiness check.
+    """
+    global report
+    redis_client = await get_redis_client()
+    if not await redis_client.set(
+        LOCK_KEY, 1, nx=True, ex=settings.prewarm_timeout_seconds
+    ):
+        logger.info("Prewarm already running in another worker")
+        return report
+
+    started = time.perf_counter()
+    started_at = datetime.utcnow().isoformat()
+    report = {"status": "warming", "started_at": started_at}
+    try:
+        # Expires on its own if this worker dies mid-run, so readiness recovers
+        await redis_client.set(
+            REPORT_KEY, encode_cache(report), ex=settings.prewarm_timeout_seconds
+        )
+        if learned is None:
+            learned = await hot_paths(redis_client)
+        paths = list(
+            dict.fromkeys([*settings.prewarm_paths, *await _page_paths(), *learned])
+        )
+        status, failed = await _replay(app, paths)
+        report = {
+            "status": status,
+            "started_at": started_at,
+            "finished_at": datetime.utcnow().isoformat(),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "paths": len(paths),
+            "warmed": len(paths) - len(failed),
+            "failed": failed,
+        }
+        logger.info(
+            f"Prewarm {status}: {report['warmed']}/{len(paths)} paths "
+            f"in {report['duration_ms']}ms"
+        )
+    except Exception as e:
+        report = {"status": "failed", "started_at": started_at, "error": str(e)}
+        raise
+    finally:
+        await redis_client.set(REPORT_KEY, encode_cache(report))
+        await redis_client.delete(LOCK_KEY)
+    return report
+
+
+async def _replay(app, paths):
+    failed = []
+    semaphore = asyncio.Semaphore(settings.prewarm_concurrency)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://prewarm",
+        headers={PREWARM_HEADER: "1"},
+    ) as client:
+
+        async def warm(path):
+            async with semaphore:
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        failed.append({"path": path, "status": response.status_code})
+                except Exception as e:
+                    failed.append({"path": path, "error": str(e)})
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(warm(path) for path in paths)),
+                timeout=settings.prewarm_timeout_seconds,
+            )
+            return "ready", failed
+        except asyncio.TimeoutError:
+            return "partial", failed
+
+
+def schedule_prewarm(app, learned=None):
+    """Prewarm in the background, collapsing bursts of invalidations into one run."""
+    global _pending_prewarm, _prewarm_due
+    _prewarm_due = time.monotonic() + DEBOUNCE_SECONDS
+    if _pending_prewarm is None or _pending_prewarm.done():
+        _pending_prewarm = asyncio.create_task(_run_scheduled(app, learned))
+        BACKGROUND_QUEUE_DEPTH.labels(queue="prewarm").set(1)
+
+
+async def _run_scheduled(app, learned):
+    try:
+        while True:
+            while (delay := _prewarm_due - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            started = time.monotonic()
+            try:
+                await prewarm(app, learned)
+            except Exception as e:
+                logger.error(f"Prewarm failed: {e}", exc_info=True)
+            # Run again if something was invalidated while we were warming
+            if _prewarm_due <= started:
+                return
+    finally:
+        BACKGROUND_QUEUE_DEPTH.labels(queue="prewarm").set(0)
+
+
+async def readiness_report():
+    """Report from whichever worker warmed the shared cache most recently."""
+    try:
+        redis_client = await get_redis_client()
+        shared = decode_cache(await redis_client.get(REPORT_KEY))
+    except Exception as e:
+        logger.warning(f"Could not read prewarm report: {e}")
+        shared = None
+    return shared or report
+
+
+async def prewarm_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.headers.get(PREWARM_HEADER) or not request.url.path.startswith("/api/"):
+        return response
+
+    is_admin = bool(request.cookies.get("access_token"))
+    if request.method == "GET" and response.status_code == 200 and not is_admin:
+        # Only anonymous traffic is learned; the prewarmer has no credentials
+        path = request.url.path
+        if request.url.query:
+            path = f"{path}?{request.url.query}"
+        try:
+            await record_access(path)
+        except Exception as e:
+            logger.warning(f"Could not record access counts: {e}")
+    elif request.method != "GET" and response.status_code < 400 and is_admin:
+        # Admin writes invalidate cache entries; put the hot ones back
+        schedule_prewarm(request.app)
+    return response
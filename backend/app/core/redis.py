@@ -1,15 +1,58 @@
+import time
+
 import redis.asyncio as redis
+
 from app.core.config import settings
+from app.core.instrumentation import record_cache_read, record_redis_command
+from app.core.metrics import observe_redis_command
+
+# Keys that hold state rather than cached responses: prewarm hot paths, the
+# snapshot dirty set, admin stats counters and read-your-writes pins. Cache
+# clears leave them alone.
+PERSISTENT_PREFIXES = ("prewarm:", "snapshot:", "stats:", "db_primary_pin:")
+
+
+class InstrumentedRedis(redis.Redis):
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        result = None
+        try:
+            result = await super().execute_command(*args, **options)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            record_redis_command(elapsed)
+            observe_redis_command(args[0], elapsed, args[1:], result)
+            if str(args[0]).upper() == "GET" and len(args) > 1:
+                record_cache_read(args[1], result)
 
 
 async def get_redis_client():
     redis_url = (
         f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
     )
-    return redis.from_url(redis_url, password=settings.redis_password)
+    return InstrumentedRedis.from_url(redis_url, password=settings.redis_password)
 
 
 async def delete_pattern(redis_client, pattern: str):
     keys = await redis_client.keys(pattern)
     if keys:
         await redis_client.delete(*keys)
+
+
+async def clear_cache_keys(redis_client, batch_size: int = 500) -> int:
+    """Delete every cached response, keeping keys under PERSISTENT_PREFIXES."""
+    prefixes = tuple(prefix.encode() for prefix in PERSISTENT_PREFIXES)
+    deleted, batch = 0, []
+    async for key in redis_client.scan_iter(count=batch_size):
+        if isinstance(key, str):
+            key = key.encode()
+        if key.startswith(prefixes):
+            continue
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += await redis_client.unlink(*batch)
+            batch = []
+    if batch:
+        deleted += await redis_client.unlink(*batch)
+    return deleted
@@ -0,0 +1,459 @@
+"""
+Export the public API as a directory of static JSON files for nginx/CDN hosting.
+
+Every public GET endpoint is rendered in-process, including every page of each
+paginated list and the detail endpoint of every item, and written to a file
+named after its path with the /api/v1/ prefix removed:
+
+    /api/v1/dogs/?page=2&page_size=10   ->  dogs/index.page-2.json
+    /api/v1/dogs/12                     ->  dogs/12.json
+    /api/v1/pages/slug/about            ->  pages/slug/about.json
+
+`manifest.json` maps each source path to its file, checksum and the entity ids
+its payload contains. Admin writes record the ids they touch in a Redis set, so
+a rebuild only renders files whose entities changed, plus every page of a list
+that gained or lost an entry:
+
+    python -m app.core.snapshot                 # incremental
+    python -m app.core.snapshot --full
+    python -m app.core.snapshot --changed dogs:12 litters:*
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from urllib.parse import parse_qs
+
+import httpx
+import orjson
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.metrics import BACKGROUND_QUEUE_DEPTH
+from app.core.prewarm import PREWARM_HEADER
+from app.core.redis import get_redis_client
+from app.utils import encode_json
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1/"
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+DIRTY_KEY = f"snapshot:dirty:{settings.env}"
+
+# (resource, list path, page size parameter or None when the list is unpaginated)
+LISTS = (
+    ("dogs", "/api/v1/dogs/", "page_size"),
+    ("dogs", "/api/v1/dogs/cards", "page_size"),
+    ("dogs", "/api/v1/dogs/facets", None),
+    ("litters", "/api/v1/litters/", "page_size"),
+    ("breedings", "/api/v1/breedings/", "page_size"),
+    ("productions", "/api/v1/productions/", "pageSize"),
+    ("pages", "/api/v1/pages/", None),
+    ("pages", "/api/v1/pages/index", None),
+    ("links", "/api/v1/navigation/links", None),
+    ("links", "/api/v1/navigation/tree", None),
+    ("services", "/api/v1/services/", None),
+    ("services", "/api/v1/services/catalog", None),
+    ("tags", "/api/v1/services/tags", None),
+    ("categories", "/api/v1/services/categories", None),
+    ("settings", "/api/v1/settings/", None),
+)
+# Lists that summarise whole resources (counts, trees, groupings): a change
+# to any row of these resources re-renders them, listed on them or not
+AGGREGATES = {
+    "/api/v1/dogs/facets": {"dogs"},
+    "/api/v1/navigation/tree": {"links"},
+    "/api/v1/pages/index": {"pages"},
+    "/api/v1/services/catalog": {"services", "tags", "categories"},
+}
+# Endpoints reached from the items of each list:
+# (path template, item field, resource, kind)
+DETAILS = {
+    "dogs": (("/api/v1/dogs/{}", "id", "dogs", "detail"),),
+    "litters": (("/api/v1/litters/{}", "id", "litters", "detail"),),
+    "breedings": (
+        ("/api/v1/breedings/{}", "id", "breedings", "detail"),
+        ("/api/v1/litters/by-breeding/{}", "id", "litters", "list"),
+    ),
+    "productions": (("/api/v1/productions/{}", "id", "productions", "detail"),),
+    "pages": (
+        ("/api/v1/pages/{}", "id", "pages", "detail"),
+        ("/api/v1/pages/slug/{}", "slug", "pages", "detail"),
+    ),
+    "links": (("/api/v1/navigation/links/{}", "id", "links", "detail"),),
+    "services": (("/api/v1/services/{}", "id", "services", "detail"),),
+    "tags": (
+        ("/api/v1/services/tags/{}", "id", "tags", "detail"),
+        ("/api/v1/services/tag/{}", "id", "services", "list"),
+    ),
+    "categories": (
+        ("/api/v1/services/categories/{}", "id", "categories", "detail"),
+        ("/api/v1/services/category/{}", "id", "services", "list"),
+    ),
+}
+# Nested keys whose objects belong to another resource
+KEY_RESOURCES = {
+    "puppies": "dogs",
+    "female_dog": "dogs",
+    "male_dog": "dogs",
+    "sires": "dogs",
+    "dams": "dogs",
+    "children": "dogs",
+    "productions": "productions",
+    "breeding": "breedings",
+    "announcements": "announcements",
+    "services": "services",
+    "tags": "tags",
+    "category": "categories",
+}
+RESOURCES = {resource for resource, _, _ in LISTS} | set(KEY_RESOURCES.values())
+# Write sub-paths that create rows of another resource,
+# e.g. POST /litters/3/puppies adds dogs
+NESTED_WRITES = {
+    "puppies": "dogs",
+    "populate": "dogs",
+}
+
+
+def snapshot_file(source: str) -> str:
+    path, _, query = source.partition("?")
+    name = path[len(API_PREFIX) :]
+    if not name or name.endswith("/"):
+        name += "index"
+    page = parse_qs(query).get("page")
+    if page:
+        name += f".page-{page[0]}"
+    return f"{name}.json"
+
+
+def extract_refs(data, resource=None, refs=None):
+    """Collect `resource:id` for every identifiable object in a payload."""
+    refs = set() if refs is None else refs
+    if isinstance(data, list):
+        for item in data:
+            extract_refs(item, resource, refs)
+    elif isinstance(data, dict):
+        if resource and data.get("id") is not None:
+            refs.add(f"{resource}:{data['id']}")
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                child = resource if key == "items" else KEY_RESOURCES.get(key)
+                extract_refs(value, child, refs)
+    return refs
+
+
+def _items(data):
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data.get("items") or data.get("services") or []
+    return []
+
+
+def _write_atomic(path: str, body: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+class SnapshotBuilder:
+    def __init__(self, client, out_dir: str, page_size: int, concurrency: int):
+        self.client = client
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.files = {}
+        self.rendered = set()
+        self.failed = {}
+        self.written = 0
+        self.removed = 0
+
+        manifest = self._load_manifest()
+        if manifest and manifest.get("page_size") == page_size:
+            self.files = manifest["files"]
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST), "rb") as f:
+                manifest = orjson.loads(f.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+    def _affected(self, entry) -> bool:
+        return bool(self.dirty.intersection(entry["refs"])) or (
+            entry["kind"] == "list" and entry["resource"] in self.wildcards
+        )
+
+    def _touched(self, resources) -> bool:
+        return any(ref.partition(":")[0] in resources for ref in self.dirty)
+
+    def _remove(self, source: str):
+        entry = self.files.pop(source, None)
+        if entry is None:
+            return
+        try:
+            os.remove(os.path.join(self.out_dir, entry["file"]))
+        except FileNotFoundError:
+            pass
+        self.removed += 1
+
+    async def render(self, source: str, resource: str, kind: str, owner=None, **extra):
+        async with self.semaphore:
+            try:
+                response = await self.client.get(source)
+            except Exception as e:
+                self.failed[source] = str(e)
+                return None
+        if response.status_code == 404:
+            self._remove(source)
+            return None
+        if response.status_code != 200:
+            self.failed[source] = response.status_code
+            return None
+
+        body = response.content
+        data = orjson.loads(body)
+        if kind == "list":
+            refs = extract_refs(_items(data) or data, resource)
+        else:
+            refs = extract_refs(data, resource)
+        if owner:
+            refs.add(owner)
+
+        file = snapshot_file(source)
+        digest = hashlib.sha256(body).hexdigest()
+        previous = self.files.get(source)
+        path = os.path.join(self.out_dir, file)
+        # Unchanged files keep their mtime so CDN syncs skip them
+        if previous is None or previous["sha256"] != digest or not os.path.exists(path):
+            _write_atomic(path, body)
+            self.written += 1
+        self.files[source] = {
+            "file": file,
+            "resource": resource,
+            "kind": kind,
+            "sha256": digest,
+            "bytes": len(body),
+            "refs": sorted(refs),
+            **({"owner": owner} if owner else {}),
+            **extra,
+        }
+        self.rendered.add(source)
+        return data
+
+    def _page_source(self, path, size_param, page):
+        return f"{path}?page={page}&{size_param}={self.page_size}"
+
+    async def build_list(self, resource, path, size_param):
+        if size_param is None:
+            entry = self.files.get(path)
+            if (
+                self.full
+                or entry is None
+                or self._affected(entry)
+                or self._touched(AGGREGATES.get(path, ()))
+            ):
+                data = await self.render(path, resource, "list")
+                return [] if data is None else [data]
+            return []
+
+        known = {
+            source: entry["page"]
+            for source, entry in self.files.items()
+            if entry.get("list") == path
+        }
+        if not (self.full or resource in self.wildcards or not known):
+            # Same entries in the same order; only pages showing a changed one
+            pages = [
+                self.render(source, resource, "list", list=path, page=page)
+                for source, page in known.items()
+                if self._affected(self.files[source])
+            ]
+            return [data for data in await asyncio.gather(*pages) if data is not None]
+
+        first = await self.render(
+            self._page_source(path, size_param, 1), resource, "list", list=path, page=1
+        )
+        if first is None:
+            return []
+        page_count = max(1, math.ceil(first["total_count"] / self.page_size))
+        rest = await asyncio.gather(
+            *(
+                self.render(
+                    self._page_source(path, size_param, page),
+                    resource,
+                    "list",
+                    list=path,
+                    page=page,
+                )
+                for page in range(2, page_count + 1)
+            )
+        )
+        for source, page in known.items():
+            if page > page_count:
+                self._remove(source)
+        return [first, *(data for data in rest if data is not None)]
+
+    async def build(self, dirty=None):
+        """
+        Render every target when `dirty` is None or there is no usable manifest,
+        otherwise only new targets and files referencing a dirty `resource:id`.
+        A `resource:*` ref re-renders every list of that resource.
+        """
+        started = time.perf_counter()
+        self.full = dirty is None or not self.files
+        self.dirty = set(dirty or ())
+        self.wildcards = {ref[:-2] for ref in self.dirty if ref.endswith(":*")}
+
+        payloads = await asyncio.gather(*(self.build_list(*spec) for spec in LISTS))
+
+        targets = {}
+        for (resource, _, _), datas in zip(LISTS, payloads):
+            for template, field, target_resource, kind in DETAILS.get(resource, ()):
+                for data in datas:
+                    for item in _items(data):
+                        if item.get(field) is None:
+                            continue
+                        source = template.format(item[field])
+                        if self.full or source not in self.files:
+                            owner = f"{resource}:{item['id']}"
+                            targets[source] = (target_resource, kind, owner)
+        if not self.full:
+            for source, entry in self.files.items():
+                if "owner" in entry and source not in targets and self._affected(entry):
+                    targets[source] = (entry["resource"], entry["kind"], entry["owner"])
+
+        await asyncio.gather(
+            *(self.render(source, *target) for source, target in targets.items())
+        )
+
+        if self.full:
+            for source in list(self.files):
+                if source not in self.rendered and source not in self.failed:
+                    self._remove(source)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "generated_at": datetime.utcnow().isoformat(),
+            "page_size": self.page_size,
+            "files": dict(sorted(self.files.items())),
+        }
+        _write_atomic(os.path.join(self.out_dir, MANIFEST), encode_json(manifest))
+
+        return {
+            "mode": "full" if self.full else "incremental",
+            "rendered": len(self.rendered),
+            "written": self.written,
+            "removed": self.removed,
+            "failed": self.failed,
+            "files": len(self.files),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+async def build_snapshot(
+    out_dir=None, full=False, changed=(), page_size=None, concurrency=None
+):
+    # Imported here; main imports the app's middleware from this package
+    from main import app
+
+    redis_client = await get_redis_client()
+    pending = {
+        ref.decode() if isinstance(ref, bytes) else ref
+        for ref in await redis_client.smembers(DIRTY_KEY)
+    }
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://snapshot",
+        headers={PREWARM_HEADER: "1"},
+    ) as client:
+        builder = SnapshotBuilder(
+            client,
+            out_dir or settings.snapshot_dir,
+            page_size or settings.snapshot_page_size,
+            concurrency or settings.snapshot_concurrency,
+        )
+        report = await builder.build(None if full else pending | set(changed))
+    if pending:
+        # Refs recorded while the build ran stay for the next one
+        await redis_client.srem(DIRTY_KEY, *pending)
+    return report
+
+
+async def observe_snapshot_backlog(redis_client=None):
+    """Report how many refs are waiting for the next incremental build."""
+    redis_client = redis_client or await get_redis_client()
+    BACKGROUND_QUEUE_DEPTH.labels(queue="snapshot").set(
+        await redis_client.scard(DIRTY_KEY)
+    )
+
+
+def dirty_refs(method: str, path: str):
+    """Refs a write to `path` may have changed, e.g. PUT /dogs/12 -> dogs:12."""
+    refs, resource = set(), None
+    for part in path[len(API_PREFIX) :].strip("/").split("/"):
+        if part in RESOURCES:
+            resource = part
+        elif resource and (part.isdigit() or len(part) == 36):
+            refs.add(f"{resource}:{part}")
+        elif part in NESTED_WRITES:
+            refs.add(f"{NESTED_WRITES[part]}:*")
+    if resource and (method in ("POST", "DELETE") or not refs):
+        # Lists gain or lose entries, which shifts every later page
+        refs.add(f"{resource}:*")
+    return refs
+
+
+async def snapshot_dirty_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if (
+        request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+        and request.cookies.get("access_token")
+        and request.url.path.startswith(API_PREFIX)
+    ):
+        refs = dirty_refs(request.method, request.url.path)
+        if refs:
+            try:
+                redis_client = await get_redis_client()
+                await redis_client.sadd(DIRTY_KEY, *refs)
+                await observe_snapshot_backlog(redis_client)
+            except Exception as e:
+                logger.warning(f"Could not record snapshot changes: {e}")
+    return response
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--out", default=settings.snapshot_dir)
+    parser.add_argument("--full", action="store_true", help="Render every file")
+    parser.add_argument(
+        "--changed",
+        nargs="*",
+        default=[],
+        help="Extra refs such as dogs:12 or litters:*",
+    )
+    parser.add_argument("--page-size", type=int, default=settings.snapshot_page_size)
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.snapshot_concurrency
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(
+        build_snapshot(
+            args.out, args.full, args.changed, args.page_size, args.concurrency
+        )
+    )
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
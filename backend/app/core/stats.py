@@ -0,0 +1,151 @@
+"""
+Admin dashboard statistics kept up to date as rows are written.
+
+Services record every create and delete after committing. Each one updates
+the running total in one Redis hash and that day's counts in a per-day hash:
+
+    stats:totals:{env}              dogs -> 42, litters -> 7, ...
+    stats:daily:2024-05-01:{env}    dogs:created -> 3, dogs:deleted -> 1, ...
+
+Dashboards read totals, deltas and daily series from those hashes without
+touching the tables. Counters can drift, e.g. when a process dies between
+the commit and the increment, so a nightly reconciliation resets the totals
+from COUNT(*) and records any correction in that day's hash. The stats: prefix
+is in PERSISTENT_PREFIXES, so clearing the cache never touches the counters:
+
+    python -m app.core.stats
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+
+import orjson
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.redis import get_redis_client
+from app.models import Breeding, ContactMessage, Dog, Litter, WaitlistEntry
+
+logger = logging.getLogger(__name__)
+
+TOTALS_KEY = f"stats:totals:{settings.env}"
+RECONCILED_FIELD = "_reconciled_at"
+RESOURCES = {
+    "contacts": ContactMessage,
+    "waitlist": WaitlistEntry,
+    "dogs": Dog,
+    "litters": Litter,
+    "breedings": Breeding,
+}
+
+
+def daily_key(day: date) -> str:
+    return f"stats:daily:{day.isoformat()}:{settings.env}"
+
+
+async def record_stats(resource: str, created: int = 0, deleted: int = 0):
+    """
+    Count rows created or deleted. Call after the commit; a failure only
+    leaves drift for the reconciliation to fix, so it never fails the write.
+    """
+    key = daily_key(datetime.utcnow().date())
+    try:
+        redis_client = await get_redis_client()
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.hincrby(TOTALS_KEY, resource, created - deleted)
+        if created:
+            pipe.hincrby(key, f"{resource}:created", created)
+        if deleted:
+            pipe.hincrby(key, f"{resource}:deleted", deleted)
+        pipe.expire(key, settings.stats_retention_days * 86400)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not record {resource} stats: {e}")
+
+
+async def reconcile_stats():
+    """Reset totals from the tables and log the drift that was corrected."""
+    async with async_session() as db:
+        counts = {}
+        for resource, model in RESOURCES.items():
+            result = await db.execute(select(func.count()).select_from(model))
+            counts[resource] = result.scalar_one()
+
+    redis_client = await get_redis_client()
+    totals = _decode_hash(await redis_client.hgetall(TOTALS_KEY))
+    drift = {}
+    for resource, count in counts.items():
+        recorded = totals.get(resource)
+        if recorded is not None and int(recorded) != count:
+            drift[resource] = count - int(recorded)
+
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.hset(
+        TOTALS_KEY,
+        mapping={**counts, RECONCILED_FIELD: datetime.utcnow().isoformat()},
+    )
+    key = daily_key(datetime.utcnow().date())
+    for resource, correction in drift.items():
+        pipe.hincrby(key, f"{resource}:drift", correction)
+    pipe.expire(key, settings.stats_retention_days * 86400)
+    await pipe.execute()
+
+    if drift:
+        logger.warning(f"Corrected stats drift: {drift}")
+    return {"totals": counts, "drift": drift}
+
+
+def _decode_hash(raw) -> dict:
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (
+            v.decode() if isinstance(v, bytes) else v
+        )
+        for k, v in raw.items()
+    }
+
+
+async def get_stats(days: int = 30):
+    """Totals, net change over the last `days` days and a per-day series."""
+    redis_client = await get_redis_client()
+    totals = _decode_hash(await redis_client.hgetall(TOTALS_KEY))
+    if RECONCILED_FIELD not in totals:
+        # First read, or the counters were lost
+        await reconcile_stats()
+        totals = _decode_hash(await redis_client.hgetall(TOTALS_KEY))
+
+    today = datetime.utcnow().date()
+    dates = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    pipe = redis_client.pipeline(transaction=False)
+    for day in dates:
+        pipe.hgetall(daily_key(day))
+    rollups = [_decode_hash(raw) for raw in await pipe.execute()]
+
+    series = {resource: [] for resource in RESOURCES}
+    deltas = dict.fromkeys(RESOURCES, 0)
+    for day, rollup in zip(dates, rollups):
+        for resource in RESOURCES:
+            created = int(rollup.get(f"{resource}:created", 0))
+            deleted = int(rollup.get(f"{resource}:deleted", 0))
+            series[resource].append(
+                {"date": day.isoformat(), "created": created, "deleted": deleted}
+            )
+            deltas[resource] += created - deleted
+
+    return {
+        "totals": {resource: int(totals.get(resource, 0)) for resource in RESOURCES},
+        "deltas": deltas,
+        "series": series,
+        "days": days,
+        "reconciled_at": totals.get(RECONCILED_FIELD),
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(
+        orjson.dumps(
+            asyncio.run(reconcile_stats()), option=orjson.OPT_INDENT_2
+        ).decode()
+    )
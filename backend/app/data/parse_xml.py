@@ -1,36 +1,238 @@
-import xml.etree.ElementTree as ET
+import argparse
 import json
+import os
+import resource
+import time
+import xml.etree.ElementTree as ET
 
+# Namespace mapping
+namespaces = {
+    "wp": "http://wordpress.org/export/1.2/",
+    "content": "http://purl.org/rss/1.0/modules/content/",
+    "excerpt": "http://wordpress.org/export/1.2/excerpt/",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
 
-def extract_data_from_xml(xml_file, json_file):
-    # Parse the XML file
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
+# WordPress post types we care about, mapped to the record type we emit
+POST_TYPES = {
+    "attachment": "attachment",
+    "post": "post",
+    "dog": "dog",
+    "dogs": "dog",
+    "breeding": "breeding",
+    "breedings": "breeding",
+}
+
+ITEM_TAG = "item"
+CHANNEL_TAG = "channel"
+
+
+def _text(item, path):
+    element = item.find(path, namespaces)
+    if element is None or element.text is None:
+        return None
+    return element.text
+
+
+def _item_to_record(item, record_type):
+    record = {
+        "type": record_type,
+        "post_id": _text(item, "wp:post_id"),
+        "title": _text(item, "title"),
+        "link": _text(item, "link"),
+        "post_name": _text(item, "wp:post_name"),
+        "status": _text(item, "wp:status"),
+        "post_date": _text(item, "wp:post_date"),
+        "post_parent": _text(item, "wp:post_parent"),
+    }
+
+    if record_type == "attachment":
+        record["attachment_url"] = _text(item, "wp:attachment_url")
+    else:
+        record["content"] = _text(item, "content:encoded")
+        record["excerpt"] = _text(item, "excerpt:encoded")
+
+    meta = {}
+    for postmeta in item.iterfind("wp:postmeta", namespaces):
+        key = _text(postmeta, "wp:meta_key")
+        if key:
+            meta[key] = _text(postmeta, "wp:meta_value")
+    record["meta"] = meta
 
-    # Namespace mapping
-    namespaces = {"wp": "http://wordpress.org/export/1.2/"}
+    return record
 
-    # List to hold extracted data
-    data = []
 
-    # Iterate over each item element
-    for item in root.findall("./channel/item"):
-        # Extract the link
-        link = item.find("link").text
+def iter_wordpress_items(xml_file, post_types=None):
+    """
+    Stream records out of a WordPress export one <item> at a time.
 
-        # Extract the wp:attachment_url
-        attachment_url = item.find("wp:attachment_url", namespaces).text
+    Each item is cleared and detached from <channel> as soon as it has been
+    converted, so memory stays flat regardless of the export size.
+    """
+    wanted = post_types or POST_TYPES
+    channel = None
 
-        # Append extracted data to the list
-        data.append({"link": link, "attachment_url": attachment_url})
+    for event, element in ET.iterparse(xml_file, events=("start", "end")):
+        if event == "start":
+            if element.tag == CHANNEL_TAG:
+                channel = element
+            continue
 
-    # Write data to JSON file
+        if element.tag != ITEM_TAG:
+            continue
+
+        post_type = _text(element, "wp:post_type")
+        record_type = wanted.get(post_type)
+        if record_type:
+            yield _item_to_record(element, record_type)
+
+        element.clear()
+        if channel is not None:
+            channel.remove(element)
+
+
+def extract_ndjson(xml_file, ndjson_file, post_types=None):
+    """
+    Write every attachment, post, dog and breeding in a single pass as NDJSON.
+    Returns the number of records written per type.
+    """
+    counts = {}
+    with open(ndjson_file, "w") as f:
+        for record in iter_wordpress_items(xml_file, post_types):
+            f.write(json.dumps(record))
+            f.write("\n")
+            counts[record["type"]] = counts.get(record["type"], 0) + 1
+    return counts
+
+
+def extract_data_from_xml(xml_file, json_file):
+    # Write the gallery list incrementally so the whole tree never sits in memory
     with open(json_file, "w") as f:
-        json.dump(data, f, indent=4)
+        f.write("[")
+        first = True
+        for record in iter_wordpress_items(xml_file, {"attachment": "attachment"}):
+            if not first:
+                f.write(",")
+            f.write("\n    ")
+            f.write(
+                json.dumps(
+                    {"link": record["link"], "attachment_url": record["attachment_url"]}
+                )
+            )
+            first = False
+        f.write("\n]" if not first else "]")
+
+
+SYNTHETIC_HEADER = """<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0"
+\txmlns:excerpt="http://wordpress.org/export/1.2/excerpt/"
+\txmlns:content="http://purl.org/rss/1.0/modules/content/"
+\txmlns:dc="http://purl.org/dc/elements/1.1/"
+\txmlns:wp="http://wordpress.org/export/1.2/"
+>
+<channel>
+\t<title>Synthetic Export</title>
+\t<wp:wxr_version>1.2</wp:wxr_version>
+"""
+
+SYNTHETIC_ITEM = """\t<item>
+\t\t<title><![CDATA[{title}]]></title>
+\t\t<link>https://example.com/{post_type}/{post_id}/</link>
+\t\t<dc:creator><![CDATA[admin]]></dc:creator>
+\t\t<content:encoded><![CDATA[{content}]]></content:encoded>
+\t\t<excerpt:encoded><![CDATA[]]></excerpt:encoded>
+\t\t<wp:post_id>{post_id}</wp:post_id>
+\t\t<wp:post_date><![CDATA[2024-05-24 15:03:20]]></wp:post_date>
+\t\t<wp:post_name><![CDATA[{post_type}-{post_id}]]></wp:post_name>
+\t\t<wp:status><![CDATA[publish]]></wp:status>
+\t\t<wp:post_parent>0</wp:post_parent>
+\t\t<wp:post_type><![CDATA[{post_type}]]></wp:post_type>
+\t\t<wp:attachment_url><![CDATA[https://example.com/uploads/{post_id}.jpeg]]></wp:attachment_url>
+\t\t<wp:postmeta>
+\t\t<wp:meta_key><![CDATA[_wp_attached_file]]></wp:meta_key>
+\t\t<wp:meta_value><![CDATA[uploads/{post_id}.jpeg]]></wp:meta_value>
+\t\t</wp:postmeta>
+\t</item>
+"""
+
+
+def write_synthetic_export(xml_file, size_mb):
+    """Generate a WordPress export of roughly `size_mb` megabytes."""
+    target = size_mb * 1024 * 1024
+    post_types = ["attachment", "attachment", "post", "dogs", "breeding"]
+    content = "Lorem ipsum dolor sit amet. " * 40
+    written = 0
+    post_id = 0
+
+    with open(xml_file, "w") as f:
+        f.write(SYNTHETIC_HEADER)
+        while written < target:
+            post_id += 1
+            post_type = post_types[post_id % len(post_types)]
+            chunk = SYNTHETIC_ITEM.format(
+                title=f"Item {post_id}",
+                post_type=post_type,
+                post_id=post_id,
+                content=content if post_type != "attachment" else "",
+            )
+            f.write(chunk)
+            written += len(chunk)
+        f.write("</channel>\n</rss>\n")
+
+    return post_id
+
+
+def benchmark(size_mb, workdir):
+    xml_file = os.path.join(workdir, "synthetic_export.xml")
+    ndjson_file = os.path.join(workdir, "synthetic_export.ndjson")
+
+    items = write_synthetic_export(xml_file, size_mb)
+    file_size = os.path.getsize(xml_file)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    counts = extract_ndjson(xml_file, ndjson_file)
+    elapsed = time.perf_counter() - start
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"Export size: {file_size / (1024 * 1024):.1f} MB, {items} items")
+    print(f"Records written: {counts}")
+    print(f"Elapsed: {elapsed:.2f}s ({file_size / (1024 * 1024) / elapsed:.1f} MB/s)")
+    print(f"Peak RSS: {rss_after / 1024:.1f} MB (before parse {rss_before / 1024:.1f} MB)")
+
+    os.remove(xml_file)
+    os.remove(ndjson_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WordPress export extraction")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gallery = subparsers.add_parser("gallery", help="Write gallery_data.json")
+    gallery.add_argument(
+        "xml_file", nargs="?", default="texastopnotchfrenchies.WordPress.2024-05-24.xml"
+    )
+    gallery.add_argument("json_file", nargs="?", default="gallery_data.json")
+
+    extract = subparsers.add_parser("extract", help="Stream all records as NDJSON")
+    extract.add_argument("xml_file")
+    extract.add_argument("ndjson_file")
+
+    bench = subparsers.add_parser("bench", help="Benchmark on a synthetic export")
+    bench.add_argument("--size-mb", type=int, default=1024)
+    bench.add_argument("--workdir", default=".")
+
+    args = parser.parse_args()
+
+    if args.command == "gallery":
+        extract_data_from_xml(args.xml_file, args.json_file)
+    elif args.command == "extract":
+        counts = extract_ndjson(args.xml_file, args.ndjson_file)
+        print(f"Wrote {counts} to {args.ndjson_file}")
+    elif args.command == "bench":
+        benchmark(args.size_mb, args.workdir)
 
 
-# Example usage
-extract_data_from_xml(
-    "texastopnotchfrenchies.WordPress.2024-05-24.xml",
-    "gallery_data.json",
-)
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from app.models.breeding import Breeding
-from app.models.dog import Dog, Photo, HealthInfo, StatusEnum, GenderEnum, Production, dog_production_link, DogStatusAssociation
+from app.models.dog import Dog, Photo, HealthInfo, StatusEnum, GenderEnum, Production, dog_production_link, DogStatusAssociation, DogCard, \
+    STATUS_BITS, mask_to_statuses, statuses_to_mask, status_mask_filter, retired_filter, status_names
 from app.models.litter import Litter, litter_puppies
 from app.models.user import User
 from app.models.navigation import NavLink
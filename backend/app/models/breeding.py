@@ -6,9 +6,9 @@ from sqlalchemy.orm import relationship
 class Breeding(Base):
     __tablename__ = "breedings"
     id = Column(Integer, primary_key=True, index=True)
-    female_dog_id = Column(Integer, ForeignKey("dogs.id"))
+    female_dog_id = Column(Integer, ForeignKey("dogs.id"), index=True)
     male_dog_id = Column(
-        Integer, ForeignKey("dogs.id"), nullable=True
+        Integer, ForeignKey("dogs.id"), nullable=True, index=True
     )  # Nullable to allow for manual sire details
     breeding_date = Column(Date, nullable=True)
     expected_birth_date = Column(Date, nullable=True)
@@ -1,9 +1,27 @@
 import enum
 
-from app.core.database import Base
-from sqlalchemy import Boolean, Column, Date, Enum, ForeignKey, Integer, String, Table
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    func,
+    literal,
+    null,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, array
 from sqlalchemy.orm import backref, relationship
 
+from app.core.database import Base
+
 
 class GenderEnum(enum.Enum):
     male = "Male"
@@ -20,20 +38,91 @@ class StatusEnum(enum.Enum):
     production = "Production"
 
 
-class DogStatusAssociation(Base):
-    __tablename__ = "dog_status_association"
-    dog_id = Column(
-        Integer, ForeignKey("dogs.id", ondelete="CASCADE"), primary_key=True
+# Bit per status in Dog.status_mask. Append new statuses; never reorder.
+STATUS_BITS = {status: 1 << bit for bit, status in enumerate(StatusEnum)}
+ALL_STATUS_MASKS = range(1 << len(STATUS_BITS))
+
+
+def statuses_to_mask(statuses) -> int:
+    mask = 0
+    for status in statuses:
+        mask |= STATUS_BITS[status]
+    return mask
+
+
+def mask_to_statuses(mask: int):
+    return [status for status, bit in STATUS_BITS.items() if mask & bit]
+
+
+def status_mask_filter(column, statuses, match_all: bool = False):
+    """
+    Predicate for dogs having any (or all) of `statuses`. Postgres cannot index
+    `mask & bits`, but with so few statuses the matching masks can be listed
+    outright, which turns the filter into an IN on the btree index.
+    """
+    wanted = statuses_to_mask(statuses)
+    if match_all:
+        masks = [mask for mask in ALL_STATUS_MASKS if mask & wanted == wanted]
+    else:
+        masks = [mask for mask in ALL_STATUS_MASKS if mask & wanted]
+    return column.in_(masks)
+
+
+def retired_filter(column, retired: bool):
+    """
+    Predicate for retired (or active) dogs. Active is `IS NOT TRUE`, the same
+    expression as the ix_dogs_active_dob predicate, so the planner can use
+    the partial index; it also counts dogs with no flag set as active.
+    """
+    return column.is_(True) if retired else column.isnot(True)
+
+
+def status_names(column):
+    """SQL array of the StatusEnum names set in a status mask, in enum order."""
+    return func.array_remove(
+        array(
+            [
+                case((column.op("&")(bit) != 0, literal(status.name, String(32))))
+                for status, bit in STATUS_BITS.items()
+            ]
+        ),
+        null(),
+        type_=ARRAY(String(32)),
     )
-    status = Column(Enum(StatusEnum), primary_key=True)
 
-    dog = relationship("Dog", back_populates="statuses")
+
+# Views are created by migrations. They are kept off Base.metadata so that
+# create_all and autogenerate never mistake them for tables.
+view_metadata = MetaData()
+
+dog_status_association_view = Table(
+    "dog_status_association",
+    view_metadata,
+    Column("dog_id", Integer, primary_key=True),
+    Column("status", Enum(StatusEnum), primary_key=True),
+    info={"is_view": True},
+)
+
+
+class DogStatusAssociation(Base):
+    """
+    Read-only view that expands Dog.status_mask back into one row per status,
+    kept for SQL and reports written against the old association table.
+    """
+    __table__ = dog_status_association_view
+
+    dog = relationship(
+        "Dog",
+        primaryjoin="foreign(DogStatusAssociation.dog_id) == Dog.id",
+        back_populates="statuses",
+        viewonly=True,
+    )
 
 
 class HealthInfo(Base):
     __tablename__ = "health_info"
     id = Column(Integer, primary_key=True, index=True)
-    dog_id = Column(Integer, ForeignKey("dogs.id", ondelete="CASCADE"))
+    dog_id = Column(Integer, ForeignKey("dogs.id", ondelete="CASCADE"), index=True)
     dna = Column(String(255))
     carrier_status = Column(String(255))
     extra_info = Column(String(255))
@@ -43,7 +132,7 @@ class HealthInfo(Base):
 class Photo(Base):
     __tablename__ = "photos"
     id = Column(Integer, primary_key=True, index=True)
-    dog_id = Column(Integer, ForeignKey("dogs.id", ondelete="CASCADE"))
+    dog_id = Column(Integer, ForeignKey("dogs.id", ondelete="CASCADE"), index=True)
     photo_url = Column(String(255), nullable=False)
     alt = Column(String(255), nullable=False)
     position = Column(Integer)
@@ -53,8 +142,13 @@ class Photo(Base):
 dog_production_link = Table(
     "dog_production_link",
     Base.metadata,
-    Column("dog_id", Integer, ForeignKey("dogs.id", ondelete="CASCADE")),
-    Column("production_id", Integer, ForeignKey("productions.id", ondelete="CASCADE")),
+    Column("dog_id", Integer, ForeignKey("dogs.id", ondelete="CASCADE"), index=True),
+    Column(
+        "production_id",
+        Integer,
+        ForeignKey("productions.id", ondelete="CASCADE"),
+        index=True,
+    ),
 )
 
 
@@ -66,8 +160,8 @@ class Production(Base):
     dob = Column(Date, nullable=True)
     owner = Column(String(255), nullable=True)
     description = Column(String(2500), nullable=True)
-    sire_id = Column(Integer, ForeignKey("dogs.id"), nullable=True)
-    dam_id = Column(Integer, ForeignKey("dogs.id"), nullable=True)
+    sire_id = Column(Integer, ForeignKey("dogs.id"), nullable=True, index=True)
+    dam_id = Column(Integer, ForeignKey("dogs.id"), nullable=True, index=True)
     gender = Column(Enum(GenderEnum), nullable=False)
     profile_photo = Column(String)
     sire = relationship("Dog", foreign_keys=[sire_id], backref="sired_productions")
@@ -79,9 +173,17 @@ class Production(Base):
 
 class Dog(Base):
     __tablename__ = "dogs"
+    __table_args__ = (
+        # Partial index for the public listings, which skip retired dogs
+        Index(
+            "ix_dogs_active_dob",
+            "dob",
+            postgresql_where=text("is_retired IS NOT TRUE"),
+        ),
+    )
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    dob = Column(Date, nullable=True)
+    dob = Column(Date, nullable=True, index=True)
     gender = Column(Enum(GenderEnum), nullable=False)
     color = Column(String(255), nullable=True)
     status = Column(Enum(StatusEnum), nullable=True)
@@ -91,11 +193,17 @@ class Dog(Base):
     description = Column(String(2500), nullable=True)
     pedigree_link = Column(String(255), nullable=True)
     video_url = Column(String(255), nullable=True)
-    parent_male_id = Column(Integer, ForeignKey("dogs.id"), nullable=True)
-    parent_female_id = Column(Integer, ForeignKey("dogs.id"), nullable=True)
+    parent_male_id = Column(Integer, ForeignKey("dogs.id"), nullable=True, index=True)
+    parent_female_id = Column(
+        Integer, ForeignKey("dogs.id"), nullable=True, index=True
+    )
     is_production = Column(Boolean, default=False)
     kennel_own = Column(Boolean, default=True)
     is_retired = Column(Boolean, default=False)
+    # One bit per status, see STATUS_BITS
+    status_mask = Column(
+        Integer, nullable=False, default=0, server_default="0", index=True
+    )
 
     health_infos = relationship("HealthInfo", back_populates="dog")
     photos = relationship("Photo", back_populates="dog")
@@ -110,5 +218,38 @@ class Dog(Base):
         "Production", secondary=dog_production_link, back_populates="dogs"
     )
     statuses = relationship(
-        "DogStatusAssociation", back_populates="dog", cascade="all, delete-orphan"
+        "DogStatusAssociation",
+        primaryjoin="Dog.id == foreign(DogStatusAssociation.dog_id)",
+        back_populates="dog",
+        viewonly=True,
     )
+
+
+class DogCard(Base):
+    """
+    Read model for the public dogs grid: one row per dog with its statuses and
+    profile photo inlined. Rows are rebuilt by `refresh_dog_cards` in the same
+    transaction as the dog, photo or status write that changes them.
+    """
+    __tablename__ = "dog_cards"
+    __table_args__ = (
+        Index("ix_dog_cards_retired_dob", "is_retired", "dob"),
+        Index("ix_dog_cards_statuses", "statuses", postgresql_using="gin"),
+    )
+    dog_id = Column(
+        Integer, ForeignKey("dogs.id", ondelete="CASCADE"), primary_key=True
+    )
+    name = Column(String(255), nullable=False)
+    dob = Column(Date, nullable=True)
+    gender = Column(Enum(GenderEnum), nullable=False, index=True)
+    color = Column(String(255), nullable=True)
+    # StatusEnum names, so the GIN index can answer "any of these statuses"
+    statuses = Column(ARRAY(String(32)), nullable=False, server_default="{}")
+    profile_photo = Column(String(255), nullable=True)
+    stud_fee = Column(Integer, nullable=True)
+    sale_fee = Column(Integer, nullable=True)
+    parent_male_id = Column(Integer, nullable=True, index=True)
+    parent_female_id = Column(Integer, nullable=True, index=True)
+    is_production = Column(Boolean, nullable=True)
+    kennel_own = Column(Boolean, nullable=True)
+    is_retired = Column(Boolean, nullable=True)
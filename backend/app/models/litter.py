@@ -1,19 +1,20 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Table, String, JSON
+from sqlalchemy import JSON, Column, Date, ForeignKey, Integer, String, Table
 from sqlalchemy.orm import relationship
+
 from app.core.database import Base
 
 litter_puppies = Table(
     "litter_puppies",
     Base.metadata,
-    Column("litter_id", Integer, ForeignKey("litters.id")),
-    Column("dog_id", Integer, ForeignKey("dogs.id")),
+    Column("litter_id", Integer, ForeignKey("litters.id"), index=True),
+    Column("dog_id", Integer, ForeignKey("dogs.id"), index=True),
 )
 
 
 class Litter(Base):
     __tablename__ = "litters"
     id = Column(Integer, primary_key=True, index=True)
-    breeding_id = Column(Integer, ForeignKey("breedings.id"))
+    breeding_id = Column(Integer, ForeignKey("breedings.id"), index=True)
     birth_date = Column(Date, nullable=True)
     number_of_puppies = Column(Integer, nullable=True)
     litter_url = Column(String, nullable=True)
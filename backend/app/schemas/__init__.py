@@ -1,5 +1,6 @@
 from app.schemas.dog_schema import DogCreate, PhotoCreate, Photo, Dog, HealthInfo, HealthInfoCreate, DogUpdate, \
-    Production, ProductionCreate, ProductionUpdate, DogChildSchema, GenderEnum, StatusEnum, PuppyCreate, DogParentSchema
+    Production, ProductionCreate, ProductionUpdate, DogChildSchema, GenderEnum, StatusEnum, PuppyCreate, DogParentSchema, \
+    DogCard, DogFacetsResponse
 from app.schemas.breeding_schema import Breeding, BreedingBase, BreedingCreate, Litter, LitterCreate, BreedingUpdate, \
     LitterUpdate
 from app.schemas.user_schema import UserCreateSchema, UserLoginSchema, UserSchema, TokenSchema, PublicToken
@@ -7,7 +8,7 @@ from app.schemas.image_schema import ImageResponse, VideoResponse, MediaResponse
 from app.schemas.global_schema import PaginatedResponse, WebsiteSettingsSchema, UpdateWebsiteSettingsSchema
 from app.schemas.search_schema import DogOut, ProductionOut, BreedingOut, LitterOut, SearchResponse, SearchResult
 from app.schemas.page_schema import PageCreate, Page, PageUpdate, Author, IMeta, Translation, AnnouncementType, \
-    Announcement, AnnouncementCreate, AnnouncementUpdate
+    Announcement, AnnouncementCreate, AnnouncementUpdate, PageIndexItem
 from app.schemas.navigation_schema import NavLink, NavLinkUpdate, NavLinkCreate
 from app.schemas.service_schema import ServiceStatus, ShippingType, TagCreate, TagResponse, ServiceCategoryCreate, \
     ServiceCategoryResponse, ShippingInfo, ServiceCreate, ServiceResponse, ServiceListResponse
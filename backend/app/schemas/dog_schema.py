@@ -1,6 +1,6 @@
 from datetime import date
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -150,6 +150,28 @@ class DogChildSchema(BaseModel):
     profile_photo: Optional[str] = None
 
 
+class DogCard(BaseModel):
+    id: int
+    name: str
+    dob: Optional[date] = None
+    gender: GenderEnum
+    color: Optional[str] = None
+    statuses: List[StatusEnum] = []
+    profile_photo: Optional[str] = None
+    stud_fee: Optional[int] = None
+    sale_fee: Optional[int] = None
+    is_production: Optional[bool] = False
+    kennel_own: Optional[bool] = True
+    is_retired: Optional[bool] = False
+
+
+class DogFacetsResponse(BaseModel):
+    items: List[DogCard]
+    total_count: int
+    # Facet name -> value -> number of matching dogs
+    facets: Dict[str, Dict[str, int]]
+
+
 class DogParentSchema(BaseModel):
     id: int
     name: str
@@ -121,3 +121,17 @@ class Page(PageBase):
 
     class Config:
         from_attributes = True
+
+
+class PageIndexItem(BaseModel):
+    """A page without its content, for listings and the sitemap."""
+    id: str
+    type: str
+    name: str
+    slug: str
+    status: Optional[str] = None
+    language: str
+    is_locked: Optional[bool] = False
+    created_at: Optional[datetime] = None
+    published_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -1,4 +1,3 @@
-import json
 import logging
 from typing import Dict, List, Optional
 
@@ -10,10 +9,11 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
 from app.core.redis import get_redis_client
+from app.core.stats import record_stats
 from app.models import Breeding, Dog
 from app.schemas import BreedingCreate, BreedingUpdate
-from app.utils import DateTimeEncoder
-from app.utils.schema_converters import convert_to_breeding_schema
+from app.utils import decode_cache, encode_cache
+from app.utils.schema_converters import breeding_to_dict, convert_to_breeding_schema
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -32,14 +32,12 @@ class BreedingService:
                     selectinload(Dog.photos),
                     selectinload(Dog.productions),
                     selectinload(Dog.children),
-                    selectinload(Dog.statuses),
                 ),
                 selectinload(Breeding.male_dog).options(
                     selectinload(Dog.health_infos),
                     selectinload(Dog.photos),
                     selectinload(Dog.productions),
                     selectinload(Dog.children),
-                    selectinload(Dog.statuses),
                 ),
             )
             .filter(Breeding.id == breeding_id)
@@ -55,7 +53,7 @@ class BreedingService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             offset = (page - 1) * page_size
             query = (
@@ -66,14 +64,12 @@ class BreedingService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Breeding.male_dog).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                 )
                 .offset(offset)
@@ -87,15 +83,12 @@ class BreedingService:
             total_count = total_count_result.scalar_one()
 
             data = {
-                "items": [
-                    convert_to_breeding_schema(breeding).dict()
-                    for breeding in breedings
-                ],
+                "items": [breeding_to_dict(breeding) for breeding in breedings],
                 "total_count": total_count,
             }
             await redis_client.set(
                 cache_key,
-                json.dumps(data, cls=DateTimeEncoder),
+                encode_cache(data),
                 ex=3600,  # Cache for 1 hour
             )
             return data
@@ -112,7 +105,7 @@ class BreedingService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             result = await db.execute(
                 select(Breeding)
@@ -122,14 +115,12 @@ class BreedingService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Breeding.male_dog).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                 )
                 .filter(Breeding.id == breeding_id)
@@ -140,7 +131,7 @@ class BreedingService:
             if breeding_schema:
                 await redis_client.set(
                     cache_key,
-                    json.dumps(breeding_schema.dict(), cls=DateTimeEncoder),
+                    encode_cache(breeding_schema.dict()),
                     ex=3600,  # Cache for 1 hour
                 )
 
@@ -178,6 +169,7 @@ class BreedingService:
 
             db.add(new_breeding)
             await db.commit()
+            await record_stats("breedings", created=1)
 
             # Reload with relationships
             breeding_with_relations = await self._load_breeding_with_relations(
@@ -249,6 +241,7 @@ class BreedingService:
             if breeding:
                 await db.delete(breeding)
                 await db.commit()
+                await record_stats("breedings", deleted=1)
 
                 # Clear breeding-specific and list caches
                 redis_client = await get_redis_client()
@@ -277,14 +270,12 @@ class BreedingService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Breeding.male_dog).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                 )
                 .filter(
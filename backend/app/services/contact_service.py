@@ -5,6 +5,7 @@ from app.schemas import ContactForm, PaginatedResponse
 from app.services.email_service import AzureEmailService
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.contact import ContactMessage
+from app.core.stats import record_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,7 @@ class ContactService:
             db.add(contact_message)
             await db.commit()
             await db.refresh(contact_message)
+            await record_stats("contacts", created=1)
             logger.info(f"Saved contact message with ID: {contact_message.id}")
             return contact_message
         except Exception as e:
@@ -1,32 +1,52 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 from app.core.config import settings
-from app.core.redis import get_redis_client
+from app.core.redis import delete_pattern, get_redis_client
+from app.core.stats import record_stats
 from app.models import (
     Dog,
-    DogStatusAssociation,
+    DogCard,
     GenderEnum,
     HealthInfo,
     Photo,
     Production,
 )
 from app.models import StatusEnum as ModelStatusEnum
+from app.models import (
+    mask_to_statuses,
+    retired_filter,
+    status_mask_filter,
+    status_names,
+    statuses_to_mask,
+)
 from app.schemas import Dog as DogSchema
 from app.schemas import DogCreate, DogUpdate
 from app.schemas import Production as ProductionSchema
 from app.schemas import ProductionCreate
-from app.utils import DateTimeEncoder
-from app.utils.schema_converters import convert_to_dog_schema
+from app.services.matching_service import invalidate_matches
+from app.utils import decode_cache, encode_cache
+from app.utils.schema_converters import convert_to_dog_schema, dog_to_dict
 from fastapi import HTTPException
-from sqlalchemy import delete
+from sqlalchemy import (
+    Integer,
+    column,
+    delete,
+    insert,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 
 if TYPE_CHECKING:
@@ -52,6 +72,225 @@ def normalize_url(url: str) -> str:
     return url.strip().lower()
 
 
+def diff_dog_update(dog: Dog, dog_data: DogUpdate) -> Dict[str, Any]:
+    """
+    Compare an incoming DogUpdate against the loaded dog (with photos loaded)
+    and return only what actually changed.
+    """
+    update_data = dog_data.dict(exclude_unset=True)
+    gallery_photos = update_data.pop("gallery_photos", None)
+    new_statuses = update_data.pop("statuses", None)
+
+    attributes = {}
+    for var, value in update_data.items():
+        if var == "gender" and value is not None:
+            value = GenderEnum(value)
+        if getattr(dog, var) != value:
+            attributes[var] = value
+
+    statuses = None
+    if new_statuses is not None:
+        current = set(mask_to_statuses(dog.status_mask or 0))
+        wanted = [ModelStatusEnum[status.name] for status in new_statuses]
+        statuses = {
+            "added": [status for status in dict.fromkeys(wanted) if status not in current],
+            "removed": [status for status in current if status not in wanted],
+        }
+
+    profile_photo = attributes.get("profile_photo", dog.profile_photo)
+    photos = {"insert": [], "delete": [], "reorder": {}}
+    existing_urls = {photo.photo_url for photo in dog.photos}
+
+    if "profile_photo" in attributes and profile_photo:
+        if profile_photo not in existing_urls:
+            photos["insert"].append({"photo_url": profile_photo, "position": 0})
+
+    if gallery_photos:
+        gallery = [url for url in gallery_photos if url != profile_photo]
+        wanted_positions = {url: idx + 1 for idx, url in enumerate(gallery)}
+        existing_photos = {
+            photo.photo_url: photo
+            for photo in dog.photos
+            if photo.photo_url != profile_photo
+        }
+        for url, position in wanted_positions.items():
+            photo = existing_photos.get(url)
+            if photo is None:
+                photos["insert"].append({"photo_url": url, "position": position})
+            elif photo.position != position:
+                photos["reorder"][photo.id] = position
+        photos["delete"] = [
+            photo.id
+            for url, photo in existing_photos.items()
+            if url not in wanted_positions
+        ]
+
+    return {"attributes": attributes, "statuses": statuses, "photos": photos}
+
+
+CARD_COLUMNS = [
+    "dog_id",
+    "name",
+    "dob",
+    "gender",
+    "color",
+    "statuses",
+    "profile_photo",
+    "stud_fee",
+    "sale_fee",
+    "parent_male_id",
+    "parent_female_id",
+    "is_production",
+    "kennel_own",
+    "is_retired",
+]
+
+
+async def refresh_dog_cards(db: AsyncSession, dog_ids: List[int]):
+    """
+    Rebuild the dog_cards rows for `dog_ids` from dogs and photos with one
+    INSERT ... SELECT; statuses are expanded from the status mask. Runs in the
+    caller's transaction so a card is never committed out of step with its dog.
+    """
+    if not dog_ids:
+        return
+    first_photo = (
+        select(Photo.photo_url)
+        .where(Photo.dog_id == Dog.id)
+        .order_by(Photo.position.asc().nulls_last(), Photo.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    rows = select(
+        Dog.id,
+        Dog.name,
+        Dog.dob,
+        Dog.gender,
+        Dog.color,
+        status_names(Dog.status_mask),
+        func.coalesce(Dog.profile_photo, first_photo),
+        Dog.stud_fee,
+        Dog.sale_fee,
+        Dog.parent_male_id,
+        Dog.parent_female_id,
+        Dog.is_production,
+        Dog.kennel_own,
+        Dog.is_retired,
+    ).where(Dog.id.in_(dog_ids))
+    stmt = pg_insert(DogCard).from_select(CARD_COLUMNS, rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DogCard.dog_id],
+        set_={name: stmt.excluded[name] for name in CARD_COLUMNS[1:]},
+    )
+    await db.execute(stmt)
+
+
+def dog_card_conditions(filters: Dict[str, Any]) -> List[Any]:
+    """WHERE clauses on dog_cards for the /filtered style query parameters."""
+    conditions = []
+    if isinstance(filters.get("gender"), str):
+        conditions.append(DogCard.gender == filters["gender"].lower())
+    if filters.get("status"):
+        status_names = [
+            STATUS_MAPPING[key].name
+            for key in (
+                status.replace(" ", "_").lower() for status in filters["status"]
+            )
+            if key in STATUS_MAPPING
+        ]
+        if status_names and filters.get("status_match") == "all":
+            conditions.append(DogCard.statuses.contains(status_names))
+        elif status_names:
+            conditions.append(DogCard.statuses.overlap(status_names))
+    if isinstance(filters.get("owned"), str):
+        conditions.append(DogCard.kennel_own == (filters["owned"].lower() == "true"))
+    if isinstance(filters.get("sire"), int):
+        conditions.append(DogCard.parent_male_id == filters["sire"])
+    if isinstance(filters.get("dam"), int):
+        conditions.append(DogCard.parent_female_id == filters["dam"])
+    if filters.get("retired") is not None:
+        conditions.append(retired_filter(DogCard.is_retired, filters["retired"]))
+    return conditions
+
+
+def dog_filter_signature(filters: Dict[str, Any]) -> str:
+    """Stable cache key part for a filter set, whatever the order of its values."""
+    normalized = {
+        key: sorted(value) if isinstance(value, list) else value
+        for key, value in filters.items()
+        if value is not None
+    }
+    digest = hashlib.sha1(json.dumps(normalized, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+# Facet name -> dog_cards column counted in its own grouping set
+FACET_COLUMNS = {
+    "gender": DogCard.gender,
+    "owned": DogCard.kennel_own,
+    "retired": DogCard.is_retired,
+    "sire": DogCard.parent_male_id,
+    "dam": DogCard.parent_female_id,
+}
+
+
+def _facet_value(facet: str, value) -> str:
+    if facet == "gender":
+        return value.value
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def dog_card_to_dict(row) -> Dict[str, Any]:
+    return {
+        "id": row.dog_id,
+        "name": row.name,
+        "dob": row.dob,
+        "gender": row.gender.value,
+        "color": row.color,
+        "statuses": [ModelStatusEnum[name].value for name in row.statuses],
+        "profile_photo": row.profile_photo,
+        "stud_fee": row.stud_fee,
+        "sale_fee": row.sale_fee,
+        "is_production": row.is_production,
+        "kennel_own": row.kennel_own,
+        "is_retired": row.is_retired,
+    }
+
+
+async def invalidate_dog_cards(redis_client):
+    """Drop cached card pages and facets after dog_cards rows change."""
+    cache_keys = await redis_client.keys(f"dog_cards:*:{settings.env}")
+    if cache_keys:
+        await redis_client.delete(*cache_keys)
+
+
+# Cached responses that embed dog data: the dog lists, and litters, breedings
+# and productions, which carry their puppies and parents
+DOG_CACHE_PATTERNS = (
+    "all_dogs:*",
+    "dogs_filtered_*",
+    "litter:*",
+    "litters:*",
+    "all_litters:*",
+    "breeding:*",
+    "all_breedings:*",
+    "production:*",
+    "all_productions:*",
+)
+
+
+async def invalidate_dog_caches(redis_client, dog_id: int):
+    """Drop every cached response that may show this dog."""
+    await redis_client.delete(f"dog:{dog_id}:{settings.env}", f"dog_productions_{dog_id}")
+    for pattern in DOG_CACHE_PATTERNS:
+        await delete_pattern(redis_client, f"{pattern}:{settings.env}")
+    await invalidate_dog_cards(redis_client)
+    # A sold, retired or deleted puppy must not stay allocated to an entry
+    await invalidate_matches()
+
+
 class DogService:
     def __init__(self):
         self.redis_client = None
@@ -70,7 +309,7 @@ class DogService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             offset = (page - 1) * page_size
             query = (
@@ -80,7 +319,6 @@ class DogService:
                     selectinload(Dog.photos),
                     selectinload(Dog.productions),
                     selectinload(Dog.children),
-                    selectinload(Dog.statuses),
                 )
                 .order_by(Dog.dob.asc().nulls_last())
                 .offset(offset)
@@ -94,11 +332,11 @@ class DogService:
             total_count = total_result.scalar_one()
 
             data = {
-                "items": [convert_to_dog_schema(dog).dict() for dog in dogs],
+                "items": [dog_to_dict(dog) for dog in dogs],
                 "total_count": total_count,
             }
             await redis_client.set(
-                cache_key, json.dumps(data, cls=DateTimeEncoder), ex=3600
+                cache_key, encode_cache(data), ex=3600
             )
             return data
         except SQLAlchemyError as e:
@@ -112,7 +350,7 @@ class DogService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return DogSchema(**json.loads(cached_data))
+                return DogSchema(**decode_cache(cached_data))
 
             result = await db.execute(
                 select(Dog)
@@ -122,7 +360,6 @@ class DogService:
                     selectinload(Dog.photos),
                     selectinload(Dog.productions),
                     selectinload(Dog.children),
-                    selectinload(Dog.statuses),
                 )
             )
             dog = result.scalars().first()
@@ -130,7 +367,7 @@ class DogService:
 
             if dog_schema:
                 await redis_client.set(
-                    cache_key, dog_schema.json(), ex=3600
+                    cache_key, encode_cache(dog_schema.dict()), ex=3600
                 )  # Cache for 1 hour
 
             return dog_schema
@@ -155,20 +392,14 @@ class DogService:
                 parent_female_id=dog_data.parent_female_id,
                 kennel_own=dog_data.kennel_own,
                 is_retired=dog_data.is_retired,
+                status_mask=statuses_to_mask(
+                    ModelStatusEnum[status.name] for status in dog_data.statuses or []
+                ),
             )
 
             db.add(new_dog)
             await db.flush()
 
-            if dog_data.statuses:
-                for status in dog_data.statuses:
-                    model_status = ModelStatusEnum[status.name]
-                    status = DogStatusAssociation(
-                        dog_id=new_dog.id, status=model_status
-                    )
-                    db.add(status)
-                await db.flush()
-
             new_photo = Photo(
                 dog_id=new_dog.id,
                 photo_url=dog_data.profile_photo,
@@ -209,8 +440,10 @@ class DogService:
                     )
                     db.add(new_health_info)
             await db.flush()
+            await refresh_dog_cards(db, [new_dog.id])
 
             await db.commit()
+            await record_stats("dogs", created=1)
             await db.refresh(
                 new_dog,
                 attribute_names=[
@@ -218,7 +451,6 @@ class DogService:
                     "photos",
                     "productions",
                     "children",
-                    "statuses",
                 ],
             )
             new_dog_schema = convert_to_dog_schema(new_dog)
@@ -226,7 +458,7 @@ class DogService:
             dog_cache_key = f"dog:{new_dog.id}:{settings.env}"
             await redis_client.set(
                 dog_cache_key,
-                json.dumps(new_dog_schema.dict(), cls=DateTimeEncoder),
+                encode_cache(new_dog_schema.dict()),
                 ex=3600,
             )
             logger.info(f"Added new dog to cache with key {dog_cache_key}")
@@ -236,14 +468,15 @@ class DogService:
             for cache_key in cache_keys:
                 cached_data = await redis_client.get(cache_key)
                 if cached_data:
-                    dogs_data = json.loads(cached_data)
+                    dogs_data = decode_cache(cached_data)
                     dogs_data["items"].append(new_dog_schema.dict())
                     await redis_client.set(
                         cache_key,
-                        json.dumps(dogs_data, cls=DateTimeEncoder),
+                        encode_cache(dogs_data),
                         ex=3600,
                     )
                     logger.info(f"Updated paginated list cache: {cache_key}")
+            await invalidate_dog_cards(redis_client)
 
             return new_dog_schema
 
@@ -257,6 +490,14 @@ class DogService:
     async def update_dog(
         self, dog_id: int, dog_data: DogUpdate, db: AsyncSession
     ) -> Optional[DogSchema]:
+        updated_dog_schema, _ = await self.update_dog_with_summary(
+            dog_id, dog_data, db
+        )
+        return updated_dog_schema
+
+    async def update_dog_with_summary(
+        self, dog_id: int, dog_data: DogUpdate, db: AsyncSession
+    ) -> Tuple[Optional[DogSchema], Optional[Dict[str, Any]]]:
         try:
             result = await db.execute(
                 select(Dog)
@@ -265,206 +506,150 @@ class DogService:
                     selectinload(Dog.photos),
                     selectinload(Dog.productions),
                     selectinload(Dog.children),
-                    selectinload(Dog.statuses),
                 )
                 .filter(Dog.id == dog_id)
             )
             dog = result.scalars().first()
-            if dog:
-                logger.info(f"Updating dog with ID: {dog_id}")
-                print(f"\n\n\nStatuses: {dog_data.statuses}\n\n\n")
-                for var, value in dog_data.dict(exclude_unset=True).items():
-                    if var == "gender" and isinstance(value, str):
-                        value = GenderEnum(value)
-                    elif var == "statuses":
-                        await db.execute(
-                            delete(DogStatusAssociation).where(
-                                DogStatusAssociation.dog_id == dog_id
-                            )
-                        )
-                        for status in value:
-                            model_status = ModelStatusEnum[status.name]
-                            new_status = DogStatusAssociation(
-                                dog_id=dog.id, status=model_status
-                            )
-                            db.add(new_status)
-                    else:
-                        setattr(dog, var, value)
-
-                logger.info(f"Updated main attributes for dog ID: {dog_id}")
-                await db.commit()
-
-                if dog_data.profile_photo:
-                    if dog.profile_photo != dog_data.profile_photo:
-                        dog.profile_photo = dog_data.profile_photo
-                        profile_photo = next(
-                            (
-                                photo
-                                for photo in dog.photos
-                                if photo.photo_url == dog.profile_photo
-                            ),
-                            None,
-                        )
-                        if not profile_photo:
-                            new_photo = Photo(
-                                dog_id=dog.id,
-                                photo_url=dog_data.profile_photo,
-                                alt=f"{dog.name}",
-                                position=0,
-                            )
-                            db.add(new_photo)
-                            logger.info(f"Added new profile photo for dog ID: {dog_id}")
-                    await db.commit()
-
-                # Update gallery photos (unchanged)
-                if dog_data.gallery_photos:
-                    gallery_photos = [
-                        url
-                        for url in dog_data.gallery_photos
-                        if url != dog_data.profile_photo
-                    ]
-                    updated_gallery_photos = [
-                        {
-                            "photo_url": url,
-                            "position": idx + 1,
-                        }
-                        for idx, url in enumerate(gallery_photos)
-                    ]
-                    existing_photos = {
-                        photo.photo_url: photo
-                        for photo in dog.photos
-                        if photo.photo_url != dog.profile_photo
-                    }
-                    updated_photo_urls = set()
-                    for photo_data in updated_gallery_photos:
-                        photo_url = photo_data["photo_url"]
-                        position = photo_data["position"]
-                        updated_photo_urls.add(photo_url)
-                        if photo_url in existing_photos:
-                            photo = existing_photos[photo_url]
-                            photo.position = position
-                            logger.info(
-                                f"Updated position for photo {photo_url} to {position}"
-                            )
-                        else:
-                            new_photo = Photo(
-                                dog_id=dog.id,
-                                photo_url=photo_url,
-                                alt=f"{dog.name}",
-                                position=position,
-                            )
-                            db.add(new_photo)
-                            logger.info(
-                                f"Added new gallery photo {photo_url} at position {position} for dog ID: {dog_id}"
-                            )
+            if not dog:
+                logger.warning(f"Dog with ID: {dog_id} not found")
+                return None, None
 
-                    existing_photo_urls = set(existing_photos.keys())
-                    photos_to_delete_urls = existing_photo_urls - updated_photo_urls
-                    photos_to_delete = [
-                        photo
-                        for url, photo in existing_photos.items()
-                        if url in photos_to_delete_urls
-                    ]
-                    for photo in photos_to_delete:
-                        await db.delete(photo)
-                        logger.info(
-                            f"Deleted photo {photo.photo_url} for dog ID: {dog_id}"
-                        )
-
-                    logger.info(f"Updated gallery photos for dog ID: {dog_id}")
-                    await db.commit()
-
-                # Add or update production info (unchanged)
-                if dog.parent_male_id or dog.parent_female_id:
-                    if dog.productions:
-                        production = dog.productions[0]
-                        production.name = dog.name
-                        production.dob = dog.dob
-                        production.owner = "Kristen Harper - Texas Top Notch Frenchies"
-                        production.description = dog.description
-                        production.sire_id = dog.parent_male_id
-                        production.dam_id = dog.parent_female_id
-                        production.gender = dog.gender
-                        logger.info(f"Updated production info for dog ID: {dog_id}")
-                    else:
-                        new_production = Production(
-                            name=dog.name,
-                            dob=dog.dob,
-                            owner="Kristen Harper - Texas Top Notch Frenchies",
-                            description=dog.description,
-                            sire_id=dog.parent_male_id,
-                            dam_id=dog.parent_female_id,
-                            gender=dog.gender,
-                        )
-                        db.add(new_production)
-                        await db.commit()
-                        await db.refresh(new_production)
-                        logger.info(f"Added new production for dog ID: {dog_id}")
+            logger.info(f"Updating dog with ID: {dog_id}")
+            changes = diff_dog_update(dog, dog_data)
+            summary = await self._apply_dog_changes(dog, changes, db)
+            await db.commit()
+            logger.info(f"Applied changes to dog ID {dog_id}: {summary}")
 
-                await db.commit()
+            updated_dog_schema = convert_to_dog_schema(dog)
 
-                # Invalidate cache for this dog
-                redis_client = await self.get_redis_client()
-                cache_key = f"dog:{dog_id}:{settings.env}"
-                await redis_client.flushall()
-                logger.info(f"Invalidated cache for dog ID: {dog_id}")
-
-                # Refresh dog with updated relations
-                await db.refresh(
-                    dog,
-                    attribute_names=[
-                        "health_infos",
-                        "photos",
-                        "productions",
-                        "children",
-                        "statuses",
-                    ],
-                )
-                dog.photos.sort(
-                    key=lambda photo: (
-                        photo.position if photo.position is not None else float("inf")
-                    )
-                )
-                updated_dog_schema = convert_to_dog_schema(dog)
-
-                await redis_client.set(
-                    cache_key,
-                    json.dumps(updated_dog_schema.dict(), cls=DateTimeEncoder),
-                    ex=3600,
-                )
+            # Invalidate cache for this dog
+            redis_client = await self.get_redis_client()
+            await invalidate_dog_caches(redis_client, dog_id)
+            logger.info(f"Invalidated cache for dog ID: {dog_id}")
 
-                # Update paginated lists in cache
-                pattern = f"all_dogs:*"
-                cache_keys = await redis_client.keys(pattern)
-                for cache_key in cache_keys:
-                    cached_data = await redis_client.get(cache_key)
-                    if cached_data:
-                        dogs_data = json.loads(cached_data)
-                        for item in dogs_data["items"]:
-                            if item["id"] == dog_id:
-                                index = dogs_data["items"].index(item)
-                                dogs_data["items"][index] = updated_dog_schema.dict()
-                                await redis_client.set(
-                                    cache_key,
-                                    json.dumps(dogs_data, cls=DateTimeEncoder),
-                                    ex=3600,
-                                )
-                                logger.info(
-                                    f"Updated dog in paginated list cache: {cache_key}"
-                                )
-                                break
+            await redis_client.set(
+                f"dog:{dog_id}:{settings.env}",
+                encode_cache(updated_dog_schema.dict()),
+                ex=3600,
+            )
 
-                return updated_dog_schema
-            else:
-                logger.warning(f"Dog with ID: {dog_id} not found")
-            return None
+            return updated_dog_schema, summary
         except SQLAlchemyError as e:
+            await db.rollback()
             logger.error(f"SQLAlchemyError in update_dog: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Internal Server Error")
         except Exception as e:
             logger.error(f"Exception in update_dog: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
+    async def _apply_dog_changes(
+        self, dog: Dog, changes: Dict[str, Any], db: AsyncSession
+    ) -> Dict[str, Any]:
+        """
+        Apply a change set from diff_dog_update with one set-based statement
+        per kind of change, keeping the loaded dog in sync so it can be
+        converted without re-fetching. The caller owns the commit.
+        """
+        for var, value in changes["attributes"].items():
+            setattr(dog, var, value)
+
+        statuses = changes["statuses"]
+        if statuses is not None and (statuses["added"] or statuses["removed"]):
+            # Written with the other column changes in the flush below
+            dog.status_mask = (
+                (dog.status_mask or 0) & ~statuses_to_mask(statuses["removed"])
+            ) | statuses_to_mask(statuses["added"])
+
+        photos = changes["photos"]
+        remaining_photos = list(dog.photos)
+        if photos["delete"]:
+            await db.execute(
+                delete(Photo).where(Photo.id.in_(photos["delete"])),
+                execution_options={"synchronize_session": False},
+            )
+            remaining_photos = [
+                photo for photo in remaining_photos if photo.id not in photos["delete"]
+            ]
+
+        if photos["reorder"]:
+            new_positions = values(
+                column("id", Integer),
+                column("position", Integer),
+                name="new_positions",
+            ).data(list(photos["reorder"].items()))
+            await db.execute(
+                update(Photo)
+                .where(Photo.id == new_positions.c.id)
+                .values(position=new_positions.c.position),
+                execution_options={"synchronize_session": False},
+            )
+            for photo in remaining_photos:
+                if photo.id in photos["reorder"]:
+                    set_committed_value(photo, "position", photos["reorder"][photo.id])
+
+        if photos["insert"]:
+            result = await db.execute(
+                insert(Photo).returning(Photo, sort_by_parameter_order=True),
+                [
+                    {
+                        "dog_id": dog.id,
+                        "photo_url": photo["photo_url"],
+                        "alt": f"{dog.name}",
+                        "position": photo["position"],
+                    }
+                    for photo in photos["insert"]
+                ],
+            )
+            remaining_photos.extend(result.scalars().all())
+
+        remaining_photos.sort(
+            key=lambda photo: (
+                photo.position if photo.position is not None else float("inf")
+            )
+        )
+        set_committed_value(dog, "photos", remaining_photos)
+
+        production_change = None
+        if dog.parent_male_id or dog.parent_female_id:
+            production_values = {
+                "name": dog.name,
+                "dob": dog.dob,
+                "owner": "Kristen Harper - Texas Top Notch Frenchies",
+                "description": dog.description,
+                "sire_id": dog.parent_male_id,
+                "dam_id": dog.parent_female_id,
+                "gender": dog.gender,
+            }
+            if dog.productions:
+                production = dog.productions[0]
+                if any(
+                    getattr(production, key) != value
+                    for key, value in production_values.items()
+                ):
+                    for key, value in production_values.items():
+                        setattr(production, key, value)
+                    production_change = "updated"
+            else:
+                dog.productions.append(Production(**production_values))
+                production_change = "created"
+
+        await db.flush()
+        await refresh_dog_cards(db, [dog.id])
+
+        return {
+            "attributes": sorted(changes["attributes"]),
+            "statuses_added": [
+                status.value for status in (statuses or {}).get("added", [])
+            ],
+            "statuses_removed": [
+                status.value for status in (statuses or {}).get("removed", [])
+            ],
+            "photos_inserted": len(photos["insert"]),
+            "photos_deleted": len(photos["delete"]),
+            "photos_reordered": len(photos["reorder"]),
+            "production": production_change,
+        }
+
     async def delete_dog(self, dog_id: int, db: AsyncSession) -> bool:
         try:
             result = await db.execute(select(Dog).filter(Dog.id == dog_id))
@@ -472,11 +657,12 @@ class DogService:
             if dog:
                 await db.delete(dog)
                 await db.commit()
+                await record_stats("dogs", deleted=1)
 
                 # Invalidate cache for this dog
                 redis_client = await self.get_redis_client()
-                cache_key = f"dog:{dog_id}"
-                await redis_client.delete(cache_key)
+                # The card row went with the dog (ON DELETE CASCADE)
+                await invalidate_dog_caches(redis_client, dog_id)
 
                 return True
             return False
@@ -511,7 +697,7 @@ class DogService:
 
             if cached_data:
                 productions = [
-                    ProductionSchema(**prod) for prod in json.loads(cached_data)
+                    ProductionSchema(**prod) for prod in decode_cache(cached_data)
                 ]
             else:
                 result = await db.execute(select(Dog).filter(Dog.id == dog_id))
@@ -520,7 +706,7 @@ class DogService:
                     productions = [prod for prod in dog.productions]
                     await redis.set(
                         cache_key,
-                        json.dumps([prod.dict() for prod in productions]),
+                        encode_cache([prod.dict() for prod in productions]),
                         ex=3600,
                     )
                 else:
@@ -546,7 +732,7 @@ class DogService:
             cached_data = await redis.get(cache_key)
 
             if cached_data:
-                dogs_data = json.loads(cached_data)
+                dogs_data = decode_cache(cached_data)
                 dogs = [DogSchema(**dog_data) for dog_data in dogs_data["items"]]
                 total_count = dogs_data["total_count"]
             else:
@@ -557,7 +743,6 @@ class DogService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     )
                     .order_by(Dog.dob.asc().nulls_last())
                 )
@@ -581,8 +766,12 @@ class DogService:
                                 if status.replace(" ", "_").lower() in STATUS_MAPPING
                             ]
                             if status_values:
-                                query = query.join(DogStatusAssociation).filter(
-                                    DogStatusAssociation.status.in_(status_values)
+                                filters_list.append(
+                                    status_mask_filter(
+                                        Dog.status_mask,
+                                        status_values,
+                                        match_all=filters.get("status_match") == "all",
+                                    )
                                 )
                         except KeyError as e:
                             logger.error(f"Invalid status provided: {e}")
@@ -610,7 +799,7 @@ class DogService:
 
                 if "retired" in filters and filters["retired"] is not None:
                     print("retired", filters["retired"])
-                    filters_list.append(Dog.is_retired == filters["retired"])
+                    filters_list.append(retired_filter(Dog.is_retired, filters["retired"]))
 
                 query = query.filter(*filters_list)
 
@@ -627,12 +816,12 @@ class DogService:
                 total_count = total_result.scalar_one()
 
                 dogs_data = {
-                    "items": [convert_to_dog_schema(dog).dict() for dog in dogs],
+                    "items": [dog_to_dict(dog) for dog in dogs],
                     "total_count": total_count,
                 }
 
                 await redis.set(
-                    cache_key, json.dumps(dogs_data, cls=DateTimeEncoder), ex=3600
+                    cache_key, encode_cache(dogs_data), ex=3600
                 )
 
             return {
@@ -646,3 +835,117 @@ class DogService:
         except Exception as e:
             logger.error(f"Error in get_dogs_filtered: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+    async def get_dog_cards(
+        self,
+        db: AsyncSession,
+        filters: Dict[str, Union[str, int, List[str], None]],
+        page: int = 1,
+        page_size: int = 10,
+    ) -> Dict[str, any]:
+        """
+        The public grid, read from dog_cards with one query: the page and its
+        total come back together through a window count.
+        """
+        try:
+            redis = await get_redis_client()
+            cache_key = (
+                f"dog_cards:{dog_filter_signature(filters)}:{page}:{page_size}"
+                f":{settings.env}"
+            )
+            cached_data = await redis.get(cache_key)
+            if cached_data:
+                return decode_cache(cached_data)
+
+            conditions = dog_card_conditions(filters)
+            offset = (page - 1) * page_size
+            result = await db.execute(
+                select(*DogCard.__table__.c, func.count().over().label("total_count"))
+                .where(*conditions)
+                .order_by(DogCard.dob.asc().nulls_last(), DogCard.dog_id)
+                .offset(offset)
+                .limit(page_size)
+            )
+            rows = result.all()
+            if rows:
+                total_count = rows[0].total_count
+            elif offset:
+                # Past the last page the window has no rows to report on
+                total_result = await db.execute(
+                    select(func.count()).select_from(DogCard).where(*conditions)
+                )
+                total_count = total_result.scalar_one()
+            else:
+                total_count = 0
+
+            data = {
+                "items": [dog_card_to_dict(row) for row in rows],
+                "total_count": total_count,
+            }
+            await redis.set(cache_key, encode_cache(data), ex=3600)
+            return data
+        except SQLAlchemyError as e:
+            logger.error(f"Error in get_dog_cards: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+    async def get_dog_facets(
+        self, db: AsyncSession, filters: Dict[str, Union[str, int, List[str], None]]
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Counts per gender, status, owned, retired, sire and dam for the dogs
+        matching `filters`, from one GROUPING SETS query. Each facet column is
+        its own grouping set; statuses are an array, so they are counted with
+        FILTER aggregates on the grand-total set instead.
+        """
+        try:
+            redis = await get_redis_client()
+            cache_key = f"dog_cards:facets:{dog_filter_signature(filters)}:{settings.env}"
+            cached_data = await redis.get(cache_key)
+            if cached_data:
+                return decode_cache(cached_data)
+
+            columns = list(FACET_COLUMNS.values())
+            query = (
+                select(
+                    *columns,
+                    *(
+                        func.grouping(column).label(f"grouping_{facet}")
+                        for facet, column in FACET_COLUMNS.items()
+                    ),
+                    func.count().label("count"),
+                    *(
+                        func.count()
+                        .filter(DogCard.statuses.any(status.name))
+                        .label(f"status_{status.name}")
+                        for status in ModelStatusEnum
+                    ),
+                )
+                .where(*dog_card_conditions(filters))
+                .group_by(func.grouping_sets(*columns, text("()")))
+            )
+            result = await db.execute(query)
+
+            facets = {facet: {} for facet in ("status", *FACET_COLUMNS)}
+            for row in result.all():
+                grouped = [
+                    facet
+                    for facet in FACET_COLUMNS
+                    if getattr(row, f"grouping_{facet}") == 0
+                ]
+                if not grouped:
+                    facets["status"] = {
+                        status.value: getattr(row, f"status_{status.name}")
+                        for status in ModelStatusEnum
+                        if getattr(row, f"status_{status.name}")
+                    }
+                    continue
+                facet = grouped[0]
+                value = getattr(row, FACET_COLUMNS[facet].key)
+                if value is not None:
+                    facets[facet][_facet_value(facet, value)] = row.count
+
+            await redis.set(cache_key, encode_cache(facets), ex=3600)
+            return facets
+        except SQLAlchemyError as e:
+            logger.error(f"Error in get_dog_facets: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
@@ -0,0 +1,211 @@
+"""
+Stream admin data out as CSV or NDJSON.
+
+Each export is a single flat query whose rows come through a server-side
+cursor in batches, so memory stays flat however many rows there are and no
+relationships are loaded per row. Many-to-many columns such as a waitlist
+entry's sires are aggregated into id lists by the query itself.
+"""
+
+import csv
+import io
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import replica_engine
+from app.models import (
+    ContactMessage,
+    Dog,
+    Litter,
+    WaitlistEntry,
+    litter_puppies,
+    mask_to_statuses,
+)
+from app.models.waitlist_entry import (
+    waitlist_dam_association,
+    waitlist_sire_association,
+)
+from app.utils import encode_json
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _id_list(table, key_column, value_column, label):
+    """One row per key with its related ids, for a single join."""
+    return (
+        select(
+            table.c[key_column].label("key"),
+            func.array_agg(table.c[value_column]).label(label),
+        )
+        .group_by(table.c[key_column])
+        .subquery()
+    )
+
+
+def _waitlist_query():
+    sires = _id_list(
+        waitlist_sire_association, "waitlist_entry_id", "dog_id", "sire_ids"
+    )
+    dams = _id_list(waitlist_dam_association, "waitlist_entry_id", "dog_id", "dam_ids")
+    return (
+        select(
+            WaitlistEntry.id,
+            WaitlistEntry.name,
+            WaitlistEntry.email,
+            WaitlistEntry.phone,
+            WaitlistEntry.gender_preference,
+            WaitlistEntry.color_preference,
+            WaitlistEntry.additional_info,
+            WaitlistEntry.breeding_id,
+            sires.c.sire_ids,
+            dams.c.dam_ids,
+        )
+        .outerjoin(sires, sires.c.key == WaitlistEntry.id)
+        .outerjoin(dams, dams.c.key == WaitlistEntry.id)
+        .order_by(WaitlistEntry.id)
+    )
+
+
+def _contact_query():
+    return select(
+        ContactMessage.id,
+        ContactMessage.name,
+        ContactMessage.email,
+        ContactMessage.message,
+    ).order_by(ContactMessage.id)
+
+
+def _dogs_query():
+    return select(
+        Dog.id,
+        Dog.name,
+        Dog.dob,
+        Dog.gender,
+        Dog.color,
+        Dog.status_mask.label("statuses"),
+        Dog.stud_fee,
+        Dog.sale_fee,
+        Dog.profile_photo,
+        Dog.pedigree_link,
+        Dog.parent_male_id,
+        Dog.parent_female_id,
+        Dog.is_production,
+        Dog.kennel_own,
+        Dog.is_retired,
+    ).order_by(Dog.id)
+
+
+def _litters_query():
+    puppies = _id_list(litter_puppies, "litter_id", "dog_id", "puppy_ids")
+    return (
+        select(
+            Litter.id,
+            Litter.breeding_id,
+            Litter.birth_date,
+            Litter.number_of_puppies,
+            Litter.litter_url,
+            Litter.description,
+            puppies.c.puppy_ids,
+        )
+        .outerjoin(puppies, puppies.c.key == Litter.id)
+        .order_by(Litter.id)
+    )
+
+
+EXPORTS = {
+    "waitlist": _waitlist_query,
+    "contact": _contact_query,
+    "dogs": _dogs_query,
+    "litters": _litters_query,
+}
+# Columns stored in another shape than they are exported
+ROW_CONVERTERS = {
+    "dogs": {
+        "statuses": lambda mask: [
+            status.value for status in mask_to_statuses(mask or 0)
+        ]
+    },
+}
+
+
+def _flat(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _csv_cell(value):
+    value = _flat(value)
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    if isinstance(value, dict):
+        return encode_json(value).decode()
+    return value
+
+
+class ExportService:
+    async def stream(self, resource: str, export_format: str):
+        """
+        Yield the export in chunks of `export_batch_size` rows. Reads go to
+        the replica when one is configured; the cursor needs a transaction,
+        so it uses its own connection rather than the request's session.
+        """
+        query = EXPORTS[resource]()
+        converters = ROW_CONVERTERS.get(resource, {})
+        columns = [column.name for column in query.selected_columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == "csv":
+            writer.writerow(columns)
+
+        rows = 0
+        try:
+            async with replica_engine.connect() as conn:
+                result = await conn.stream(
+                    query.execution_options(yield_per=settings.export_batch_size)
+                )
+                async for partition in result.partitions():
+                    for row in partition:
+                        record = row._asdict()
+                        for column, convert in converters.items():
+                            record[column] = convert(record[column])
+                        if export_format == "csv":
+                            writer.writerow(
+                                [_csv_cell(record[column]) for column in columns]
+                            )
+                        else:
+                            buffer.write(
+                                encode_json(
+                                    {k: _flat(v) for k, v in record.items()}
+                                ).decode()
+                            )
+                            buffer.write("\n")
+                    rows += len(partition)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+            logger.info(f"Exported {rows} {resource} rows as {export_format}")
+        except Exception as e:
+            # Headers are already sent, so the client only sees a short body
+            logger.error(
+                f"Error exporting {resource} after {rows} rows: {e}", exc_info=True
+            )
+            raise
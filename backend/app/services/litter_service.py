@@ -1,9 +1,10 @@
-import json
 import logging
+import time
 from typing import Dict, List, Optional
 
 from app.core.config import settings
 from app.core.redis import get_redis_client
+from app.core.stats import record_stats
 from app.models import (
     Breeding,
     Dog,
@@ -11,20 +12,32 @@ from app.models import (
     Litter,
     Photo,
     Production,
+    STATUS_BITS,
     StatusEnum,
     litter_puppies,
 )
 from app.schemas import Litter as LitterSchema
 from app.schemas import LitterCreate, LitterUpdate, PuppyCreate
-from app.utils import DateTimeEncoder, convert_to_litter_schema
+from app.services.dog_service import invalidate_dog_cards, refresh_dog_cards
+from app.services.matching_service import MatchingService, invalidate_matches
+from app.utils import (
+    convert_to_dog_schema,
+    convert_to_litter_schema,
+    decode_cache,
+    decode_json,
+    encode_cache,
+    litter_to_dict,
+)
 from fastapi import HTTPException
-from sqlalchemy import func
+from sqlalchemy import func, insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 logger = logging.getLogger(__name__)
+matching_svc = MatchingService()
 
 
 class LitterService:
@@ -38,7 +51,7 @@ class LitterService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             offset = (page - 1) * page_size
             query = (
@@ -51,11 +64,9 @@ class LitterService:
                             selectinload(Production.sire), selectinload(Production.dam)
                         ),
                         selectinload(Dog.children).options(
-                            selectinload(Dog.statuses),
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                         ),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Litter.breeding).options(
                         selectinload(Breeding.female_dog).options(
@@ -63,14 +74,12 @@ class LitterService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Breeding.male_dog).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                     ),
                 )
@@ -85,13 +94,11 @@ class LitterService:
             total_count = total_count_result.scalar_one()
 
             data = {
-                "items": [
-                    convert_to_litter_schema(litter).dict() for litter in litters
-                ],
+                "items": [litter_to_dict(litter) for litter in litters],
                 "total_count": total_count,
             }
             await redis_client.set(
-                cache_key, json.dumps(data, cls=DateTimeEncoder), ex=3600
+                cache_key, encode_cache(data), ex=3600
             )  # Cache for 1 hour
 
             return data
@@ -108,9 +115,9 @@ class LitterService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                cached_data_dict = json.loads(cached_data)
+                cached_data_dict = decode_cache(cached_data)
                 if isinstance(cached_data_dict.get("description"), str):
-                    cached_data_dict["description"] = json.loads(
+                    cached_data_dict["description"] = decode_json(
                         cached_data_dict["description"]
                     )
                 return LitterSchema(**cached_data_dict)
@@ -126,11 +133,9 @@ class LitterService:
                             selectinload(Production.sire), selectinload(Production.dam)
                         ),
                         selectinload(Dog.children).options(
-                            selectinload(Dog.statuses),
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                         ),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Litter.breeding).options(
                         selectinload(Breeding.female_dog).options(
@@ -138,14 +143,12 @@ class LitterService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Breeding.male_dog).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                     ),
                 )
@@ -156,7 +159,7 @@ class LitterService:
             if litter_schema:
                 await redis_client.set(
                     cache_key,
-                    json.dumps(litter_schema.dict(), cls=DateTimeEncoder),
+                    encode_cache(litter_schema.dict()),
                     ex=3600,
                 )  # Cache for 1 hour
 
@@ -179,6 +182,7 @@ class LitterService:
             )
             db.add(new_litter)
             await db.commit()
+            await record_stats("litters", created=1)
             await db.refresh(new_litter)
 
             # Re-fetch the litter with its relationships loaded
@@ -193,14 +197,12 @@ class LitterService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Breeding.male_dog).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                     ),
                 )
@@ -213,7 +215,7 @@ class LitterService:
             # Convert the litter to a dictionary (using .dict() since model_dump() is not available)
             litter_dict = convert_to_litter_schema(new_litter_with_relations).dict()
             await redis_client.set(
-                cache_key, json.dumps(litter_dict, cls=DateTimeEncoder), ex=3600
+                cache_key, encode_cache(litter_dict), ex=3600
             )
 
             # Invalidate any cached lists of litters:
@@ -241,7 +243,6 @@ class LitterService:
                             selectinload(Production.sire), selectinload(Production.dam)
                         ),
                         selectinload(Dog.children).options(
-                            selectinload(Dog.statuses),
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                         ),
@@ -252,14 +253,12 @@ class LitterService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Breeding.male_dog).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                     ),
                 )
@@ -284,11 +283,9 @@ class LitterService:
                                 selectinload(Production.dam),
                             ),
                             selectinload(Dog.children).options(
-                                selectinload(Dog.statuses),
                                 selectinload(Dog.health_infos),
                                 selectinload(Dog.photos),
                             ),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Litter.breeding).options(
                             selectinload(Breeding.female_dog).options(
@@ -296,14 +293,12 @@ class LitterService:
                                 selectinload(Dog.photos),
                                 selectinload(Dog.productions),
                                 selectinload(Dog.children),
-                                selectinload(Dog.statuses),
                             ),
                             selectinload(Breeding.male_dog).options(
                                 selectinload(Dog.health_infos),
                                 selectinload(Dog.photos),
                                 selectinload(Dog.productions),
                                 selectinload(Dog.children),
-                                selectinload(Dog.statuses),
                             ),
                         ),
                     )
@@ -337,6 +332,7 @@ class LitterService:
             if litter:
                 await db.delete(litter)
                 await db.commit()
+                await record_stats("litters", deleted=1)
 
                 # Remove the cache for this specific litter.
                 cache_key = f"litter:{litter_id}:{settings.env}"
@@ -346,6 +342,8 @@ class LitterService:
                 all_litters_keys = await redis_client.keys("all_litters:*")
                 for key in all_litters_keys:
                     await redis_client.delete(key)
+                await invalidate_dog_cards(redis_client)
+                await invalidate_matches()
 
                 return True
             return False
@@ -362,7 +360,7 @@ class LitterService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return [LitterSchema(**litter) for litter in json.loads(cached_data)]
+                return [LitterSchema(**litter) for litter in decode_cache(cached_data)]
 
             query = (
                 select(Litter)
@@ -372,16 +370,13 @@ class LitterService:
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions).options(
-                            selectinload(Dog.statuses),
                             selectinload(Production.sire),
                             selectinload(Production.dam),
                         ),
                         selectinload(Dog.children).options(
-                            selectinload(Dog.statuses),
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                         ),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Litter.breeding).options(
                         selectinload(Breeding.female_dog).options(
@@ -389,14 +384,12 @@ class LitterService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(Breeding.male_dog).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                     ),
                 )
@@ -408,7 +401,7 @@ class LitterService:
             if litter_schemas:
                 await redis_client.set(
                     cache_key,
-                    json.dumps([l.dict() for l in litter_schemas], cls=DateTimeEncoder),
+                    encode_cache([l.dict() for l in litter_schemas]),
                     ex=3600,
                 )  # Cache for 1 hour
             return litter_schemas
@@ -416,6 +409,83 @@ class LitterService:
             logger.error(f"Error in get_litters_by_breeding: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
 
+    async def _insert_puppies(
+        self,
+        db: AsyncSession,
+        litter_id: int,
+        puppy_rows: List[dict],
+        gallery_photos: List[List[str]],
+    ) -> List[Dog]:
+        """
+        Insert puppies, their gallery photos, litter links and dog cards as a
+        handful of multi-row statements. Relationships on the returned dogs are
+        filled from the RETURNING rows so they can be converted without a reload.
+        """
+        if not puppy_rows:
+            return []
+
+        start = time.perf_counter()
+        available = STATUS_BITS[StatusEnum.available]
+        result = await db.execute(
+            insert(Dog).returning(Dog, sort_by_parameter_order=True),
+            [{**row, "status_mask": available} for row in puppy_rows],
+        )
+        new_puppies = result.scalars().all()
+
+        photo_rows = [
+            {"dog_id": puppy.id, "photo_url": photo_url, "alt": f"{puppy.name}"}
+            for puppy, photo_urls in zip(new_puppies, gallery_photos)
+            for photo_url in photo_urls
+        ]
+        photos_by_dog = {puppy.id: [] for puppy in new_puppies}
+        if photo_rows:
+            result = await db.execute(
+                insert(Photo).returning(Photo, sort_by_parameter_order=True),
+                photo_rows,
+            )
+            for photo in result.scalars().all():
+                photos_by_dog[photo.dog_id].append(photo)
+
+        await db.execute(
+            litter_puppies.insert().values(
+                [
+                    {"litter_id": litter_id, "dog_id": puppy.id}
+                    for puppy in new_puppies
+                ]
+            )
+        )
+        await refresh_dog_cards(db, [puppy.id for puppy in new_puppies])
+
+        for puppy in new_puppies:
+            set_committed_value(puppy, "photos", photos_by_dog[puppy.id])
+            set_committed_value(puppy, "health_infos", [])
+            set_committed_value(puppy, "productions", [])
+            set_committed_value(puppy, "children", [])
+
+        logger.info(
+            f"Inserted {len(new_puppies)} puppies and {len(photo_rows)} photos "
+            f"for litter {litter_id} in {time.perf_counter() - start:.4f}s"
+        )
+        return new_puppies
+
+    async def _invalidate_litter_cache(self, litter_id: int):
+        redis_client = await get_redis_client()
+        litter_cache_key = f"litter:{litter_id}:{settings.env}"
+        await redis_client.delete(litter_cache_key)
+
+        all_litters_keys = await redis_client.keys("all_litters:*")
+        for key in all_litters_keys:
+            await redis_client.delete(key)
+        # Puppies were inserted and their card rows rebuilt
+        await invalidate_dog_cards(redis_client)
+
+    async def _refresh_matches(self, db: AsyncSession, litter_id: int):
+        # The litter is already saved; stale matches must not fail the request
+        try:
+            await matching_svc.refresh_litter(db, litter_id)
+        except Exception as e:
+            logger.warning(f"Could not refresh waitlist matches for litter {litter_id}: {e}")
+
     async def populate_litter(
         self, db: AsyncSession, breeding_id: int, litter: LitterCreate
     ) -> Litter:
@@ -428,29 +498,25 @@ class LitterService:
                 description=litter.description.dict() if litter.description else None,
             )
             db.add(db_litter)
-            await db.commit()
-            await db.refresh(db_litter)
+            await db.flush()
 
             # Generate default puppy objects based on the number_of_puppies
-            default_puppies = []
-            for i in range(litter.number_of_puppies or 0):
-                new_puppy = Dog(
-                    name=f"Default Puppy {i+1}",
-                    dob=litter.birth_date,  # using the litter's birth_date as a placeholder
-                    gender=GenderEnum.male,  # default placeholder; update later as needed
-                    status=StatusEnum.available,  # default status
-                )
-                db.add(new_puppy)
-                await db.commit()
-                await db.refresh(new_puppy)
-                default_puppies.append(new_puppy)
-                # Associate the puppy with the litter
-                await db.execute(
-                    litter_puppies.insert().values(
-                        litter_id=db_litter.id, dog_id=new_puppy.id
-                    )
-                )
+            default_puppies = [
+                {
+                    "name": f"Default Puppy {i+1}",
+                    "dob": litter.birth_date,  # using the litter's birth_date as a placeholder
+                    "gender": GenderEnum.male,  # default placeholder; update later as needed
+                    "status": StatusEnum.available,  # default status
+                }
+                for i in range(litter.number_of_puppies or 0)
+            ]
+            await self._insert_puppies(
+                db, db_litter.id, default_puppies, [[] for _ in default_puppies]
+            )
             await db.commit()
+            await record_stats("litters", created=1)
+            await record_stats("dogs", created=len(default_puppies))
+
             query = (
                 select(Litter)
                 .options(
@@ -462,7 +528,6 @@ class LitterService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(Litter.breeding)
                     .selectinload(Breeding.male_dog)
@@ -471,10 +536,8 @@ class LitterService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     # Eager load the puppies relationship and its nested relationships
-                    selectinload(Litter.puppies).selectinload(Dog.statuses),
                     selectinload(Litter.puppies).selectinload(Dog.health_infos),
                     selectinload(Litter.puppies).selectinload(Dog.photos),
                     selectinload(Litter.puppies).selectinload(Dog.children),
@@ -484,13 +547,8 @@ class LitterService:
             )
             result = await db.execute(query)
             litter_with_relations = result.scalar_one()
-            redis_client = await get_redis_client()
-            litter_cache_key = f"litter:{litter_with_relations.id}:{settings.env}"
-            await redis_client.delete(litter_cache_key)
-
-            all_litters_keys = await redis_client.keys("all_litters:*")
-            for key in all_litters_keys:
-                await redis_client.delete(key)
+            await self._invalidate_litter_cache(litter_with_relations.id)
+            await self._refresh_matches(db, litter_with_relations.id)
             return litter_with_relations
         except SQLAlchemyError as e:
             logger.error(f"Error in populate_litter: {e}", exc_info=True)
@@ -500,68 +558,40 @@ class LitterService:
         self, db: AsyncSession, litter_id: int, puppies: List[PuppyCreate]
     ):
         try:
-            result = await db.execute(select(Litter).filter(Litter.id == litter_id))
-            db_litter = result.scalars().first()
-            if not db_litter:
+            result = await db.execute(select(Litter.id).filter(Litter.id == litter_id))
+            if result.scalar_one_or_none() is None:
                 return None
 
-            puppy_objs = []
-            for puppy in puppies:
-                # Create Dog instance without gallery_photos
-                new_puppy = Dog(
-                    name=puppy.name,
-                    dob=puppy.dob,
-                    gender=GenderEnum(puppy.gender),
-                    color=puppy.color,
-                    status=StatusEnum.available,
-                    profile_photo=puppy.profile_photo,
-                    is_production=True,
-                    parent_male_id=puppy.parent_male_id,
-                    parent_female_id=puppy.parent_female_id,
-                    kennel_own=False,
-                    is_retired=False,
-                    description=puppy.description,
-                    pedigree_link=puppy.pedigree_link,
-                )
-                db.add(new_puppy)
-                await db.commit()
-                await db.refresh(new_puppy)
-
-                # Add gallery photos separately
-                for photo_url in puppy.gallery_photos:
-                    gallery_photo = Photo(
-                        dog_id=new_puppy.id,
-                        photo_url=photo_url,
-                        alt=f"{new_puppy.name}",
-                    )
-                    db.add(gallery_photo)
-                await db.commit()
-
-                puppy_objs.append(new_puppy)
-
-                await db.execute(
-                    litter_puppies.insert().values(
-                        litter_id=litter_id, dog_id=new_puppy.id
-                    )
-                )
-                await db.commit()
-
-            result = await db.execute(
-                select(Litter)
-                .filter(Litter.id == litter_id)
-                .options(
-                    selectinload(Litter.puppies).options(
-                        selectinload(Dog.health_infos),
-                        selectinload(Dog.photos),
-                        selectinload(Dog.productions),
-                        selectinload(Dog.children),
-                        selectinload(Dog.statuses),
-                    )
-                )
+            puppy_rows = [
+                {
+                    "name": puppy.name,
+                    "dob": puppy.dob,
+                    "gender": GenderEnum(puppy.gender),
+                    "color": puppy.color,
+                    "status": StatusEnum.available,
+                    "profile_photo": puppy.profile_photo,
+                    "is_production": True,
+                    "parent_male_id": puppy.parent_male_id,
+                    "parent_female_id": puppy.parent_female_id,
+                    "kennel_own": False,
+                    "is_retired": False,
+                    "description": puppy.description,
+                    "pedigree_link": puppy.pedigree_link,
+                }
+                for puppy in puppies
+            ]
+            new_puppies = await self._insert_puppies(
+                db,
+                litter_id,
+                puppy_rows,
+                [puppy.gallery_photos or [] for puppy in puppies],
             )
-            db_litter = result.scalars().first()
+            await db.commit()
+            await record_stats("dogs", created=len(new_puppies))
+            await self._invalidate_litter_cache(litter_id)
+            await self._refresh_matches(db, litter_id)
 
-            return puppy_objs
+            return [convert_to_dog_schema(puppy) for puppy in new_puppies]
 
         except SQLAlchemyError as e:
             logger.error(f"Error in add_puppies_to_litter: {e}", exc_info=True)
@@ -0,0 +1,475 @@
+"""
+Match waitlist entries to available puppies and upcoming breedings.
+
+Every open waitlist entry is scored against every candidate it could accept:
+an available puppy from a litter, or a slot in a breeding that has no litter
+yet. Entries are indexed by preferred sire, dam, breeding and gender, so a
+candidate is only scored against entries that could take it instead of the
+whole waitlist.
+
+The allocation gives each candidate slot to at most one entry and each entry
+at most one slot, maximizing total score. Ties go to the earlier signup. It is
+solved as a min-cost flow with successive shortest paths. Each candidate only
+keeps as many top entries as there are slots in total; no optimal allocation
+needs the others, which keeps the graph small however long the waitlist is.
+
+Scores are cached in Redis. Populating a litter only scores that litter's
+puppies and re-solves the allocation.
+"""
+
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis import get_redis_client
+from app.models import (
+    Breeding,
+    Dog,
+    Litter,
+    StatusEnum,
+    WaitlistEntry,
+    litter_puppies,
+    status_mask_filter,
+)
+from app.models.waitlist_entry import (
+    waitlist_dam_association,
+    waitlist_sire_association,
+)
+from app.utils import decode_cache, encode_cache
+
+logger = logging.getLogger(__name__)
+
+STATE_KEY = f"matching:state:{settings.env}"
+WEIGHTS = {"breeding": 8, "sire": 4, "dam": 4, "gender": 3, "color": 2}
+# Every compatible candidate scores at least this, so entries without
+# preferences still get allocated
+BASE_SCORE = 1
+
+
+def _color_tokens(color: Optional[str]) -> frozenset:
+    return frozenset(color.lower().replace("/", " ").split()) if color else frozenset()
+
+
+def _has_lineage(entry) -> bool:
+    return bool(entry["sires"] or entry["dams"] or entry["breeding_id"])
+
+
+def score_match(entry, candidate):
+    """
+    Return (score, reasons) for an entry and a candidate, or None when the
+    candidate's gender is wrong or it misses every sire, dam and breeding the
+    entry asked for. Colors only add to the score.
+    """
+    if (
+        entry["gender"]
+        and candidate["gender"]
+        and entry["gender"] != candidate["gender"]
+    ):
+        return None
+
+    score, reasons = BASE_SCORE, []
+    if entry["breeding_id"] and entry["breeding_id"] == candidate["breeding_id"]:
+        score += WEIGHTS["breeding"]
+        reasons.append("breeding")
+    if candidate["sire_id"] in entry["sires"]:
+        score += WEIGHTS["sire"]
+        reasons.append("sire")
+    if candidate["dam_id"] in entry["dams"]:
+        score += WEIGHTS["dam"]
+        reasons.append("dam")
+    if _has_lineage(entry) and not reasons:
+        return None
+    if entry["gender"] and entry["gender"] == candidate["gender"]:
+        score += WEIGHTS["gender"]
+        reasons.append("gender")
+    wanted_colors = _color_tokens(entry["color"])
+    if wanted_colors and wanted_colors <= _color_tokens(candidate["color"]):
+        score += WEIGHTS["color"]
+        reasons.append("color")
+    return score, reasons
+
+
+async def invalidate_matches():
+    """
+    Drop the saved allocation after waitlist, dog or litter changes that the
+    incremental litter refresh can't account for; the next read rebuilds it.
+    """
+    redis_client = await get_redis_client()
+    await redis_client.delete(STATE_KEY)
+
+
+class MatchIndex:
+    """Waitlist entries indexed by the preferences a candidate can satisfy."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = {entry["id"]: entry for entry in entries}
+        self.by_sire = defaultdict(set)
+        self.by_dam = defaultdict(set)
+        self.by_breeding = defaultdict(set)
+        # Entries without lineage preferences, by gender preference (or None)
+        self.open_by_gender = defaultdict(set)
+
+        for entry in entries:
+            for sire_id in entry["sires"]:
+                self.by_sire[sire_id].add(entry["id"])
+            for dam_id in entry["dams"]:
+                self.by_dam[dam_id].add(entry["id"])
+            if entry["breeding_id"]:
+                self.by_breeding[entry["breeding_id"]].add(entry["id"])
+            if not _has_lineage(entry):
+                self.open_by_gender[entry["gender"]].add(entry["id"])
+
+    def eligible(self, candidate) -> set:
+        entry_ids = (
+            self.by_sire.get(candidate["sire_id"], set())
+            | self.by_dam.get(candidate["dam_id"], set())
+            | self.by_breeding.get(candidate["breeding_id"], set())
+            | self.open_by_gender.get(None, set())
+        )
+        if candidate["gender"]:
+            entry_ids |= self.open_by_gender.get(candidate["gender"], set())
+        else:
+            for open_ids in self.open_by_gender.values():
+                entry_ids |= open_ids
+        return entry_ids
+
+    def score_candidate(self, candidate) -> List[List[int]]:
+        scores = []
+        for entry_id in self.eligible(candidate):
+            match = score_match(self.entries[entry_id], candidate)
+            if match is not None:
+                scores.append([entry_id, match[0]])
+        return scores
+
+
+def allocate(candidates, scores, entry_ids) -> Dict[str, int]:
+    """
+    Maximum-weight assignment of entries to candidate slots as a min-cost
+    flow: source -> candidate (capacity = slots) -> entry -> sink. Returns
+    {entry_id: candidate key}.
+    """
+    slots = sum(candidate["capacity"] for candidate in candidates)
+    if not slots or not entry_ids:
+        return {}
+
+    # Earlier signups win ties; scaled so seniority never outweighs a point
+    seniority = {
+        entry_id: len(entry_ids) - rank
+        for rank, entry_id in enumerate(sorted(entry_ids))
+    }
+    scale = (len(entry_ids) + 1) * (slots + 1)
+
+    graph = [[], []]  # source, sink; edges are [to, capacity, cost, reverse index]
+
+    def add_node():
+        graph.append([])
+        return len(graph) - 1
+
+    def add_edge(u, v, capacity, cost):
+        graph[u].append([v, capacity, cost, len(graph[v])])
+        graph[v].append([u, 0, -cost, len(graph[u]) - 1])
+
+    entry_nodes = {}
+    candidate_nodes = []
+    for candidate in candidates:
+        node = add_node()
+        candidate_nodes.append(node)
+        add_edge(0, node, candidate["capacity"], 0)
+        ranked = sorted(
+            scores.get(candidate["key"], []),
+            key=lambda pair: (pair[1], seniority[pair[0]]),
+            reverse=True,
+        )
+        for entry_id, score in ranked[:slots]:
+            if entry_id not in entry_nodes:
+                entry_nodes[entry_id] = add_node()
+                add_edge(entry_nodes[entry_id], 1, 1, 0)
+            add_edge(
+                node, entry_nodes[entry_id], 1, -(score * scale + seniority[entry_id])
+            )
+
+    # The graph is layered, so exact starting potentials come from one pass
+    potential = [0] * len(graph)
+    for node in entry_nodes.values():
+        potential[node] = min(
+            (-edge[2] for edge in graph[node] if edge[1] == 0), default=0
+        )
+    potential[1] = min((potential[node] for node in entry_nodes.values()), default=0)
+
+    while True:
+        distance = [None] * len(graph)
+        previous = [None] * len(graph)
+        distance[0] = 0
+        heap = [(0, 0)]
+        while heap:
+            dist, u = heapq.heappop(heap)
+            if dist > distance[u]:
+                continue
+            for index, (v, capacity, cost, _) in enumerate(graph[u]):
+                if capacity <= 0:
+                    continue
+                new_dist = dist + cost + potential[u] - potential[v]
+                if distance[v] is None or new_dist < distance[v]:
+                    distance[v] = new_dist
+                    previous[v] = (u, index)
+                    heapq.heappush(heap, (new_dist, v))
+
+        if distance[1] is None:
+            break
+        # Stop once another assignment would lower the total score
+        if distance[1] + potential[1] - potential[0] >= 0:
+            break
+        for node, dist in enumerate(distance):
+            if dist is not None:
+                potential[node] += dist
+
+        v = 1
+        while v != 0:
+            u, index = previous[v]
+            edge = graph[u][index]
+            edge[1] -= 1
+            graph[v][edge[3]][1] += 1
+            v = u
+
+    allocation = {}
+    node_entries = {node: entry_id for entry_id, node in entry_nodes.items()}
+    for candidate, node in zip(candidates, candidate_nodes):
+        for v, capacity, cost, _ in graph[node]:
+            if v in node_entries and cost < 0 and capacity == 0:
+                allocation[node_entries[v]] = candidate["key"]
+    return allocation
+
+
+class MatchingService:
+    async def _load_entries(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        result = await db.execute(
+            select(
+                WaitlistEntry.id,
+                WaitlistEntry.name,
+                WaitlistEntry.gender_preference,
+                WaitlistEntry.color_preference,
+                WaitlistEntry.breeding_id,
+            ).order_by(WaitlistEntry.id)
+        )
+        entries = {
+            row.id: {
+                "id": row.id,
+                "name": row.name,
+                "gender": (
+                    row.gender_preference.value if row.gender_preference else None
+                ),
+                "color": row.color_preference,
+                "breeding_id": row.breeding_id,
+                "sires": [],
+                "dams": [],
+            }
+            for row in result.all()
+        }
+        for table, key in (
+            (waitlist_sire_association, "sires"),
+            (waitlist_dam_association, "dams"),
+        ):
+            result = await db.execute(select(table.c.waitlist_entry_id, table.c.dog_id))
+            for entry_id, dog_id in result.all():
+                if entry_id in entries:
+                    entries[entry_id][key].append(dog_id)
+        return list(entries.values())
+
+    async def _load_puppies(self, db: AsyncSession, litter_id: Optional[int] = None):
+        query = (
+            select(
+                Dog.id,
+                Dog.gender,
+                Dog.color,
+                Dog.parent_male_id,
+                Dog.parent_female_id,
+                Litter.id.label("litter_id"),
+                Litter.breeding_id,
+                Breeding.male_dog_id,
+                Breeding.female_dog_id,
+            )
+            .join(litter_puppies, litter_puppies.c.dog_id == Dog.id)
+            .join(Litter, Litter.id == litter_puppies.c.litter_id)
+            .outerjoin(Breeding, Breeding.id == Litter.breeding_id)
+            .where(status_mask_filter(Dog.status_mask, [StatusEnum.available]))
+        )
+        if litter_id is not None:
+            query = query.where(Litter.id == litter_id)
+        result = await db.execute(query)
+        return [
+            {
+                "key": f"puppy:{row.id}",
+                "type": "puppy",
+                "id": row.id,
+                "litter_id": row.litter_id,
+                "breeding_id": row.breeding_id,
+                # Puppies added without parents inherit them from the breeding
+                "sire_id": row.parent_male_id or row.male_dog_id,
+                "dam_id": row.parent_female_id or row.female_dog_id,
+                "gender": row.gender.value if row.gender else None,
+                "color": row.color,
+                "capacity": 1,
+            }
+            for row in result.all()
+        ]
+
+    async def _load_upcoming_breedings(self, db: AsyncSession):
+        result = await db.execute(
+            select(
+                Breeding.id,
+                Breeding.male_dog_id,
+                Breeding.female_dog_id,
+                Breeding.manual_sire_color,
+            ).where(~Breeding.litters.any())
+        )
+        return [
+            {
+                "key": f"breeding:{row.id}",
+                "type": "breeding",
+                "id": row.id,
+                "litter_id": None,
+                "breeding_id": row.id,
+                "sire_id": row.male_dog_id,
+                "dam_id": row.female_dog_id,
+                "gender": None,
+                "color": None,
+                "capacity": settings.matching_breeding_slots,
+            }
+            for row in result.all()
+        ]
+
+    def _solve(self, state):
+        index = MatchIndex(state["entries"])
+        for candidate in state["candidates"]:
+            if candidate["key"] not in state["scores"]:
+                state["scores"][candidate["key"]] = index.score_candidate(candidate)
+        allocation = allocate(
+            state["candidates"],
+            state["scores"],
+            [entry["id"] for entry in state["entries"]],
+        )
+        # Stored as pairs; msgpack refuses integer map keys on the way back
+        state["allocation"] = sorted(allocation.items())
+        state["generated_at"] = datetime.utcnow().isoformat()
+        return state
+
+    async def _save(self, state):
+        redis_client = await get_redis_client()
+        await redis_client.set(STATE_KEY, encode_cache(state), ex=86400)
+
+    async def rebuild(self, db: AsyncSession) -> Dict[str, Any]:
+        try:
+            state = {
+                "entries": await self._load_entries(db),
+                "candidates": [
+                    *await self._load_puppies(db),
+                    *await self._load_upcoming_breedings(db),
+                ],
+                "scores": {},
+            }
+            state = self._solve(state)
+            await self._save(state)
+            logger.info(
+                f"Matched {len(state['allocation'])} of {len(state['entries'])} "
+                f"waitlist entries to {len(state['candidates'])} candidates"
+            )
+            return state
+        except SQLAlchemyError as e:
+            logger.error(f"Error in rebuild matches: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
+    async def refresh_litter(self, db: AsyncSession, litter_id: int):
+        """
+        Re-run after a litter is populated: the breeding stops being a
+        candidate, the litter's puppies are scored and the allocation is
+        solved again. Other candidates keep their cached scores.
+        """
+        redis_client = await get_redis_client()
+        state = decode_cache(await redis_client.get(STATE_KEY))
+        if state is None:
+            return await self.rebuild(db)
+
+        puppies = await self._load_puppies(db, litter_id)
+        result = await db.execute(
+            select(Litter.breeding_id).where(Litter.id == litter_id)
+        )
+        breeding_id = result.scalar_one_or_none()
+        stale = {f"breeding:{breeding_id}"} | {
+            candidate["key"]
+            for candidate in state["candidates"]
+            if candidate["litter_id"] == litter_id
+        }
+        state["candidates"] = [
+            candidate
+            for candidate in state["candidates"]
+            if candidate["key"] not in stale
+        ] + puppies
+        for key in stale:
+            state["scores"].pop(key, None)
+
+        state = self._solve(state)
+        await self._save(state)
+        return state
+
+    async def get_matches(self, db: AsyncSession, limit: int = None) -> Dict[str, Any]:
+        """Ranked candidates per entry and the allocation, with the reasons."""
+        limit = limit or settings.matching_ranked_limit
+        redis_client = await get_redis_client()
+        state = decode_cache(await redis_client.get(STATE_KEY))
+        if state is None:
+            state = await self.rebuild(db)
+
+        entries = {entry["id"]: entry for entry in state["entries"]}
+        candidates = {candidate["key"]: candidate for candidate in state["candidates"]}
+        ranked = defaultdict(list)
+        for key, pairs in state["scores"].items():
+            for entry_id, score in pairs:
+                ranked[entry_id].append((score, key))
+
+        def describe(entry_id, key):
+            score, reasons = score_match(entries[entry_id], candidates[key])
+            candidate = candidates[key]
+            return {
+                "candidate": key,
+                "type": candidate["type"],
+                "id": candidate["id"],
+                "litter_id": candidate["litter_id"],
+                "breeding_id": candidate["breeding_id"],
+                "score": score,
+                "reasons": reasons,
+            }
+
+        allocation = dict(state["allocation"])
+        return {
+            "generated_at": state["generated_at"],
+            "entries": [
+                {
+                    "entry_id": entry["id"],
+                    "name": entry["name"],
+                    "allocated": (
+                        describe(entry["id"], allocation[entry["id"]])
+                        if entry["id"] in allocation
+                        else None
+                    ),
+                    "matches": [
+                        describe(entry["id"], key)
+                        for _, key in sorted(ranked[entry["id"]], reverse=True)[:limit]
+                    ],
+                }
+                for entry in state["entries"]
+            ],
+            "unallocated_candidates": [
+                key
+                for key, candidate in candidates.items()
+                if candidate["capacity"]
+                > sum(1 for allocated in allocation.values() if allocated == key)
+            ],
+        }
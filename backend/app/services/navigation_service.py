@@ -1,6 +1,6 @@
-import json
+import hashlib
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.exc import SQLAlchemyError
@@ -8,17 +8,74 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
-from app.core.redis import get_redis_client
+from app.core.redis import delete_pattern, get_redis_client
 from app.models.navigation import NavLink
 from app.schemas import NavLink as NavLinkSchema
 from app.schemas import NavLinkCreate, NavLinkUpdate
+from app.utils import decode_cache, encode_cache, encode_json
 from app.utils.schema_converters import convert_to_navigation_schema
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bump when the tree's JSON shape changes so old blobs are never served
+NAV_TREE_VERSION = 1
+NAV_TREE_KEY = f"nav_tree:v{NAV_TREE_VERSION}:{settings.env}"
+
+
+def build_nav_tree(nav_links) -> List[dict]:
+    """Nest links under their parents, each level ordered by position."""
+    nodes = {
+        nav_link.id: {**convert_to_navigation_schema(nav_link).dict(), "sub_links": []}
+        for nav_link in nav_links
+    }
+
+    def in_cycle(node):
+        seen = set()
+        while node is not None and node["id"] not in seen:
+            seen.add(node["id"])
+            node = nodes.get(node["parent_id"])
+        return node is not None
+
+    roots = []
+    for node in sorted(nodes.values(), key=lambda node: (node["position"], node["id"])):
+        parent = nodes.get(node["parent_id"])
+        # Links whose parent is missing, or that are their own ancestor, are
+        # shown at the top level
+        if parent is None or in_cycle(node):
+            roots.append(node)
+        else:
+            parent["sub_links"].append(node)
+    return roots
+
 
 class NavigationService:
+    async def _invalidate_nav_cache(self, nav_link_id: Optional[int] = None):
+        redis_client = await get_redis_client()
+        if nav_link_id is not None:
+            await redis_client.delete(f"nav_link:{nav_link_id}:{settings.env}")
+        await delete_pattern(redis_client, f"nav_links:*:{settings.env}")
+        await redis_client.delete(NAV_TREE_KEY)
+
+    async def get_nav_tree(self, db: AsyncSession) -> Tuple[bytes, str]:
+        """
+        The whole menu as nested JSON, built once and cached as the response
+        body itself, with an ETag derived from it.
+        """
+        try:
+            redis_client = await get_redis_client()
+            body = await redis_client.get(NAV_TREE_KEY)
+
+            if body is None:
+                result = await db.execute(select(NavLink))
+                body = encode_json(build_nav_tree(result.scalars().all()))
+                await redis_client.set(NAV_TREE_KEY, body, ex=3600)
+
+            return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        except SQLAlchemyError as e:
+            logger.error(f"Error in get_nav_tree: {e}", exc_info=True)
+            raise HTTPException(status_code=500, detail=f"Internal Server Error: {e}")
+
     async def get_nav_links(
         self, db: AsyncSession, skip: int = 0, limit: int = 100
     ) -> List[NavLinkSchema]:
@@ -28,7 +85,7 @@ class NavigationService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             # Fetch all nav links in flat structure
             query = select(NavLink).offset(skip).limit(limit)
@@ -38,7 +95,7 @@ class NavigationService:
             # Cache the result
             await redis_client.set(
                 cache_key,
-                json.dumps(
+                encode_cache(
                     [
                         convert_to_navigation_schema(nav_link).dict()
                         for nav_link in nav_links
@@ -61,7 +118,7 @@ class NavigationService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return NavLink(**json.loads(cached_data))
+                return NavLink(**decode_cache(cached_data))
 
             query = select(NavLink).filter(NavLink.id == nav_link_id)
             result = await db.execute(query)
@@ -70,7 +127,7 @@ class NavigationService:
             if nav_link:
                 await redis_client.set(
                     cache_key,
-                    json.dumps(convert_to_navigation_schema(nav_link).dict()),
+                    encode_cache(convert_to_navigation_schema(nav_link).dict()),
                     ex=3600,
                 )
 
@@ -88,9 +145,7 @@ class NavigationService:
             await db.commit()
             await db.refresh(db_nav_link)
 
-            # Invalidate cache for nav links list
-            redis_client = await get_redis_client()
-            await redis_client.delete_pattern("nav_links:*")
+            await self._invalidate_nav_cache()
 
             return db_nav_link
         except SQLAlchemyError as e:
@@ -110,10 +165,7 @@ class NavigationService:
                 await db.commit()
                 await db.refresh(db_nav_link)
 
-                # Invalidate cache for this nav link and nav links list
-                redis_client = await get_redis_client()
-                await redis_client.delete(f"nav_link:{nav_link_id}")
-                await redis_client.delete_pattern("nav_links:*")
+                await self._invalidate_nav_cache(nav_link_id)
 
                 return db_nav_link
             return None
@@ -130,10 +182,7 @@ class NavigationService:
                 await db.delete(db_nav_link)
                 await db.commit()
 
-                # Invalidate cache for this nav link and nav links list
-                redis_client = await get_redis_client()
-                await redis_client.delete(f"nav_link:{nav_link_id}")
-                await redis_client.delete_pattern("nav_links:*")
+                await self._invalidate_nav_cache(nav_link_id)
 
                 return True
             return False
@@ -5,6 +5,7 @@ from uuid import UUID
 from datetime import datetime
 
 from fastapi import HTTPException
+from sqlalchemy import delete, insert, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -12,13 +13,27 @@ from sqlalchemy.orm import selectinload
 from app.core.redis import delete_pattern, get_redis_client
 from app.models import Page, CarouselImage, Announcement, AnnouncementType
 from app.schemas import Page as PageSchema, AnnouncementType as AnnouncementTypeSchema
-from app.schemas import PageCreate, PageUpdate
-from app.utils import DateTimeEncoder
+from app.schemas import PageCreate, PageIndexItem, PageUpdate
+from app.utils import decode_cache, encode_cache
 from app.utils.schema_converters import convert_to_page_schema
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+PAGE_INDEX_KEY = f"page_index:{settings.env}"
+PAGE_INDEX_COLUMNS = (
+    Page.id,
+    Page.type,
+    Page.name,
+    Page.slug,
+    Page.status,
+    Page.language,
+    Page.is_locked,
+    Page.created_at,
+    Page.published_at,
+    Page.updated_at,
+)
+
 
 class PageService:
     def __init__(self):
@@ -32,6 +47,41 @@ class PageService:
     async def clear_cache(self, pattern: str = "pages:*"):
         redis_client = await self.get_redis_client()
         await delete_pattern(redis_client, pattern)
+        await redis_client.delete(PAGE_INDEX_KEY)
+
+    async def get_page_index(
+        self,
+        db: AsyncSession,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> List[PageIndexItem]:
+        """
+        Every page without content, announcements or images. The whole index
+        is one small cache entry, so every filter combination is served from
+        it instead of caching each one.
+        """
+        redis_client = await self.get_redis_client()
+        cached_index = await redis_client.get(PAGE_INDEX_KEY)
+        if cached_index:
+            index = decode_cache(cached_index)
+        else:
+            result = await db.execute(select(*PAGE_INDEX_COLUMNS).order_by(Page.name))
+            index = [
+                PageIndexItem(**{**row._asdict(), "id": str(row.id)}).dict()
+                for row in result.all()
+            ]
+            try:
+                await redis_client.set(PAGE_INDEX_KEY, encode_cache(index), ex=3600)
+            except Exception as e:
+                logger.error(f"Failed to cache page index: {e}")
+
+        filters = {"status": status, "type": type, "language": language}
+        return [
+            PageIndexItem(**page)
+            for page in index
+            if all(value is None or page[key] == value for key, value in filters.items())
+        ]
 
     async def get_page(self, db: AsyncSession, page_id: str) -> Optional[PageSchema]:
         cache_key = f"page:{page_id}:{settings.env}"
@@ -40,7 +90,7 @@ class PageService:
         cached_page = await redis_client.get(cache_key)
         if cached_page:
             try:
-                page_data = json.loads(cached_page)
+                page_data = decode_cache(cached_page)
                 return convert_to_page_schema(page_data)
             except (json.JSONDecodeError, TypeError) as e:
                 logger.error(f"Failed to decode cache for page {page_id}: {e}")
@@ -57,7 +107,7 @@ class PageService:
             try:
                 page_data = page_schema.dict()  # Convert Pydantic model to dict
                 await redis_client.set(
-                    cache_key, json.dumps(page_data, cls=DateTimeEncoder), ex=3600
+                    cache_key, encode_cache(page_data), ex=3600
                 )
             except Exception as e:
                 logger.error(f"Failed to cache page {page_id}: {e}")
@@ -75,7 +125,7 @@ class PageService:
         cached_page = await redis_client.get(cache_key)
         if cached_page:
             try:
-                page_data = json.loads(cached_page)
+                page_data = decode_cache(cached_page)
                 return convert_to_page_schema(page_data)
             except (json.JSONDecodeError, TypeError) as e:
                 logger.error(f"Failed to decode cache for page slug {slug}: {e}")
@@ -91,7 +141,7 @@ class PageService:
             try:
                 page_data = page_schema.dict()
                 await redis_client.set(
-                    cache_key, json.dumps(page_data, cls=DateTimeEncoder), ex=3600
+                    cache_key, encode_cache(page_data), ex=3600
                 )
             except Exception as e:
                 logger.error(f"Failed to cache page slug {slug}: {e}")
@@ -131,6 +181,44 @@ class PageService:
 
         return convert_to_page_schema(db_page)
 
+    async def _sync_announcements(self, db: AsyncSession, db_page: Page, announcements):
+        """
+        Make the page's announcements match the payload with at most one
+        UPDATE, INSERT and DELETE statement, whatever the number of
+        announcements. The existing ones are already loaded with the page.
+        Payload ids that aren't this page's announcements are added as new.
+        """
+        existing_ids = {announcement.id for announcement in db_page.announcements}
+        updates, inserts = [], []
+        for announcement in announcements:
+            values = {
+                "title": announcement["title"],
+                "message": announcement["message"],
+                "category": AnnouncementType(announcement["category"]),
+            }
+            if announcement.get("id") in existing_ids:
+                announcement_date = announcement["date"]
+                if isinstance(announcement_date, str):
+                    announcement_date = datetime.fromisoformat(announcement_date)
+                updates.append({**values, "id": announcement["id"], "date": announcement_date})
+            else:
+                inserts.append({**values, "page_id": db_page.id})
+
+        deleted_ids = existing_ids - {row["id"] for row in updates}
+        if updates:
+            await db.execute(update(Announcement), updates)
+        if inserts:
+            await db.execute(insert(Announcement), inserts)
+        if deleted_ids:
+            await db.execute(
+                delete(Announcement)
+                .where(Announcement.id.in_(deleted_ids))
+                .execution_options(synchronize_session=False)
+            )
+        # Bulk statements bypass the loaded objects; reload them after commit
+        for announcement in db_page.announcements:
+            db.expire(announcement)
+
     async def update_page(
         self, db: AsyncSession, page_id: str, page: PageUpdate
     ) -> Optional[PageSchema]:
@@ -145,48 +233,9 @@ class PageService:
             update_data = page.dict(exclude_unset=True)
 
             if "announcements" in update_data:
-                new_announcements = []
-                for announcement in update_data["announcements"]:
-                    if isinstance(announcement["date"], str):
-                        announcement_date = datetime.fromisoformat(announcement["date"])
-                    else:
-                        announcement_date = announcement["date"]
-
-                    if "category" in announcement:
-                        announcement_category = AnnouncementType(announcement["category"])
-
-                    if "id" in announcement:
-                        existing_announcement = await db.execute(
-                            select(Announcement).filter(Announcement.id == announcement["id"])
-                        )
-                        existing_announcement = existing_announcement.scalars().first()
-
-                        if existing_announcement:
-                            existing_announcement.title = announcement["title"]
-                            existing_announcement.date = announcement_date
-                            existing_announcement.message = announcement["message"]
-                            existing_announcement.category = announcement_category
-                            new_announcements.append(existing_announcement)
-                        else:
-                            new_announcement = Announcement(
-                                title=announcement["title"],
-                                message=announcement["message"],
-                                category=announcement_category,
-                                page_id=page_id
-                            )
-                            new_announcements.append(new_announcement)
-                    else:
-                        new_announcement = Announcement(
-                            title=announcement["title"],
-                            message=announcement["message"],
-                            category=announcement_category,
-                            page_id=page_id
-                        )
-                        new_announcements.append(new_announcement)
-
-                db_page.announcements.clear()
-                db_page.announcements.extend(new_announcements)
-                del update_data["announcements"]
+                await self._sync_announcements(
+                    db, db_page, update_data.pop("announcements") or []
+                )
 
             if "customValues" in update_data:
                 custom_values = update_data["customValues"]
@@ -209,6 +258,7 @@ class PageService:
 
             await db.commit()
             await db.refresh(db_page)
+            await db.refresh(db_page, attribute_names=["announcements"])
 
             redis_client = await self.get_redis_client()
             await redis_client.delete(f"page:{page_id}")
@@ -228,7 +278,7 @@ class PageService:
         cached_pages = await redis_client.get(cache_key)
         if cached_pages:
             try:
-                pages_data = json.loads(cached_pages)
+                pages_data = decode_cache(cached_pages)
                 return [PageSchema(**page) for page in pages_data]
             except (json.JSONDecodeError, TypeError) as e:
                 logger.error(f"Failed to decode cached pages for key {cache_key}: {e}")
@@ -247,7 +297,7 @@ class PageService:
         try:
             pages_data = [page.dict() for page in page_schemas]
             await redis_client.set(
-                cache_key, json.dumps(pages_data, cls=DateTimeEncoder), ex=3600
+                cache_key, encode_cache(pages_data), ex=3600
             )  # Cache for 1 hour
         except Exception as e:
             logger.error(f"Failed to cache pages list for key {cache_key}: {e}")
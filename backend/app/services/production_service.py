@@ -1,4 +1,3 @@
-import json
 import logging
 from typing import Dict, List, Optional, Tuple
 
@@ -12,7 +11,7 @@ from sqlalchemy.orm import selectinload
 from app.core.redis import get_redis_client
 from app.models import GenderEnum, Production, dog_production_link
 from app.schemas import ProductionCreate, ProductionUpdate, GenderEnum as GenderEnumSchema
-from app.utils import DateTimeEncoder, convert_to_production_schema
+from app.utils import convert_to_production_schema, decode_cache, encode_cache
 from app.core.config import settings    
 
 logger = logging.getLogger(__name__)
@@ -41,7 +40,7 @@ class ProductionService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return json.loads(cached_data)
+                return decode_cache(cached_data)
 
             offset = (page - 1) * page_size
 
@@ -89,7 +88,7 @@ class ProductionService:
                 "total_count": total_count
             }
 
-            await redis_client.set(cache_key, json.dumps(data, cls=DateTimeEncoder), ex=3600)
+            await redis_client.set(cache_key, encode_cache(data), ex=3600)
             # Return results with metadata
             return {
                 "items": productions,
@@ -113,7 +112,7 @@ class ProductionService:
             cached_data = await redis_client.get(cache_key)
 
             if cached_data:
-                return Production(**json.loads(cached_data))
+                return Production(**decode_cache(cached_data))
 
             result = await db.execute(
                 select(Production)
@@ -128,7 +127,7 @@ class ProductionService:
 
             if production_schema:
                 await redis_client.set(
-                    cache_key, production_schema.json(), ex=3600
+                    cache_key, encode_cache(production_schema.dict()), ex=3600
                 )  # Cache for 1 hour
 
             return production_schema
@@ -158,7 +157,7 @@ class ProductionService:
             redis_client = await get_redis_client()
             cache_key = f"production:{new_production.id}:{settings.env}"
             production_schema = convert_to_production_schema(new_production)
-            await redis_client.set(cache_key, production_schema.json(), ex=3600)
+            await redis_client.set(cache_key, encode_cache(production_schema.dict()), ex=3600)
 
             paginated_cache_prefix = f"all_productions:*:{settings.env}"
             for key in await redis_client.keys(paginated_cache_prefix):
@@ -193,7 +192,7 @@ class ProductionService:
                 paginated_cache_prefix = f"all_productions:*:{settings.env}"
 
                 production_schema = convert_to_production_schema(production)
-                await redis_client.set(cache_key, production_schema.json(), ex=3600)
+                await redis_client.set(cache_key, encode_cache(production_schema.dict()), ex=3600)
 
                 for key in await redis_client.keys(paginated_cache_prefix):
                     await redis_client.delete(key)
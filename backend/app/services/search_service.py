@@ -10,10 +10,10 @@ from sqlalchemy.orm import joinedload, selectinload
 from app.models import Breeding, Dog, Litter, Production, dog_production_link
 from app.schemas import SearchResult
 from app.utils import (
-    convert_to_breeding_schema,
-    convert_to_dog_schema,
-    convert_to_litter_schema,
-    convert_to_production_schema,
+    breeding_to_dict,
+    dog_to_dict,
+    litter_to_dict,
+    production_to_dict,
 )
 
 logger = logging.getLogger(__name__)
@@ -44,7 +44,7 @@ async def search_resources(
             for dog in dogs:
                 dog_ids.add(dog.id)
                 results.append(
-                    SearchResult(type="dogs", data=convert_to_dog_schema(dog).dict())
+                    SearchResult(type="dogs", data=dog_to_dict(dog))
                 )
     except SQLAlchemyError as e:
         logger.error(f"Error querying dogs: {e}")
@@ -67,7 +67,7 @@ async def search_resources(
                 results.append(
                     SearchResult(
                         type="productions",
-                        data=convert_to_production_schema(production).dict(),
+                        data=production_to_dict(production),
                     )
                 )
     except SQLAlchemyError as e:
@@ -91,7 +91,7 @@ async def search_resources(
                 [
                     SearchResult(
                         type="breedings",
-                        data=convert_to_breeding_schema(breeding).dict(),
+                        data=breeding_to_dict(breeding),
                     )
                     for breeding in breedings
                 ]
@@ -119,7 +119,7 @@ async def search_resources(
             results.extend(
                 [
                     SearchResult(
-                        type="litters", data=convert_to_litter_schema(litter).dict()
+                        type="litters", data=litter_to_dict(litter)
                     )
                     for litter in litters
                 ]
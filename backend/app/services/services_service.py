@@ -1,17 +1,94 @@
+import hashlib
+import logging
+from collections import defaultdict
+from typing import Iterable, List, Optional
+
+from redis.exceptions import WatchError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from typing import List
 
+from app.core.config import settings
+from app.core.redis import get_redis_client
 from app.models import ServiceStatus, ShippingType, Tag, ServiceCategory, Service, service_tags
-from app.schemas import ServiceStatus, ShippingType, TagCreate, TagResponse, ServiceCategoryCreate, ServiceCategoryResponse, ShippingInfo, ServiceCreate, ServiceResponse, ServiceListResponse
+from app.schemas import ServiceStatus, ShippingType, TagCreate, TagResponse, ServiceCategoryCreate, ServiceCategoryResponse, ShippingInfo, ServiceCreate, ServiceResponse
+from app.utils import decode_cache, encode_cache, encode_json
 from app.utils.schema_converters import (
     convert_to_tag_schema,
     convert_to_service_category_schema,
     convert_to_service_schema,
-    convert_to_service_list_schema
 )
 
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = f"services_catalog:{settings.env}"
+CATALOG_VERSION_KEY = f"services_catalog:version:{settings.env}"
+# Bumped before every rebuild loads; only the latest rebuild may publish
+CATALOG_GENERATION_KEY = f"services_catalog:generation:{settings.env}"
+
+
+class ServiceCatalog:
+    """
+    Every service grouped by category in ``ServiceCategory.position`` order,
+    with the list responses serialized up front and a tag id -> service ids
+    index for multi-tag filtering. Built whole and never mutated; a write
+    replaces it.
+    """
+
+    def __init__(self, data: dict, version: str):
+        self.version = version
+        self.services = {service["id"]: service for service in data["services"]}
+        self.order = [service["id"] for service in data["services"]]
+        self.categories = data["categories"]
+        self.tag_index = defaultdict(set)
+        for service_id, tag_id in data["service_tags"]:
+            self.tag_index[tag_id].add(service_id)
+
+        self.list_body = encode_json({"services": data["services"]})
+        self.catalog_body = encode_json({"categories": self._grouped(self.order)})
+        self.category_bodies = {
+            category["id"]: encode_json(
+                {"services": [self.services[id] for id in category["service_ids"]]}
+            )
+            for category in self.categories
+            if category["id"] is not None and category["service_ids"]
+        }
+
+    def _grouped(self, service_ids: Iterable[int]) -> List[dict]:
+        wanted = set(service_ids)
+        groups = []
+        for category in self.categories:
+            services = [self.services[id] for id in category["service_ids"] if id in wanted]
+            if services:
+                groups.append(
+                    {
+                        "category": category["category"],
+                        "services": services,
+                    }
+                )
+        return groups
+
+    def filter(self, tag_ids: List[int], match_all: bool = False) -> List[int]:
+        """Service ids carrying all (or any) of the tags, in catalog order."""
+        matches = [self.tag_index.get(tag_id, set()) for tag_id in tag_ids]
+        if not matches:
+            return list(self.order)
+        selected = set.intersection(*matches) if match_all else set.union(*matches)
+        return [id for id in self.order if id in selected]
+
+    def services_body(self, service_ids: List[int]) -> Optional[bytes]:
+        if not service_ids:
+            return None
+        return encode_json({"services": [self.services[id] for id in service_ids]})
+
+    def catalog_body_for(self, service_ids: List[int]) -> bytes:
+        return encode_json({"categories": self._grouped(service_ids)})
+
+
+# This worker's copy, swapped whole when the version in Redis changes
+_catalog: Optional[ServiceCatalog] = None
+
+
 class ServicesService:
     async def get_tags(self, db: AsyncSession) -> List[TagResponse]:
         query = select(Tag)
@@ -31,6 +108,7 @@ class ServicesService:
         tag = Tag(name=tag_data.name)
         db.add(tag)
         await db.commit()
+        await self._refresh_catalog(db)
         await db.refresh(tag)
         return convert_to_tag_schema(tag)
 
@@ -42,6 +120,7 @@ class ServicesService:
         if tag:
             tag.name = tag_data.name
             await db.commit()
+            await self._refresh_catalog(db)
             await db.refresh(tag)
             return convert_to_tag_schema(tag)
         return None  # Handle this in route
@@ -54,6 +133,7 @@ class ServicesService:
         if tag:
             await db.delete(tag)
             await db.commit()
+            await self._refresh_catalog(db)
         return None
 
     async def get_categories(self, db: AsyncSession) -> List[ServiceCategoryResponse]:
@@ -77,6 +157,7 @@ class ServicesService:
         new_category = ServiceCategory(**category_data.dict())
         db.add(new_category)
         await db.commit()
+        await self._refresh_catalog(db)
         await db.refresh(new_category)
         return convert_to_service_category_schema(new_category)
 
@@ -93,6 +174,7 @@ class ServicesService:
             setattr(category, field, value)
 
         await db.commit()
+        await self._refresh_catalog(db)
         await db.refresh(category)
         return convert_to_service_category_schema(category)
 
@@ -107,6 +189,7 @@ class ServicesService:
 
         await db.delete(category)
         await db.commit()
+        await self._refresh_catalog(db)
 
     # async def get_shipping_info_by_service_id(self, service_id: int, db: AsyncSession) -> ShippingInfo:
     #     """Fetch shipping info for a specific service by the service ID."""
@@ -165,13 +248,10 @@ class ServicesService:
     #     await db.delete(shipping_info)
     #     await db.commit()
 
-    async def get_all_services(self, db: AsyncSession) -> ServiceListResponse:
-        """Fetch all available services."""
-        query = select(Service).options(selectinload(Service.category), selectinload(Service.tags))
-        result = await db.execute(query)
-        services = result.scalars().all()
-
-        return convert_to_service_list_schema(services)
+    async def get_all_services(self, db: AsyncSession) -> bytes:
+        """Fetch all available services, serialized, in catalog order."""
+        catalog = await self.get_catalog(db)
+        return catalog.list_body
 
     async def get_service_by_id(self, service_id: int, db: AsyncSession) -> ServiceResponse:
         """Fetch a service by its ID."""
@@ -187,33 +267,153 @@ class ServicesService:
 
         return convert_to_service_schema(service)
 
-    async def get_services_by_category(self, category_id: int, db: AsyncSession) -> ServiceListResponse:
-        """Fetch all services that belong to a specific category."""
-        query = select(Service).filter(Service.category_id == category_id).options(
-            selectinload(Service.category),
-            selectinload(Service.tags),
+    async def get_services_by_category(self, category_id: int, db: AsyncSession) -> Optional[bytes]:
+        """Fetch all services that belong to a specific category, serialized."""
+        catalog = await self.get_catalog(db)
+        return catalog.category_bodies.get(category_id)
+
+    async def get_services_by_tag(self, tag_id: int, db: AsyncSession) -> Optional[bytes]:
+        """Fetch all services associated with a specific tag, serialized."""
+        catalog = await self.get_catalog(db)
+        return catalog.services_body(catalog.filter([tag_id]))
+
+    async def get_services_catalog(
+        self, db: AsyncSession, tag_ids: Optional[List[int]] = None, match_all: bool = False
+    ) -> bytes:
+        """Services grouped by category, optionally narrowed to all/any of the tags."""
+        catalog = await self.get_catalog(db)
+        if not tag_ids:
+            return catalog.catalog_body
+        return catalog.catalog_body_for(catalog.filter(tag_ids, match_all))
+
+    async def _load_catalog_data(self, db: AsyncSession) -> dict:
+        result = await db.execute(
+            select(ServiceCategory).order_by(ServiceCategory.position, ServiceCategory.id)
         )
-        result = await db.execute(query)
-        services = result.scalars().all()
+        categories = [convert_to_service_category_schema(category).dict() for category in result.scalars().all()]
 
-        if not services:
-            raise NoResultFound(f"No services found in category with id {category_id}")
-
-        return convert_to_service_list_schema(services)
-
-    async def get_services_by_tag(self, tag_id: int, db: AsyncSession) -> ServiceListResponse:
-        """Fetch all services associated with a specific tag."""
-        query = select(Service).join(Service.tags).filter(Tag.id == tag_id).options(
-            selectinload(Service.category),
-            selectinload(Service.tags),
+        result = await db.execute(
+            select(service_tags.c.service_id, Tag.id, Tag.name)
+            .join(Tag, Tag.id == service_tags.c.tag_id)
+            .order_by(Tag.name)
         )
-        result = await db.execute(query)
-        services = result.scalars().all()
-
-        if not services:
-            raise NoResultFound(f"No services found with tag id {tag_id}")
-
-        return convert_to_service_list_schema(services)
+        tag_rows = result.all()
+        tag_names = defaultdict(list)
+        for service_id, _, tag_name in tag_rows:
+            tag_names[service_id].append(tag_name)
+
+        result = await db.execute(select(*Service.__table__.columns).order_by(Service.name))
+        services_by_category = defaultdict(list)
+        for row in result.all():
+            services_by_category[row.category_id].append(row)
+
+        category_by_id = {category["id"]: category for category in categories}
+        groups = [*categories, None]  # Services without a category go last
+        services, grouped = [], []
+        for category in groups:
+            category_id = category["id"] if category else None
+            rows = services_by_category.get(category_id, [])
+            if category is not None or rows:
+                grouped.append(
+                    {
+                        "id": category_id,
+                        "category": category,
+                        "service_ids": [row.id for row in rows],
+                    }
+                )
+            for row in rows:
+                services.append(
+                    {
+                        "id": row.id,
+                        "name": row.name,
+                        "description": row.description,
+                        "price": row.price,
+                        "availability": row.availability.value if row.availability else None,
+                        "cta_name": row.cta_name,
+                        "cta_link": row.cta_link,
+                        "disclaimer": row.disclaimer,
+                        "eta": row.eta,
+                        "estimated_price": row.estimated_price,
+                        "shipping_type": row.shipping_type.value if row.shipping_type else None,
+                        "image": row.image,
+                        "tags": tag_names.get(row.id, []),
+                        "category": category_by_id.get(row.category_id),
+                    }
+                )
+
+        return {
+            "categories": grouped,
+            "services": services,
+            "service_tags": [[service_id, tag_id] for service_id, tag_id, _ in tag_rows],
+        }
+
+    async def rebuild_catalog(self, db: AsyncSession) -> ServiceCatalog:
+        """
+        Rebuild from the database and publish the blob and its version in
+        one transaction, so no reader ever sees one without the other.
+
+        Concurrent rebuilds can finish in any order, so each takes a
+        generation before loading and publishes only while it is still the
+        latest. A later generation loaded after every earlier commit, so
+        skipping the older publish never loses a write.
+        """
+        global _catalog
+        redis_client = await get_redis_client()
+        generation = await redis_client.incr(CATALOG_GENERATION_KEY)
+        data = await self._load_catalog_data(db)
+        blob = encode_cache(data)
+        version = hashlib.blake2b(blob, digest_size=16).hexdigest()
+        catalog = ServiceCatalog(data, version)
+        try:
+            async with redis_client.pipeline(transaction=True) as pipe:
+                await pipe.watch(CATALOG_GENERATION_KEY)
+                current = await pipe.get(CATALOG_GENERATION_KEY)
+                if int(current or 0) != generation:
+                    logger.info("Skipped publishing a superseded services catalog")
+                    return catalog
+                pipe.multi()
+                pipe.set(CATALOG_KEY, blob)
+                pipe.set(CATALOG_VERSION_KEY, version)
+                await pipe.execute()
+        except WatchError:
+            logger.info("Skipped publishing a superseded services catalog")
+            return catalog
+        _catalog = catalog
+        return _catalog
+
+    async def _refresh_catalog(self, db: AsyncSession):
+        # The write is already committed; readers rebuild if this fails
+        global _catalog
+        try:
+            await self.rebuild_catalog(db)
+        except Exception as e:
+            logger.warning(f"Could not rebuild services catalog: {e}")
+            _catalog = None
+            try:
+                redis_client = await get_redis_client()
+                await redis_client.delete(CATALOG_KEY, CATALOG_VERSION_KEY)
+            except Exception as e:
+                logger.warning(f"Could not drop services catalog: {e}")
+
+    async def get_catalog(self, db: AsyncSession) -> ServiceCatalog:
+        """
+        One small read per request while the catalog is unchanged; the blob
+        is only fetched and indexed again after a write elsewhere.
+        """
+        global _catalog
+        redis_client = await get_redis_client()
+        version = await redis_client.get(CATALOG_VERSION_KEY)
+        version = version.decode() if isinstance(version, bytes) else version
+        if _catalog is not None and version == _catalog.version:
+            return _catalog
+
+        blob = await redis_client.get(CATALOG_KEY)
+        if blob is None:
+            return await self.rebuild_catalog(db)
+        _catalog = ServiceCatalog(
+            decode_cache(blob), hashlib.blake2b(blob, digest_size=16).hexdigest()
+        )
+        return _catalog
 
     async def create_service(self, service_data: ServiceCreate, db: AsyncSession) -> ServiceResponse:
         """Create a new service."""
@@ -235,6 +435,7 @@ class ServicesService:
 
         db.add(new_service)
         await db.commit()
+        await self._refresh_catalog(db)
 
         await db.refresh(new_service)
 
@@ -279,6 +480,7 @@ class ServicesService:
                 service.tags = tags
 
         await db.commit()
+        await self._refresh_catalog(db)
         await db.refresh(service)
 
         return convert_to_service_schema(service)
@@ -294,4 +496,5 @@ class ServicesService:
 
         await db.delete(service)
         await db.commit()
+        await self._refresh_catalog(db)
 
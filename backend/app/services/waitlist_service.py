@@ -9,6 +9,8 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.models import WaitlistEntry, Dog, Breeding
 from app.schemas import WaitlistCreate, WaitlistUpdate, WaitlistResponse
+from app.core.stats import record_stats
+from app.services.matching_service import invalidate_matches
 from app.utils.schema_converters import convert_to_waitlist_schema
 
 logger = logging.getLogger(__name__)
@@ -45,6 +47,8 @@ class WaitlistService:
 
             db.add(new_entry)
             await db.commit()
+            await invalidate_matches()
+            await record_stats("waitlist", created=1)
 
             # Manually query the newly created entry with selectinload to fetch related entities
             result = await db.execute(
@@ -56,14 +60,12 @@ class WaitlistService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.dams).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.breeding),
                 )
@@ -93,14 +95,12 @@ class WaitlistService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.dams).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.breeding),
                 )
@@ -138,14 +138,12 @@ class WaitlistService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.dams).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.breeding),
                 )
@@ -184,6 +182,7 @@ class WaitlistService:
                         setattr(entry, var, value)
 
                 await db.commit()
+                await invalidate_matches()
 
                 # Manually query the updated entry with selectinload to fetch related entities
                 result = await db.execute(
@@ -195,14 +194,12 @@ class WaitlistService:
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(WaitlistEntry.dams).options(
                             selectinload(Dog.health_infos),
                             selectinload(Dog.photos),
                             selectinload(Dog.productions),
                             selectinload(Dog.children),
-                            selectinload(Dog.statuses),
                         ),
                         selectinload(WaitlistEntry.breeding),
                     )
@@ -229,6 +226,8 @@ class WaitlistService:
             if entry:
                 await db.delete(entry)
                 await db.commit()
+                await invalidate_matches()
+                await record_stats("waitlist", deleted=1)
                 return True
             else:
                 raise HTTPException(status_code=404, detail="Waitlist entry not found")
@@ -262,14 +261,12 @@ class WaitlistService:
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.dams).options(
                         selectinload(Dog.health_infos),
                         selectinload(Dog.photos),
                         selectinload(Dog.productions),
                         selectinload(Dog.children),
-                        selectinload(Dog.statuses),
                     ),
                     selectinload(WaitlistEntry.breeding),
                 )
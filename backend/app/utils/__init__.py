@@ -1,14 +1,19 @@
+from app.utils.cache_codec import decode_cache, encode_cache
+from app.utils.converters import CaseConverter
+from app.utils.encoder import DateTimeEncoder, decode_json, encode_json
 from app.utils.exceptions import (
     CustomError,
     NotFoundError,
     PermissionDeniedError,
     ValidationError,
 )
-from app.utils.converters import CaseConverter
 from app.utils.schema_converters import (
+    breeding_to_dict,
+    convert_to_breeding_schema,
     convert_to_dog_schema,
     convert_to_litter_schema,
     convert_to_production_schema,
-    convert_to_breeding_schema,
+    dog_to_dict,
+    litter_to_dict,
+    production_to_dict,
 )
-from app.utils.encoder import DateTimeEncoder
@@ -0,0 +1,164 @@
+import enum
+import struct
+import zlib
+from collections import defaultdict
+from datetime import date, datetime
+from uuid import UUID
+
+import msgpack
+import orjson
+import zstandard
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.metrics import cache_key_prefix
+from app.utils.encoder import encode_json
+
+# Cache entries are written as HEADER + payload. The header starts with a byte
+# that can never open a JSON document, so entries written before the codec
+# existed (plain JSON text) are still read correctly during a deploy. Older
+# workers can't read the header, so it is only written once
+# `cache_codec_writes` is turned on.
+MAGIC = b"\xffC"
+VERSION = 1
+HEADER = struct.Struct(">2sBBBI")  # magic, version, serializer, compression, raw size
+
+SERIALIZERS = {"json": 0, "msgpack": 1}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2}
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+class CacheCodecError(ValueError):
+    pass
+
+
+def _msgpack_default(obj):
+    # Match what the JSON codec produces so callers see the same values
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _serialize(data, serializer: int) -> bytes:
+    if serializer == SERIALIZERS["msgpack"]:
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+    return encode_json(data)
+
+
+def _deserialize(payload: bytes, serializer: int):
+    if serializer == SERIALIZERS["msgpack"]:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if serializer == SERIALIZERS["json"]:
+        return orjson.loads(payload)
+    raise CacheCodecError(f"Unknown cache serializer {serializer}")
+
+
+def _compress(payload: bytes, compression: int) -> bytes:
+    if compression == COMPRESSIONS["zstd"]:
+        return _zstd_compressor.compress(payload)
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.compress(payload, 6)
+    return payload
+
+
+def _decompress(payload: bytes, compression: int) -> bytes:
+    if compression == COMPRESSIONS["zstd"]:
+        return _zstd_decompressor.decompress(payload)
+    if compression == COMPRESSIONS["zlib"]:
+        return zlib.decompress(payload)
+    if compression == COMPRESSIONS["none"]:
+        return payload
+    raise CacheCodecError(f"Unknown cache compression {compression}")
+
+
+def encode_cache(data) -> bytes:
+    """
+    Serialize a value for Redis with the configured serializer, compressing
+    it when it is larger than `cache_compression_threshold` bytes. Plain JSON
+    until `cache_codec_writes` is on.
+    """
+    if not settings.cache_codec_writes:
+        return encode_json(data)
+    serializer = SERIALIZERS[settings.cache_serializer]
+    payload = _serialize(data, serializer)
+    compression = COMPRESSIONS["none"]
+    if len(payload) >= settings.cache_compression_threshold:
+        compression = COMPRESSIONS[settings.cache_compression]
+    header = HEADER.pack(MAGIC, VERSION, serializer, compression, len(payload))
+    return header + _compress(payload, compression)
+
+
+def decode_cache(raw):
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if not raw.startswith(MAGIC):
+        # Written before the codec existed
+        return orjson.loads(raw)
+
+    _, version, serializer, compression, _ = HEADER.unpack_from(raw)
+    if version != VERSION:
+        raise CacheCodecError(f"Unsupported cache entry version {version}")
+    return _deserialize(_decompress(raw[HEADER.size :], compression), serializer)
+
+
+async def cache_memory_report(redis_client, pattern: str = "*"):
+    """
+    Group cache entries by key prefix and report stored bytes, the size the
+    payloads would take uncompressed, the size the same values take as plain
+    JSON and Redis' own memory usage figure. `saved_bytes` is what compression
+    saves on the serialized payload; `json_saved_bytes` is the saving against
+    the plain JSON entries written before the codec.
+    """
+    report = defaultdict(
+        lambda: {
+            "keys": 0,
+            "encoded_keys": 0,
+            "stored_bytes": 0,
+            "uncompressed_bytes": 0,
+            "json_bytes": 0,
+            "memory_usage_bytes": 0,
+        }
+    )
+    keys = [key async for key in redis_client.scan_iter(match=pattern, count=500)]
+
+    for start in range(0, len(keys), 500):
+        batch = keys[start : start + 500]
+        pipe = redis_client.pipeline(transaction=False)
+        for key in batch:
+            pipe.get(key)
+            pipe.memory_usage(key)
+        results = await pipe.execute(raise_on_error=False)
+
+        for i, key in enumerate(batch):
+            raw, memory = results[i * 2 : i * 2 + 2]
+            if raw is None or isinstance(raw, Exception):
+                continue  # Expired since the scan, or not a string value
+            entry = report[cache_key_prefix(key)]
+            entry["keys"] += 1
+            entry["stored_bytes"] += len(raw)
+            entry["memory_usage_bytes"] += memory if isinstance(memory, int) else 0
+            if raw.startswith(MAGIC) and len(raw) >= HEADER.size:
+                entry["encoded_keys"] += 1
+                entry["uncompressed_bytes"] += HEADER.unpack_from(raw)[4]
+                try:
+                    entry["json_bytes"] += len(encode_json(decode_cache(raw)))
+                except (CacheCodecError, ValueError, TypeError):
+                    entry["json_bytes"] += HEADER.unpack_from(raw)[4]
+            else:
+                entry["uncompressed_bytes"] += len(raw)
+                entry["json_bytes"] += len(raw)
+
+    for entry in report.values():
+        entry["saved_bytes"] = entry["uncompressed_bytes"] - entry["stored_bytes"]
+        entry["json_saved_bytes"] = entry["json_bytes"] - entry["stored_bytes"]
+    return dict(sorted(report.items(), key=lambda item: -item[1]["stored_bytes"]))
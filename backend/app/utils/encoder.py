@@ -1,9 +1,30 @@
 import json
 from datetime import date, datetime
 
+import orjson
+from pydantic import BaseModel
+
 
 class DateTimeEncoder(json.JSONEncoder):
     def default(self, obj):
         if isinstance(obj, (datetime, date)):
             return obj.isoformat()
         return super().default(obj)
+
+
+def _orjson_default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(data) -> bytes:
+    """
+    Serialize cache payloads and responses with orjson. Dates, datetimes,
+    UUIDs and enums are handled natively; pydantic models are dumped first.
+    """
+    return orjson.dumps(data, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_json(data):
+    return orjson.loads(data)
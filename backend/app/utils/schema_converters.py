@@ -1,31 +1,44 @@
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Union
+from uuid import UUID
+
+from app.models import (
+    Announcement,
+    Breeding,
+    Dog,
+    Litter,
+    NavLink,
+    Page,
+    Production,
+    Service,
+    ServiceCategory,
+    Tag,
+    WaitlistEntry,
+    mask_to_statuses,
+)
+from app.schemas import Announcement as AnnouncementSchema
+from app.schemas import Author
+from app.schemas import Breeding as BreedingSchema
+from app.schemas import Dog as DogSchema
+from app.schemas import DogChildSchema, IMeta
+from app.schemas import Litter as LitterSchema
+from app.schemas import NavLink as NavLinkSchema
+from app.schemas import Page as PageSchema
+from app.schemas import PageCreate as PageCreateSchema
+from app.schemas import PageUpdate as PageUpdateSchema
+from app.schemas import Photo as PhotoSchema
+from app.schemas import Production as ProductionSchema
 from app.schemas import (
-    Dog as DogSchema,
-    Production as ProductionSchema,
-    DogChildSchema,
-    Litter as LitterSchema,
-    Breeding as BreedingSchema,
-    Page as PageSchema,
-    PageCreate as PageCreateSchema,
-    PageUpdate as PageUpdateSchema,
-    NavLink as NavLinkSchema,
-    Author,
-    IMeta,
-    Translation,
-    Announcement as AnnouncementSchema,
-    TagResponse,
     ServiceCategoryResponse,
-    ServiceResponse,
     ServiceListResponse,
+    ServiceResponse,
     ServiceStatus,
+    TagResponse,
+    Translation,
     WaitlistResponse,
-    Photo as PhotoSchema,)
-from app.models import Dog, Litter, Breeding, Production, NavLink, Announcement, Page, Tag, ServiceCategory, Service, \
-    WaitlistEntry
-import json
-from typing import Union, Dict, Any, List
-import logging
-from uuid import UUID
-from datetime import datetime
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +54,7 @@ def convert_to_dog_schema(dog: Dog) -> DogSchema:
         dob=dog.dob,
         gender=dog.gender,
         color=dog.color,
-        statuses=[status.status for status in dog.statuses], 
+        statuses=mask_to_statuses(dog.status_mask or 0),
         profile_photo=dog.profile_photo,
         stud_fee=dog.stud_fee,
         sale_fee=dog.sale_fee,
@@ -141,6 +154,129 @@ def convert_to_production_schema(production: Production) -> ProductionSchema:
     )
 
 
+# Trusted fast path: rows loaded straight from the database are already valid,
+# so these build the same dicts as `convert_to_*_schema(...).dict()` without
+# running pydantic validation. Use them where the result is only cached or
+# serialized; keep the schema converters for anything built from user input.
+
+
+def _enum_value(value):
+    return value.value if value is not None else None
+
+
+def _photo_position(photo):
+    return photo.position if photo.position is not None else float('inf')
+
+
+def production_to_dict(production: Production) -> Dict[str, Any]:
+    return {
+        "name": production.name,
+        "dob": production.dob,
+        "gender": _enum_value(production.gender),
+        "owner": production.owner,
+        "description": production.description,
+        "profile_photo": production.profile_photo,
+        "sire_id": production.sire_id,
+        "dam_id": production.dam_id,
+        "id": production.id,
+    }
+
+
+def dog_to_dict(dog: Dog) -> Dict[str, Any]:
+    return {
+        "name": dog.name,
+        "dob": dog.dob,
+        "gender": _enum_value(dog.gender),
+        "color": dog.color,
+        "statuses": [status.value for status in mask_to_statuses(dog.status_mask or 0)],
+        "profile_photo": dog.profile_photo,
+        "stud_fee": dog.stud_fee,
+        "sale_fee": dog.sale_fee,
+        "description": dog.description,
+        "pedigree_link": dog.pedigree_link,
+        "video_url": dog.video_url,
+        "parent_male_id": dog.parent_male_id,
+        "parent_female_id": dog.parent_female_id,
+        "is_production": dog.is_production,
+        "is_retired": dog.is_retired,
+        "id": dog.id,
+        "health_infos": [
+            {
+                "dna": info.dna,
+                "carrier_status": info.carrier_status,
+                "extra_info": info.extra_info,
+                "id": info.id,
+                "dog_id": info.dog_id,
+            }
+            for info in dog.health_infos
+        ],
+        "photos": [
+            {
+                "photo_url": photo.photo_url,
+                "alt": photo.alt,
+                "position": photo.position,
+                "id": photo.id,
+                "dog_id": photo.dog_id,
+            }
+            for photo in sorted(dog.photos, key=_photo_position)
+        ],
+        "productions": [production_to_dict(prod) for prod in dog.productions],
+        "children": [
+            {
+                "id": child.id,
+                "name": child.name,
+                "dob": child.dob,
+                "gender": _enum_value(child.gender),
+                "profile_photo": child.profile_photo,
+            }
+            for child in dog.children
+        ],
+    }
+
+
+def breeding_to_dict(breeding: Breeding) -> Dict[str, Any]:
+    return {
+        "female_dog_id": breeding.female_dog_id,
+        "male_dog_id": breeding.male_dog_id,
+        "breeding_date": breeding.breeding_date,
+        "expected_birth_date": breeding.expected_birth_date,
+        "description": breeding.description,
+        "manual_sire_name": breeding.manual_sire_name,
+        "manual_sire_color": breeding.manual_sire_color,
+        "manual_sire_image_url": breeding.manual_sire_image_url,
+        "manual_sire_pedigree_link": breeding.manual_sire_pedigree_link,
+        "id": breeding.id,
+        "female_dog": dog_to_dict(breeding.female_dog) if breeding.female_dog else None,
+        "male_dog": dog_to_dict(breeding.male_dog) if breeding.male_dog else None,
+    }
+
+
+def litter_to_dict(litter: Litter) -> Dict[str, Any]:
+    description = litter.description
+    if isinstance(description, str):
+        try:
+            description = json.loads(description)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in litter description: {litter.description}")
+            description = {"content": description}
+    if description:
+        description = {
+            "content": description.get("content"),
+            "style": description.get("style"),
+        }
+
+    return {
+        "breeding_id": litter.breeding_id,
+        "birth_date": litter.birth_date,
+        "number_of_puppies": litter.number_of_puppies,
+        "description": description or None,
+        "pedigree_url": None,
+        "id": litter.id,
+        "puppies": [dog_to_dict(puppy) for puppy in litter.puppies],
+        "breeding": breeding_to_dict(litter.breeding),
+    }
+
+
 def convert_to_navigation_schema(navigation: NavLink) -> NavLinkSchema:
     return NavLinkSchema(
         id=navigation.id,
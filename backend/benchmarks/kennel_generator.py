@@ -0,0 +1,360 @@
+"""
+Generate a synthetic kennel into the database in SQLALCHEMY_DATABASE_URL.
+
+Dogs get pedigrees (parents drawn from earlier generations), photos, health
+info, statuses and productions; on top of those come breedings, litters with
+puppies, waitlist entries, contact messages, pages and navigation links.
+
+    python -m benchmarks.kennel_generator --scale small        # 1k dogs
+    python -m benchmarks.kennel_generator --scale large --truncate
+
+Only point this at a local database: --truncate empties every table first.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from faker import Faker
+from sqlalchemy import insert, select, text
+
+from app.core.database import engine
+from app.models import (
+    Breeding,
+    ContactMessage,
+    Dog,
+    GenderEnum,
+    HealthInfo,
+    Litter,
+    NavLink,
+    Page,
+    Photo,
+    Production,
+    StatusEnum,
+    WaitlistEntry,
+    dog_production_link,
+    litter_puppies,
+    statuses_to_mask,
+)
+from app.models.waitlist_entry import (
+    waitlist_dam_association,
+    waitlist_sire_association,
+)
+from app.services.dog_service import refresh_dog_cards
+
+SCALES = {"small": 1_000, "medium": 10_000, "large": 100_000}
+CHUNK_SIZE = 1_000
+FOUNDER_RATIO = 0.05
+STATUS_POOL = list(StatusEnum)
+COLORS = [
+    "Blue",
+    "Lilac",
+    "Fawn",
+    "Cream",
+    "Brindle",
+    "Blue Merle",
+    "Lilac Tan",
+    "Chocolate",
+    "Isabella",
+    "Black Tan",
+]
+TABLES = [
+    "waitlist_sire_association",
+    "waitlist_dam_association",
+    "waitlist_entries",
+    "litter_puppies",
+    "litters",
+    "breedings",
+    "dog_production_link",
+    "productions",
+    "dog_cards",
+    "health_info",
+    "photos",
+    "dogs",
+    "contact_messages",
+    "announcements",
+    "carousel_images",
+    "pages",
+    "nav_links",
+]
+
+
+def chunks(rows, size=CHUNK_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def insert_rows(conn, table, rows):
+    for chunk in chunks(rows):
+        await conn.execute(insert(table), chunk)
+
+
+async def generate_dogs(conn, fake, total):
+    """Insert dogs generation by generation so parents always exist first."""
+    males, females, all_ids = [], [], []
+    founders = max(int(total * FOUNDER_RATIO), 2)
+    today = date.today()
+
+    while len(all_ids) < total:
+        size = min(CHUNK_SIZE, total - len(all_ids))
+        rows = []
+        for i in range(size):
+            is_founder = len(all_ids) + i < founders
+            gender = GenderEnum.male if random.random() < 0.5 else GenderEnum.female
+            rows.append(
+                {
+                    "name": fake.first_name(),
+                    "dob": today - timedelta(days=random.randint(60, 365 * 12)),
+                    "gender": gender,
+                    "color": random.choice(COLORS),
+                    "profile_photo": fake.image_url(),
+                    "stud_fee": random.choice([None, 1500, 2500, 5000]),
+                    "sale_fee": random.choice([None, 4000, 6000, 8000]),
+                    "description": fake.paragraph(nb_sentences=4),
+                    "pedigree_link": fake.url(),
+                    "parent_male_id": (
+                        None if is_founder or not males else random.choice(males)
+                    ),
+                    "parent_female_id": (
+                        None if is_founder or not females else random.choice(females)
+                    ),
+                    "is_production": random.random() < 0.3,
+                    "kennel_own": random.random() < 0.4,
+                    "is_retired": random.random() < 0.15,
+                    "status_mask": statuses_to_mask(
+                        random.sample(STATUS_POOL, random.randint(1, 2))
+                    ),
+                }
+            )
+        result = await conn.execute(
+            insert(Dog).returning(Dog.id, Dog.gender, sort_by_parameter_order=True),
+            rows,
+        )
+        for dog_id, gender in result.all():
+            all_ids.append(dog_id)
+            (males if gender == GenderEnum.male else females).append(dog_id)
+
+    return all_ids, males, females
+
+
+async def generate_dog_details(conn, fake, dog_ids):
+    photos, health = [], []
+    for dog_id in dog_ids:
+        for position in range(random.randint(1, 5)):
+            photos.append(
+                {
+                    "dog_id": dog_id,
+                    "photo_url": fake.image_url(),
+                    "alt": fake.word(),
+                    "position": position,
+                }
+            )
+        if random.random() < 0.6:
+            health.append(
+                {
+                    "dog_id": dog_id,
+                    "dna": fake.bothify("??/??, ??/??"),
+                    "carrier_status": random.choice(["Clear", "Carrier", "Affected"]),
+                    "extra_info": fake.sentence(),
+                }
+            )
+
+    await insert_rows(conn, Photo.__table__, photos)
+    await insert_rows(conn, HealthInfo.__table__, health)
+    return len(photos), len(health)
+
+
+async def generate_dog_cards(conn):
+    dog_ids = (await conn.execute(select(Dog.id))).scalars().all()
+    for start in range(0, len(dog_ids), CHUNK_SIZE):
+        await refresh_dog_cards(conn, dog_ids[start : start + CHUNK_SIZE])
+    return len(dog_ids)
+
+
+async def generate_productions(conn, fake, dog_ids, males, females):
+    count = len(dog_ids) // 5
+    rows = [
+        {
+            "name": fake.first_name(),
+            "dob": fake.date_between(start_date="-5y"),
+            "owner": fake.name(),
+            "description": fake.sentence(),
+            "sire_id": random.choice(males),
+            "dam_id": random.choice(females),
+            "gender": random.choice(list(GenderEnum)),
+            "profile_photo": fake.image_url(),
+        }
+        for _ in range(count)
+    ]
+    production_ids = []
+    for chunk in chunks(rows):
+        result = await conn.execute(insert(Production).returning(Production.id), chunk)
+        production_ids.extend(result.scalars().all())
+
+    links = [
+        {"dog_id": random.choice(dog_ids), "production_id": production_id}
+        for production_id in production_ids
+    ]
+    await insert_rows(conn, dog_production_link, links)
+    return len(production_ids)
+
+
+async def generate_breedings_and_litters(conn, fake, dog_ids, males, females):
+    breeding_rows = []
+    for _ in range(max(len(dog_ids) // 20, 1)):
+        breeding_date = fake.date_between(start_date="-3y", end_date="+60d")
+        breeding_rows.append(
+            {
+                "female_dog_id": random.choice(females),
+                "male_dog_id": random.choice(males),
+                "breeding_date": breeding_date,
+                "expected_birth_date": breeding_date + timedelta(days=63),
+                "description": fake.paragraph(),
+            }
+        )
+    breeding_ids = []
+    for chunk in chunks(breeding_rows):
+        result = await conn.execute(insert(Breeding).returning(Breeding.id), chunk)
+        breeding_ids.extend(result.scalars().all())
+
+    litter_rows = [
+        {
+            "breeding_id": breeding_id,
+            "birth_date": fake.date_between(start_date="-3y"),
+            "number_of_puppies": random.randint(3, 8),
+            "description": {"content": fake.paragraph()},
+        }
+        for breeding_id in breeding_ids[::2]
+    ]
+    litter_ids, puppy_links = [], []
+    for chunk in chunks(litter_rows):
+        result = await conn.execute(
+            insert(Litter).returning(
+                Litter.id, Litter.number_of_puppies, sort_by_parameter_order=True
+            ),
+            chunk,
+        )
+        for litter_id, number_of_puppies in result.all():
+            litter_ids.append(litter_id)
+            for dog_id in random.sample(dog_ids, number_of_puppies):
+                puppy_links.append({"litter_id": litter_id, "dog_id": dog_id})
+    await insert_rows(conn, litter_puppies, puppy_links)
+    return breeding_ids, len(litter_ids), len(puppy_links)
+
+
+async def generate_waitlist(conn, fake, total, males, females, breeding_ids):
+    rows = [
+        {
+            "name": fake.name(),
+            "email": fake.email(),
+            "phone": fake.numerify("###-###-####"),
+            "gender_preference": random.choice([None, *GenderEnum]),
+            "color_preference": random.choice([None, *COLORS]),
+            "additional_info": fake.sentence(),
+            "breeding_id": random.choice([None, *breeding_ids[:50]]),
+        }
+        for _ in range(max(total // 10, 1))
+    ]
+    entry_ids = []
+    for chunk in chunks(rows):
+        result = await conn.execute(
+            insert(WaitlistEntry).returning(WaitlistEntry.id), chunk
+        )
+        entry_ids.extend(result.scalars().all())
+
+    sires, dams = [], []
+    for entry_id in entry_ids:
+        for dog_id in set(random.sample(males, min(2, len(males)))):
+            if random.random() < 0.5:
+                sires.append({"waitlist_entry_id": entry_id, "dog_id": dog_id})
+        for dog_id in set(random.sample(females, min(2, len(females)))):
+            if random.random() < 0.5:
+                dams.append({"waitlist_entry_id": entry_id, "dog_id": dog_id})
+    await insert_rows(conn, waitlist_sire_association, sires)
+    await insert_rows(conn, waitlist_dam_association, dams)
+    return len(entry_ids)
+
+
+async def generate_site(conn, fake, total):
+    contacts = [
+        {"name": fake.name(), "email": fake.email(), "message": fake.paragraph()}
+        for _ in range(max(total // 10, 1))
+    ]
+    await insert_rows(conn, ContactMessage.__table__, contacts)
+
+    slugs = ["home", "about", "studs", "available", "litters", "contact", "services"]
+    pages = [
+        {
+            "id": str(uuid.uuid4()),
+            "type": "page",
+            "name": slug.title(),
+            "slug": slug,
+            "content": "".join(f"<p>{p}</p>" for p in fake.paragraphs(nb=20)),
+            "custom_values": {},
+            "status": "published",
+            "is_locked": False,
+            "language": "en",
+        }
+        for slug in slugs
+    ]
+    await insert_rows(conn, Page.__table__, pages)
+
+    nav_links = [
+        {"title": slug.title(), "slug": f"/{slug}", "editable": True, "position": i}
+        for i, slug in enumerate(slugs)
+    ]
+    await insert_rows(conn, NavLink.__table__, nav_links)
+    return len(contacts), len(pages)
+
+
+async def run(total, seed, truncate):
+    random.seed(seed)
+    fake = Faker()
+    Faker.seed(seed)
+    started = time.perf_counter()
+
+    async with engine.begin() as conn:
+        if truncate:
+            await conn.execute(
+                text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+            )
+
+        dog_ids, males, females = await generate_dogs(conn, fake, total)
+        print(f"dogs: {len(dog_ids)}")
+        photos, health = await generate_dog_details(conn, fake, dog_ids)
+        print(f"photos: {photos}, health_info: {health}")
+        productions = await generate_productions(conn, fake, dog_ids, males, females)
+        print(f"productions: {productions}")
+        breeding_ids, litters, puppies = await generate_breedings_and_litters(
+            conn, fake, dog_ids, males, females
+        )
+        print(f"breedings: {len(breeding_ids)}, litters: {litters}, puppies: {puppies}")
+        entries = await generate_waitlist(
+            conn, fake, total, males, females, breeding_ids
+        )
+        print(f"waitlist entries: {entries}")
+        contacts, pages = await generate_site(conn, fake, total)
+        print(f"contact messages: {contacts}, pages: {pages}")
+        print(f"dog cards: {await generate_dog_cards(conn)}")
+
+        await conn.execute(text("ANALYZE"))
+
+    await engine.dispose()
+    print(f"Generated in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--dogs", type=int, help="Override the dog count")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.dogs or SCALES[args.scale], args.seed, args.truncate))
+
+
+if __name__ == "__main__":
+    main()
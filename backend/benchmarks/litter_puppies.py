@@ -0,0 +1,96 @@
+"""
+Time batched puppy creation for 1, 8 and 100 puppy litters.
+
+Runs against the database in SQLALCHEMY_DATABASE_URL inside a transaction
+that is rolled back at the end, so nothing is left behind:
+
+    python -m benchmarks.litter_puppies --sizes 1 8 100 --photos 3
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from app.core.database import async_session, engine
+from app.models import Breeding, Dog, GenderEnum, Litter
+from app.services import LitterService
+
+statement_count = 0
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    global statement_count
+    statement_count += 1
+
+
+async def run(sizes, photos_per_puppy, repeat):
+    global statement_count
+    event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+    litter_svc = LitterService()
+
+    async with async_session() as db:
+        dam = Dog(name="Benchmark Dam", gender=GenderEnum.female)
+        db.add(dam)
+        await db.flush()
+        breeding = Breeding(female_dog_id=dam.id)
+        db.add(breeding)
+        await db.flush()
+
+        print(
+            f"{'puppies':>8} {'photos':>8} {'statements':>11} {'mean ms':>9} {'min ms':>9}"
+        )
+        for size in sizes:
+            timings = []
+            for _ in range(repeat):
+                litter = Litter(breeding_id=breeding.id, number_of_puppies=size)
+                db.add(litter)
+                await db.flush()
+
+                rows = [
+                    {
+                        "name": f"Puppy {i}",
+                        "gender": GenderEnum.male if i % 2 else GenderEnum.female,
+                        "parent_female_id": dam.id,
+                        "is_production": True,
+                        "kennel_own": False,
+                        "is_retired": False,
+                    }
+                    for i in range(size)
+                ]
+                gallery = [
+                    [
+                        f"https://example.com/{size}/{i}/{p}.jpg"
+                        for p in range(photos_per_puppy)
+                    ]
+                    for i in range(size)
+                ]
+
+                statement_count = 0
+                start = time.perf_counter()
+                await litter_svc._insert_puppies(db, litter.id, rows, gallery)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            print(
+                f"{size:>8} {size * photos_per_puppy:>8} {statement_count:>11} "
+                f"{sum(timings) / len(timings):>9.2f} {min(timings):>9.2f}"
+            )
+
+        await db.rollback()
+
+    event.remove(engine.sync_engine, "before_cursor_execute", _count_statement)
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 100])
+    parser.add_argument("--photos", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.photos, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Drive the public GET endpoints and the main admin writes against a running
+API and record latency percentiles, throughput, query counts and RSS.
+
+    python -m benchmarks.load_test --base-url http://localhost:8000 \
+        --concurrency 20 --requests 200 --username admin --password secret \
+        --server-pid $(pgrep -f "uvicorn main:app" | head -1)
+
+Each run is written to benchmarks/results/<timestamp>.json; pass
+--compare <previous.json> to print the change per endpoint.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import statistics
+import time
+from datetime import datetime
+
+import httpx
+import psutil
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+QUERY_COUNT = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def discover(client):
+    """Pick real ids and slugs to use in the detail endpoints."""
+    found = {}
+
+    async def first(path, key="items"):
+        response = await client.get(path)
+        if response.status_code != 200:
+            return []
+        data = response.json()
+        return data.get(key, []) if isinstance(data, dict) else data
+
+    dogs = await first("/api/v1/dogs/?page=1&page_size=20")
+    litters = await first("/api/v1/litters/?page=1&page_size=10")
+    breedings = await first("/api/v1/breedings/?page=1&page_size=10")
+    productions = await first("/api/v1/productions/?page=1&page_size=10")
+    pages = await first("/api/v1/pages/")
+    services = await first("/api/v1/services/", key="services")
+
+    found["dog_id"] = dogs[0]["id"] if dogs else 1
+    found["litter_id"] = litters[0]["id"] if litters else 1
+    found["breeding_id"] = breedings[0]["id"] if breedings else 1
+    found["production_id"] = productions[0]["id"] if productions else 1
+    found["slug"] = pages[0]["slug"] if pages else "home"
+    found["service_id"] = services[0]["id"] if services else 1
+    return found
+
+
+def public_endpoints(ids):
+    return {
+        "dogs.list": "/api/v1/dogs/?page=1&page_size=10",
+        "dogs.filtered": "/api/v1/dogs/filtered?status=Available&page=1&page_size=10",
+        "dogs.detail": f"/api/v1/dogs/{ids['dog_id']}",
+        "litters.list": "/api/v1/litters/?page=1&page_size=10",
+        "litters.detail": f"/api/v1/litters/{ids['litter_id']}",
+        "breedings.list": "/api/v1/breedings/?page=1&page_size=10",
+        "breedings.detail": f"/api/v1/breedings/{ids['breeding_id']}",
+        "productions.list": "/api/v1/productions/?page=1&page_size=10",
+        "productions.detail": f"/api/v1/productions/{ids['production_id']}",
+        "pages.list": "/api/v1/pages/",
+        "pages.slug": f"/api/v1/pages/slug/{ids['slug']}",
+        "navigation.links": "/api/v1/navigation/links",
+        "services.list": "/api/v1/services/",
+        "services.detail": f"/api/v1/services/{ids['service_id']}",
+        "search": "/api/v1/search/?query=blue&resources=dogs&resources=litters",
+        "settings": "/api/v1/settings/",
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.query_counts = []
+        self.errors = 0
+
+    def record(self, response, elapsed):
+        self.latencies.append(elapsed)
+        if response is None or response.status_code >= 400:
+            self.errors += 1
+            return
+        match = QUERY_COUNT.search(response.headers.get("Server-Timing", ""))
+        if match:
+            self.query_counts.append(int(match.group(1)))
+
+    def summary(self, wall_time):
+        ms = [latency * 1000 for latency in self.latencies]
+        return {
+            "requests": len(ms),
+            "errors": self.errors,
+            "p50_ms": percentile(ms, 50),
+            "p95_ms": percentile(ms, 95),
+            "p99_ms": percentile(ms, 99),
+            "mean_ms": statistics.fmean(ms) if ms else None,
+            "req_per_s": len(ms) / wall_time if wall_time else None,
+            "avg_queries": (
+                statistics.fmean(self.query_counts) if self.query_counts else None
+            ),
+        }
+
+
+async def hammer(client, concurrency, total, make_request):
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(i)
+            except httpx.HTTPError:
+                response = None
+            recorder.record(response, time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+async def login(client, username, password):
+    # A non-browser User-Agent gets the token in the body; the API reads it
+    # back from the access_token cookie.
+    response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": username, "password": password},
+        headers={"User-Agent": "ttnf-load-test"},
+    )
+    response.raise_for_status()
+    client.cookies.set("access_token", response.json()["access_token"])
+
+
+def dog_payload(i):
+    return {
+        "name": f"Load Test Dog {i}",
+        "gender": "Male" if i % 2 else "Female",
+        "color": "Blue",
+        "statuses": ["Available"],
+        "profile_photo": f"https://example.com/load-test/{i}.jpg",
+        "gallery_photos": [
+            f"https://example.com/load-test/{i}-{p}.jpg" for p in range(3)
+        ],
+    }
+
+
+async def admin_writes(client, concurrency, total):
+    results = {}
+    created = []
+
+    async def create(i):
+        response = await client.post("/api/v1/dogs/", json=dog_payload(i))
+        if response.status_code == 200:
+            created.append(response.json()["id"])
+        return response
+
+    results["admin.dogs.create"] = await hammer(client, concurrency, total, create)
+
+    async def update(i):
+        dog_id = created[i % len(created)]
+        payload = dog_payload(i)
+        payload["gallery_photos"] = list(reversed(payload["gallery_photos"]))
+        return await client.put(f"/api/v1/dogs/{dog_id}", json=payload)
+
+    if created:
+        results["admin.dogs.update"] = await hammer(client, concurrency, total, update)
+
+    async def delete(i):
+        return await client.delete(f"/api/v1/dogs/{created[i]}")
+
+    results["admin.dogs.delete"] = await hammer(
+        client, concurrency, len(created), delete
+    )
+
+    waitlist_ids = []
+
+    async def join_waitlist(i):
+        response = await client.post(
+            "/api/v1/waitlist/",
+            json={"name": f"Load Test {i}", "email": f"load{i}@example.com"},
+        )
+        if response.status_code == 200:
+            waitlist_ids.append(response.json()["id"])
+        return response
+
+    results["waitlist.create"] = await hammer(client, concurrency, total, join_waitlist)
+    for entry_id in waitlist_ids:
+        await client.delete(f"/api/v1/waitlist/{entry_id}")
+
+    return results
+
+
+def print_table(results, previous=None):
+    header = f"{'endpoint':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'queries':>8} {'err':>5}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results.items():
+        line = (
+            f"{name:<22} {row['p50_ms'] or 0:>8.1f} {row['p95_ms'] or 0:>8.1f} "
+            f"{row['p99_ms'] or 0:>8.1f} {row['req_per_s'] or 0:>8.1f} "
+            f"{row['avg_queries'] if row['avg_queries'] is not None else '-':>8} "
+            f"{row['errors']:>5}"
+        )
+        before = (previous or {}).get(name)
+        if before and before.get("p95_ms") and row.get("p95_ms"):
+            change = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+            line += f"  p95 {change:+.1f}%"
+        print(line)
+
+
+async def run(args):
+    process = psutil.Process(args.server_pid) if args.server_pid else None
+    rss = {"before": process.memory_info().rss if process else None}
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        ids = await discover(client)
+        results = {}
+        for name, path in public_endpoints(ids).items():
+            results[name] = await hammer(
+                client, args.concurrency, args.requests, lambda i, p=path: client.get(p)
+            )
+
+        if args.username and args.password:
+            await login(client, args.username, args.password)
+            results.update(
+                await admin_writes(client, args.concurrency, args.write_requests)
+            )
+
+    rss["after"] = process.memory_info().rss if process else None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "requests_per_endpoint": args.requests,
+        "server_rss_bytes": rss,
+        "endpoints": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--write-requests", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--server-pid", type=int)
+    parser.add_argument("--compare", help="Previous result file to diff against")
+    parser.add_argument("--output", help="Where to write the JSON result")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)["endpoints"]
+    print_table(result["endpoints"], previous)
+    if result["server_rss_bytes"]["after"]:
+        print(
+            f"Server RSS: {result['server_rss_bytes']['before'] / 2**20:.1f} MB -> "
+            f"{result['server_rss_bytes']['after'] / 2**20:.1f} MB"
+        )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=4)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
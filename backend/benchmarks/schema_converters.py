@@ -0,0 +1,214 @@
+"""
+Time the schema converters against the trusted dict fast path on synthetic
+ORM graphs, including the `.dict()` + json.dumps step the services run next.
+
+No database is needed; the graphs are built from transient model instances:
+
+    python -m benchmarks.schema_converters --number 200 --puppies 8 --photos 5
+"""
+
+import argparse
+import json
+import random
+import timeit
+from datetime import date, timedelta
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+import app.core.database  # noqa: F401  # must load before app.models
+from app.models import (
+    STATUS_BITS,
+    Breeding,
+    Dog,
+    GenderEnum,
+    HealthInfo,
+    Litter,
+    Photo,
+    Production,
+    StatusEnum,
+)
+from app.utils import (
+    DateTimeEncoder,
+    breeding_to_dict,
+    convert_to_breeding_schema,
+    convert_to_dog_schema,
+    convert_to_litter_schema,
+    convert_to_production_schema,
+    dog_to_dict,
+    litter_to_dict,
+    production_to_dict,
+)
+
+_next_id = 0
+
+
+def next_id():
+    global _next_id
+    _next_id += 1
+    return _next_id
+
+
+def make_production():
+    return Production(
+        id=next_id(),
+        name="Production",
+        dob=date(2023, 1, 1),
+        gender=GenderEnum.female,
+        owner="Owner",
+        description="A production",
+        profile_photo="https://example.com/production.jpg",
+        sire_id=1,
+        dam_id=2,
+    )
+
+
+def make_dog(photos, children=0, productions=0):
+    dog_id = next_id()
+    dog = Dog(
+        id=dog_id,
+        name=f"Dog {dog_id}",
+        dob=date(2020, 1, 1) + timedelta(days=dog_id),
+        gender=random.choice(list(GenderEnum)),
+        color="Blue",
+        profile_photo="https://example.com/profile.jpg",
+        stud_fee=2500,
+        sale_fee=None,
+        description="Lorem ipsum dolor sit amet. " * 10,
+        pedigree_link="https://example.com/pedigree",
+        video_url=None,
+        parent_male_id=None,
+        parent_female_id=None,
+        is_production=False,
+        is_retired=False,
+        status_mask=STATUS_BITS[StatusEnum.available],
+    )
+    positions = list(range(photos))
+    random.shuffle(positions)
+    set_committed_value(
+        dog,
+        "photos",
+        [
+            Photo(
+                id=next_id(),
+                dog_id=dog_id,
+                photo_url=f"https://example.com/{dog_id}/{p}.jpg",
+                alt="photo",
+                position=p,
+            )
+            for p in positions
+        ],
+    )
+    set_committed_value(
+        dog,
+        "health_infos",
+        [
+            HealthInfo(
+                id=next_id(),
+                dog_id=dog_id,
+                dna="BB/Dd",
+                carrier_status="Clear",
+                extra_info="OFA",
+            )
+        ],
+    )
+    set_committed_value(
+        dog, "productions", [make_production() for _ in range(productions)]
+    )
+    set_committed_value(dog, "children", [make_dog(photos=0) for _ in range(children)])
+    return dog
+
+
+def make_breeding(photos):
+    breeding = Breeding(
+        id=next_id(),
+        breeding_date=date(2024, 1, 1),
+        expected_birth_date=date(2024, 3, 4),
+        description="Planned breeding",
+    )
+    female, male = make_dog(photos, children=4, productions=2), make_dog(photos)
+    breeding.female_dog_id, breeding.male_dog_id = female.id, male.id
+    set_committed_value(breeding, "female_dog", female)
+    set_committed_value(breeding, "male_dog", male)
+    return breeding
+
+
+def make_litter(puppies, photos):
+    breeding = make_breeding(photos)
+    litter = Litter(
+        id=next_id(),
+        breeding_id=breeding.id,
+        birth_date=date(2024, 3, 4),
+        number_of_puppies=puppies,
+        description={"content": "Litter notes", "style": {"color": "blue"}},
+    )
+    set_committed_value(litter, "breeding", breeding)
+    set_committed_value(litter, "puppies", [make_dog(photos) for _ in range(puppies)])
+    return litter
+
+
+def encode(data):
+    return json.dumps(data, cls=DateTimeEncoder)
+
+
+def bench(number, func, obj):
+    total = min(timeit.repeat(lambda: func(obj), number=number, repeat=5))
+    return total / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--puppies", type=int, default=8)
+    parser.add_argument("--photos", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    cases = [
+        (
+            "production",
+            make_production(),
+            convert_to_production_schema,
+            production_to_dict,
+        ),
+        (
+            "dog",
+            make_dog(args.photos, children=4, productions=2),
+            convert_to_dog_schema,
+            dog_to_dict,
+        ),
+        (
+            "breeding",
+            make_breeding(args.photos),
+            convert_to_breeding_schema,
+            breeding_to_dict,
+        ),
+        (
+            "litter",
+            make_litter(args.puppies, args.photos),
+            convert_to_litter_schema,
+            litter_to_dict,
+        ),
+    ]
+
+    print(
+        f"{'graph':<11} {'schema us':>10} {'+dump us':>10} "
+        f"{'dict us':>10} {'+dump us':>10} {'speedup':>8}"
+    )
+    for name, obj, convert, to_dict in cases:
+        # The fast path has to serialize to exactly what the services cache today
+        expected = json.loads(encode(convert(obj).dict()))
+        assert json.loads(encode(to_dict(obj))) == expected, f"{name} output differs"
+
+        schema_only = bench(args.number, convert, obj)
+        schema_dump = bench(args.number, lambda o: encode(convert(o).dict()), obj)
+        dict_only = bench(args.number, to_dict, obj)
+        dict_dump = bench(args.number, lambda o: encode(to_dict(o)), obj)
+        print(
+            f"{name:<11} {schema_only:>10.1f} {schema_dump:>10.1f} "
+            f"{dict_only:>10.1f} {dict_dump:>10.1f} {schema_dump / dict_dump:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
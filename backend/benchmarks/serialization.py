@@ -0,0 +1,91 @@
+"""
+Compare json + DateTimeEncoder with the orjson codec on real DogSchema and
+LitterSchema payloads: cache writes, cache reads and response rendering.
+
+    python -m benchmarks.serialization --number 500 --puppies 8 --photos 5
+"""
+
+import argparse
+import json
+import random
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import app.core.database  # noqa: F401  # must load before app.models
+from app.core.instrumentation import TimedJSONResponse
+from app.utils import (
+    DateTimeEncoder,
+    convert_to_dog_schema,
+    convert_to_litter_schema,
+    decode_json,
+    encode_json,
+)
+from benchmarks.schema_converters import make_dog, make_litter
+
+
+def bench(number, func):
+    total = min(timeit.repeat(func, number=number, repeat=5))
+    return total / number * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--puppies", type=int, default=8)
+    parser.add_argument("--photos", type=int, default=5)
+    parser.add_argument("--litters", type=int, default=10, help="Litters per list page")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    dog = convert_to_dog_schema(make_dog(args.photos, children=4, productions=2))
+    litters = [
+        convert_to_litter_schema(make_litter(args.puppies, args.photos))
+        for _ in range(args.litters)
+    ]
+    payloads = {
+        "dog": dog.dict(),
+        "litter": litters[0].dict(),
+        "litter page": {
+            "items": [litter.dict() for litter in litters],
+            "total_count": 100,
+        },
+    }
+
+    print(
+        f"{'payload':<12} {'step':<8} {'json us':>10} {'orjson us':>10} {'speedup':>8}"
+    )
+    for name, data in payloads.items():
+        stdlib_bytes = json.dumps(data, cls=DateTimeEncoder)
+        orjson_bytes = encode_json(data)
+        assert json.loads(stdlib_bytes) == decode_json(orjson_bytes), f"{name} differs"
+        content = jsonable_encoder(data)
+
+        steps = {
+            "dump": (
+                lambda: json.dumps(data, cls=DateTimeEncoder),
+                lambda: encode_json(data),
+            ),
+            "load": (
+                lambda: json.loads(stdlib_bytes),
+                lambda: decode_json(orjson_bytes),
+            ),
+            "render": (
+                lambda: JSONResponse(content),
+                lambda: TimedJSONResponse(content),
+            ),
+        }
+        for step, (stdlib, fast) in steps.items():
+            before = bench(args.number, stdlib)
+            after = bench(args.number, fast)
+            print(
+                f"{name:<12} {step:<8} {before:>10.1f} {after:>10.1f} "
+                f"{before / after:>7.1f}x"
+            )
+        print(f"{name:<12} {'size':<8} {len(stdlib_bytes):>10} {len(orjson_bytes):>10}")
+
+
+if __name__ == "__main__":
+    main()
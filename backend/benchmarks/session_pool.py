@@ -0,0 +1,102 @@
+"""
+Compare pool utilization of a request-scoped AsyncSession against the lazy,
+autocommit read session that get_database_session now hands to GET routes.
+
+Each simulated GET misses the cache with --miss-ratio probability and then
+runs two queries separated by --work-ms of non-database work (Redis,
+serialization); hits do the work without touching the database:
+
+    python -m benchmarks.session_pool --requests 2000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import select
+from starlette.requests import Request
+
+from app.core.database import LazySession, async_session, engine
+from app.models import Dog
+
+
+def get_request():
+    return Request({"type": "http", "method": "GET", "headers": []})
+
+
+async def request_with_session(miss, work):
+    async with async_session() as db:
+        await asyncio.sleep(work)
+        if miss:
+            await db.execute(select(Dog.id).limit(1))
+            await asyncio.sleep(work)
+            await db.execute(select(Dog.name).limit(5))
+        await asyncio.sleep(work)
+
+
+async def request_with_lazy_session(miss, work):
+    db = LazySession(get_request())
+    try:
+        await asyncio.sleep(work)
+        if miss:
+            await db.execute(select(Dog.id).limit(1))
+            await asyncio.sleep(work)
+            await db.execute(select(Dog.name).limit(5))
+        await asyncio.sleep(work)
+    finally:
+        await db.close()
+
+
+async def sample_pool(samples, stop):
+    while not stop.is_set():
+        samples.append(engine.pool.checkedout())
+        await asyncio.sleep(0.001)
+
+
+async def run_mode(handler, args):
+    samples, stop = [], asyncio.Event()
+    sampler = asyncio.create_task(sample_pool(samples, stop))
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(args.seed)
+    misses = [rng.random() < args.miss_ratio for _ in range(args.requests)]
+
+    async def one(miss):
+        async with semaphore:
+            await handler(miss, args.work_ms / 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(miss) for miss in misses))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await sampler
+
+    return {
+        "elapsed_s": elapsed,
+        "peak_checked_out": max(samples, default=0),
+        "mean_checked_out": sum(samples) / len(samples) if samples else 0,
+    }
+
+
+async def main(args):
+    print(f"{'mode':<14} {'elapsed s':>10} {'peak conns':>11} {'mean conns':>11}")
+    for name, handler in (
+        ("session", request_with_session),
+        ("lazy", request_with_lazy_session),
+    ):
+        result = await run_mode(handler, args)
+        print(
+            f"{name:<14} {result['elapsed_s']:>10.2f} {result['peak_checked_out']:>11} "
+            f"{result['mean_checked_out']:>11.1f}"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--miss-ratio", type=float, default=0.2)
+    parser.add_argument("--work-ms", type=float, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
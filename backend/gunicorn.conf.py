@@ -0,0 +1,19 @@
+# Loaded automatically by gunicorn from the working directory.
+import glob
+import os
+
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    # Drop metric files left over from a previous run
+    multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -6,16 +6,41 @@ from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import setup_routes
 from app.core.config import settings
+from app.core.compression import compression_middleware
+from app.core.prewarm import prewarm, prewarm_middleware, readiness_report
+from app.core.snapshot import observe_snapshot_backlog, snapshot_dirty_middleware
+from app.core.database import engine, observe_replica_lag, read_engine, replica_engine
+from app.core.metrics import metrics_middleware, metrics_response
+from app.core.instrumentation import (
+    TimedJSONResponse,
+    install_sqlalchemy_instrumentation,
+    request_metrics_middleware,
+)
 from app.api.errors.handlers import setup_error_handlers
 from opencensus.ext.azure.log_exporter import AzureLogHandler
 from opencensus.ext.azure.trace_exporter import AzureExporter
 from opencensus.ext.fastapi.fastapi_middleware import FastAPIMiddleware
 from opencensus.trace.samplers import ProbabilitySampler
 import time
+from contextlib import asynccontextmanager
+
+
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    # Fill the hot cache entries before this worker starts taking traffic
+    try:
+        await prewarm(application)
+    except Exception as exc:
+        logger.error(f"Startup prewarm failed: {exc}", exc_info=True)
+    yield
 
 
 def create_application() -> FastAPI:
-    application = FastAPI(title=settings.project_name)
+    application = FastAPI(
+        title=settings.project_name,
+        default_response_class=TimedJSONResponse,
+        lifespan=lifespan,
+    )
 
     # Setup routes and error handlers
     setup_routes(application)
@@ -78,6 +103,18 @@ logger.setLevel(logging.INFO)
 # sampler = ProbabilitySampler(1.0)
 FastAPIMiddleware(app)
 
+# Per-request query count, DB/Redis/serialization time and N+1 warnings
+install_sqlalchemy_instrumentation(engine)
+install_sqlalchemy_instrumentation(read_engine)
+if replica_engine is not engine:
+    install_sqlalchemy_instrumentation(replica_engine)
+# Registered first so it runs inside request metrics and can see cache reads
+app.middleware("http")(compression_middleware)
+app.middleware("http")(request_metrics_middleware)
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(prewarm_middleware)
+app.middleware("http")(snapshot_dirty_middleware)
+
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -107,6 +144,10 @@ async def log_requests(request: Request, call_next):
         logger.info(f"[{request_id}] Response status: {response.status_code}")
         logger.info(f"[{request_id}] Process time: {process_time:.4f} seconds")
 
+        if "content-length" not in response.headers:
+            # Streamed, e.g. admin exports; buffering would hold it all in memory
+            return response
+
         # Check if response is binary and skip logging if it is
         if isinstance(response, Response):
             response_body = b"".join([chunk async for chunk in response.body_iterator])
@@ -140,3 +181,26 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    prewarm_report = await readiness_report()
+    warming = prewarm_report.get("status") == "warming"
+    return TimedJSONResponse(
+        {"status": "warming" if warming else "ready", "prewarm": prewarm_report},
+        status_code=503 if warming else 200,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    try:
+        await observe_replica_lag()
+    except Exception as exc:
+        logger.warning(f"Could not read replica lag: {exc}")
+    try:
+        await observe_snapshot_backlog()
+    except Exception as exc:
+        logger.warning(f"Could not read snapshot backlog: {exc}")
+    return metrics_response()
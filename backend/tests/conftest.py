@@ -0,0 +1,68 @@
+"""
+Shared fixtures. The tests run against the database and Redis configured in
+the environment, the same ones the app uses, and skip when either is
+unreachable.
+"""
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.core.database  # noqa: F401  # must load before app.models
+from app.core.database import engine, read_engine, replica_engine
+from app.core.instrumentation import query_budget
+from app.core.redis import get_redis_client
+from main import app
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def services():
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        redis_client = await get_redis_client()
+        await redis_client.ping()
+    except Exception as e:
+        pytest.skip(f"Database or Redis unavailable: {e}")
+    yield
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+    await read_engine.dispose()
+    if replica_engine is not engine:
+        await replica_engine.dispose()
+
+
+@pytest.fixture
+async def client(services):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def db(services):
+    """A session whose work is rolled back after the test."""
+    async with engine.connect() as conn:
+        await conn.begin()
+        # Commits inside the services only release a savepoint
+        session = AsyncSession(
+            bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+        )
+        yield session
+        await session.close()
+        await conn.rollback()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    `with assert_max_queries(5): ...` fails if the block issues more than five
+    statements. Requests made through `client` inside the block count too.
+    """
+    return query_budget
@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "path", ["/api/v1/dogs/filtered", "/api/v1/dogs/cards", "/api/v1/dogs/facets"]
+)
+async def test_unknown_gender_is_rejected(client, path):
+    response = await client.get(path, params={"gender": "unknown"})
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_gender_filter_is_case_insensitive(client):
+    response = await client.get("/api/v1/dogs/cards", params={"gender": "Female"})
+    assert response.status_code == 200
@@ -0,0 +1,30 @@
+import pytest
+
+from app.api.routes import admin_routes
+from app.core.auth import get_current_user
+from main import app
+
+CHUNKS = [b"id,name\r\n", b"1,Rex\r\n", b"2,Luna\r\n"]
+
+
+@pytest.fixture
+def export_chunks(monkeypatch):
+    async def stream(resource, export_format):
+        for chunk in CHUNKS:
+            yield chunk
+
+    monkeypatch.setattr(admin_routes.export_svc, "stream", stream)
+    app.dependency_overrides[get_current_user] = lambda: None
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.anyio
+async def test_export_is_streamed_through_middleware(client, export_chunks):
+    async with client.stream("GET", "/api/v1/admin/export/dogs?format=csv") as response:
+        received = [chunk async for chunk in response.aiter_raw() if chunk]
+
+    assert response.status_code == 200
+    # A buffered response would carry a length and arrive as one chunk
+    assert "content-length" not in response.headers
+    assert received == CHUNKS
@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import Announcement, AnnouncementType, Page
+from app.schemas import PageUpdate
+from app.services import PageService
+
+# Page, announcements and carousel images loaded, one UPDATE, INSERT and
+# DELETE for the announcements, the two refreshes after commit, and the
+# SAVEPOINT/RELEASE the db fixture wraps the save in
+QUERY_BUDGET = 11
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size", [1, 10, 30])
+async def test_update_page_announcements_query_budget(db, assert_max_queries, size):
+    page = Page(
+        id=str(uuid.uuid4()),
+        type="test",
+        name=f"Test {size}",
+        slug=f"test-{uuid.uuid4()}",
+        content="",
+        language="en",
+    )
+    db.add(page)
+    await db.flush()
+    announcements = [
+        Announcement(
+            title=f"Announcement {i}",
+            message="Test",
+            category=AnnouncementType.INFO,
+            page_id=page.id,
+        )
+        for i in range(size)
+    ]
+    db.add_all(announcements)
+    await db.commit()
+
+    # A third edited, the rest removed and as many new ones added
+    edited = announcements[: size // 3 + 1]
+    now = datetime.now(timezone.utc)
+    payload = [
+        {
+            "id": announcement.id,
+            "title": f"{announcement.title} (edited)",
+            "date": now,
+            "message": announcement.message,
+            "category": "info",
+        }
+        for announcement in edited
+    ] + [
+        {
+            "id": 0,
+            "title": f"New {i}",
+            "date": now,
+            "message": "Test",
+            "category": "litter",
+        }
+        for i in range(len(edited))
+    ]
+    db.expunge_all()
+
+    with assert_max_queries(QUERY_BUDGET):
+        saved = await PageService().update_page(
+            db, str(page.id), PageUpdate(announcements=payload)
+        )
+
+    assert len(saved.announcements) == len(payload)
+    titles = {announcement.title for announcement in saved.announcements}
+    assert {f"{announcement.title} (edited)" for announcement in edited} <= titles
@@ -0,0 +1,29 @@
+import pytest
+
+# Most statements each public endpoint may issue with a cold cache; a cached
+# response issues none
+QUERY_BUDGETS = {
+    # The page, its count and the dogs' four selectin loads
+    "/api/v1/dogs/?page=1&page_size=10": 6,
+    # The page with a window count, plus a count when past the last page
+    "/api/v1/dogs/cards?page=1&page_size=10": 2,
+    # The page, its count, the puppies with their relationships and the
+    # breeding with both parents and theirs
+    "/api/v1/litters/?page=1&page_size=10": 23,
+    # The page, its count and both parents with their relationships
+    "/api/v1/breedings/?page=1&page_size=10": 12,
+    # Pages, announcements and carousel images
+    "/api/v1/pages/": 3,
+    "/api/v1/pages/index": 1,
+    "/api/v1/navigation/tree": 1,
+    # Categories, service tags and services
+    "/api/v1/services/catalog": 3,
+}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path, budget", QUERY_BUDGETS.items())
+async def test_endpoint_query_budget(client, assert_max_queries, path, budget):
+    with assert_max_queries(budget):
+        response = await client.get(path)
+    assert response.status_code == 200
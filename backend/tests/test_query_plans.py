@@ -0,0 +1,130 @@
+"""
+Query plan regression check for the service queries.
+
+Runs the listing and detail queries the services issue, including the
+follow-up statements each selectinload emits, and re-runs every statement
+under EXPLAIN (FORMAT JSON). A sequential scan estimated above
+MAX_SEQ_SCAN_ROWS fails the test, so run it against a seeded database.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event, func
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+
+from app.core.database import engine
+from app.models import (
+    Breeding,
+    Dog,
+    Litter,
+    Production,
+    StatusEnum,
+    WaitlistEntry,
+    retired_filter,
+    status_mask_filter,
+)
+
+MAX_SEQ_SCAN_ROWS = 1000
+
+DOG_OPTIONS = (
+    selectinload(Dog.health_infos),
+    selectinload(Dog.photos),
+    selectinload(Dog.productions),
+    selectinload(Dog.children),
+)
+
+
+def service_queries(dog_id, litter_id):
+    """The statements behind the public listing and detail endpoints."""
+    return {
+        "dogs.all": select(Dog)
+        .options(*DOG_OPTIONS)
+        .order_by(Dog.dob.asc().nulls_last())
+        .limit(10),
+        "dogs.by_id": select(Dog).options(*DOG_OPTIONS).filter(Dog.id == dog_id),
+        "dogs.filtered": select(Dog)
+        .options(*DOG_OPTIONS)
+        .filter(
+            status_mask_filter(Dog.status_mask, [StatusEnum.available]),
+            retired_filter(Dog.is_retired, False),
+        )
+        .order_by(Dog.dob.asc().nulls_last())
+        .limit(10),
+        "litters.by_id": select(Litter)
+        .filter(Litter.id == litter_id)
+        .options(
+            selectinload(Litter.puppies).options(
+                *DOG_OPTIONS,
+                selectinload(Dog.productions).options(
+                    selectinload(Production.sire), selectinload(Production.dam)
+                ),
+            ),
+            selectinload(Litter.breeding).options(
+                selectinload(Breeding.female_dog).options(*DOG_OPTIONS),
+                selectinload(Breeding.male_dog).options(*DOG_OPTIONS),
+            ),
+        ),
+        "breedings.all": select(Breeding)
+        .options(
+            selectinload(Breeding.female_dog).options(*DOG_OPTIONS),
+            selectinload(Breeding.male_dog).options(*DOG_OPTIONS),
+        )
+        .limit(10),
+        "productions.by_sire": select(Production)
+        .where(Production.sire_id == dog_id)
+        .order_by(Production.name)
+        .limit(10),
+        "waitlist.all": select(WaitlistEntry)
+        .options(
+            selectinload(WaitlistEntry.sires).options(*DOG_OPTIONS),
+            selectinload(WaitlistEntry.dams).options(*DOG_OPTIONS),
+            selectinload(WaitlistEntry.breeding),
+        )
+        .limit(10),
+    }
+
+
+def seq_scans(plan, threshold):
+    """Yield (relation, estimated rows) for every Seq Scan above threshold."""
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Plan Rows", 0) > threshold:
+        yield plan.get("Relation Name"), plan.get("Plan Rows")
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child, threshold)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("name", list(service_queries(1, 1)))
+async def test_no_large_sequential_scans(db, name):
+    dog_id = (await db.execute(select(func.min(Dog.id)))).scalar() or 1
+    litter_id = (await db.execute(select(func.min(Litter.id)))).scalar() or 1
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await db.execute(service_queries(dog_id, litter_id)[name])
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    conn = await db.connection()
+    offenders = []
+    for statement, parameters in captured:
+        result = await conn.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        offenders += [
+            (relation, rows, statement)
+            for relation, rows in seq_scans(plan[0]["Plan"], MAX_SEQ_SCAN_ROWS)
+        ]
+    assert (
+        not offenders
+    ), f"Sequential scans above {MAX_SEQ_SCAN_ROWS} rows: {offenders}"
@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.snapshot import AGGREGATES, LISTS, dirty_refs
+
+
+@pytest.mark.parametrize(
+    "method, path, aggregate",
+    [
+        ("PUT", "/api/v1/dogs/4", "/api/v1/dogs/facets"),
+        ("POST", "/api/v1/litters/3/puppies", "/api/v1/dogs/facets"),
+        ("PUT", "/api/v1/navigation/links/5", "/api/v1/navigation/tree"),
+        (
+            "PUT",
+            "/api/v1/pages/123e4567-e89b-12d3-a456-426614174000",
+            "/api/v1/pages/index",
+        ),
+        ("POST", "/api/v1/services/", "/api/v1/services/catalog"),
+        ("PUT", "/api/v1/services/tags/2", "/api/v1/services/catalog"),
+        ("DELETE", "/api/v1/services/categories/1", "/api/v1/services/catalog"),
+    ],
+)
+def test_admin_writes_dirty_aggregates(method, path, aggregate):
+    refs = dirty_refs(method, path)
+    assert any(ref.partition(":")[0] in AGGREGATES[aggregate] for ref in refs)
+
+
+def test_aggregates_are_snapshotted_unpaginated():
+    lists = {path: size_param for _, path, size_param in LISTS}
+    for path in AGGREGATES:
+        assert path in lists
+        assert lists[path] is None